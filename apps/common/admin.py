@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import EmailJob
+
+
+@admin.register(EmailJob)
+class EmailJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "recipient_email",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("recipient_email",)
+    ordering = ("-created_at",)
+    readonly_fields = ("last_error",)
@@ -0,0 +1,88 @@
+from asgiref.sync import sync_to_async
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from ..users.caching import (
+    AUTH_USER_FIELDS,
+    aget_auth_user_values,
+    aset_auth_user_values,
+    get_auth_user_values,
+    set_auth_user_values,
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user from a short-lived cache entry.
+
+    Only ``AUTH_USER_FIELDS`` are cached; the user is rebuilt with those
+    fields loaded and the rest deferred, so code that reads e.g. ``email``
+    still gets it from the database, and ``save()`` only writes loaded
+    fields. ``User.save()``/``delete()`` drop the entry; bulk ``update()``
+    calls bypass that and are only picked up when the entry expires.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # revocation compares against the password hash, which isn't cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        values = get_auth_user_values(user_id)
+        if values is None:
+            values = (
+                self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values_list(*AUTH_USER_FIELDS)
+                .first()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            set_auth_user_values(user_id, values)
+
+        user = self.user_model.from_db(router.db_for_read(self.user_model), AUTH_USER_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views; takes a Django ``HttpRequest``."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        values = await aget_auth_user_values(user_id)
+        if values is None:
+            values = await (
+                self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values_list(*AUTH_USER_FIELDS)
+                .afirst()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            await aset_auth_user_values(user_id, values)
+
+        user = self.user_model.from_db(router.db_for_read(self.user_model), AUTH_USER_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
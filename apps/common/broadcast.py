@@ -0,0 +1,404 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django_redis.cache import RedisCache
+from redis.exceptions import ResponseError
+from rest_framework.utils.encoders import JSONEncoder
+
+from .cache import AsyncCache
+
+
+logger = logging.getLogger(__name__)
+
+# KEYS: stream, channel. ARGV: approximate max stream length, payload.
+# Appending and publishing in one script keeps live order equal to replay order.
+PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'payload', ARGV[2])
+redis.call('PUBLISH', KEYS[2], id .. ' ' .. ARGV[2])
+return id
+"""
+
+
+def event_order(event_id):
+    """Sort key for event ids, Redis stream ids (``ms-seq``) or local counters. Raises ``ValueError``."""
+    return tuple(int(part) for part in event_id.split("-", 1))
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of ``(event_id, data)``. Iteration ends once
+    the subscription is closed and drained, and yields ``None`` when nothing
+    arrived for ``heartbeat`` seconds.
+    """
+
+    def __init__(self, predicate=None, queue_size=256, heartbeat=None):
+        self.predicate = predicate
+        self.heartbeat = heartbeat
+        self.queue = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def matches(self, data):
+        return self.predicate is None or self.predicate(data)
+
+    def deliver(self, event_id, data):
+        if self.closed or not self.matches(data):
+            return
+        try:
+            self.queue.put_nowait((event_id, data))
+        except asyncio.QueueFull:
+            # a slow consumer is cut off instead of buffering without bound;
+            # it resubscribes from the last event it saw
+            self.close()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        try:
+            item = await asyncio.wait_for(self.queue.get(), self.heartbeat)
+        except TimeoutError:
+            return None
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+
+class _Hub:
+    """The consumers of one event loop and the Redis listener feeding them."""
+
+    def __init__(self):
+        self.listener = None
+        self.ready = asyncio.Event()
+
+
+class _Relay:
+    """
+    Deliver messages published from sync code to async consumers in every
+    process. Messages go over a Redis pub/sub channel and each process keeps
+    one subscription per event loop, which feeds that loop's hub of
+    consumers. The cache is ``remote`` if given, else the ``alias`` backend
+    from ``CACHES``; unless it is Redis-backed, messages only reach consumers
+    in the publishing process. Subclasses provide the hub and ``route`` a
+    message to its consumers.
+    """
+
+    hub_class = _Hub
+
+    def __init__(self, channel, remote=None, client_factory=None, alias=DEFAULT_CACHE_ALIAS):
+        self.channel = channel
+        self.aremote = AsyncCache(remote, client_factory, alias)
+        self._hubs = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def route(self, hub, message):
+        raise NotImplementedError
+
+    def reset(self, hub):
+        """Called when the listener failed and messages may have been missed."""
+
+    def _redis(self):
+        backend = self.aremote.backend
+        if isinstance(backend, RedisCache):
+            return backend.client.get_client(write=True)
+        return None
+
+    def _route_locally(self, message):
+        with self._lock:
+            hubs = list(self._hubs.items())
+        for loop, hub in hubs:
+            try:
+                loop.call_soon_threadsafe(self.route, hub, message)
+            except RuntimeError:
+                pass  # the loop has been closed
+
+    def _attach(self):
+        """Return the running loop's hub, starting its listener on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            hub = self._hubs.get(loop)
+            if hub is None:
+                hub = self._hubs[loop] = self.hub_class()
+        if hub.listener is None:
+            if self._redis() is None:
+                hub.ready.set()
+            else:
+                hub.listener = loop.create_task(self._listen(hub))
+        return hub
+
+    async def _until_ready(self, hub):
+        try:
+            await asyncio.wait_for(hub.ready.wait(), 5)
+        except TimeoutError:
+            logger.warning("%s: subscribing before the listener is ready", self.channel)
+
+    def _detach(self, hub):
+        """Drop the running loop's hub and stop its listener once it has no consumers left."""
+        if hub:
+            return
+        with self._lock:
+            self._hubs.pop(asyncio.get_running_loop(), None)
+        if hub.listener is not None:
+            hub.listener.cancel()
+
+    async def _listen(self, hub):
+        backoff = 0.5
+        while True:
+            try:
+                async with self.aremote.redis_client().pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    hub.ready.set()
+                    backoff = 0.5
+                    async for message in pubsub.listen():
+                        self.route(hub, message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("%s: listener failed", self.channel)
+                self.reset(hub)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+class _SubscriptionHub(_Hub):
+    def __init__(self):
+        super().__init__()
+        self.subscriptions = set()
+
+    def __bool__(self):
+        return bool(self.subscriptions)
+
+
+class Broadcast(_Relay):
+    """
+    Publish events from sync code and stream them to async subscribers.
+
+    Each event is appended to a capped Redis stream, whose entry id becomes
+    the event id, and published on a channel. Every process holds a single
+    pub/sub subscription per event loop and fans messages out to its local
+    subscribers, so an idle subscriber costs a queue and a parked coroutine.
+    Subscribers resume after a disconnect by passing the last id they saw.
+
+    Without a Redis-backed cache events only reach subscribers in the
+    publishing process and the history is kept in memory.
+    """
+
+    hub_class = _SubscriptionHub
+
+    def __init__(
+        self, name, history=10000, queue_size=256, remote=None, client_factory=None, alias=DEFAULT_CACHE_ALIAS
+    ):
+        super().__init__(f"broadcast:{name}", remote, client_factory, alias)
+        self.stream = f"broadcast:{name}:stream"
+        self.history = history
+        self.queue_size = queue_size
+        self._local_ids = itertools.count(1)
+        self._local_history = deque(maxlen=history)
+
+    def publish(self, data):
+        """Send ``data`` to every subscriber and return its event id, or ``None`` if Redis failed."""
+        payload = json.dumps(data, cls=JSONEncoder)
+        client = self._redis()
+        if client is None:
+            with self._lock:
+                event_id = str(next(self._local_ids))
+                self._local_history.append((event_id, payload))
+            self._route_locally(f"{event_id} {payload}")
+            return event_id
+
+        try:
+            event_id = client.register_script(PUBLISH_SCRIPT)(
+                keys=[self.stream, self.channel], args=[self.history, payload]
+            )
+        except Exception:
+            logger.exception("Broadcast %s: failed to publish event", self.channel)
+            return None
+        return event_id.decode()
+
+    async def since(self, last_event_id):
+        """Return the ``(event_id, data)`` still in the history after ``last_event_id``."""
+        client = self.aremote.redis_client()
+        if client is None:
+            after = event_order(last_event_id)
+            with self._lock:
+                entries = list(self._local_history)
+            return [
+                (event_id, json.loads(payload))
+                for event_id, payload in entries
+                if event_order(event_id) > after
+            ]
+
+        try:
+            entries = await client.xrange(self.stream, min=last_event_id, count=self.history)
+        except ResponseError:
+            return []
+        return [
+            (event_id.decode(), json.loads(fields[b"payload"]))
+            for event_id, fields in entries
+            if event_id.decode() != last_event_id
+        ]
+
+    @asynccontextmanager
+    async def subscribe(self, predicate=None, last_event_id=None, heartbeat=None):
+        """
+        Yield an async iterator of ``(event_id, data)`` for events matching
+        ``predicate``: first those after ``last_event_id`` from the history,
+        then live ones, with ``None`` after ``heartbeat`` idle seconds. It ends
+        when the subscriber falls ``queue_size`` events behind or the Redis
+        subscription drops; resubscribe from the last id seen to catch up.
+        """
+        subscription = Subscription(predicate, self.queue_size, heartbeat)
+        hub = self._attach()
+        hub.subscriptions.add(subscription)
+        try:
+            # anything published once the listener is subscribed is queued,
+            # so reading the history afterwards leaves no gap
+            await self._until_ready(hub)
+            backlog = await self.since(last_event_id) if last_event_id else []
+            yield self._events(subscription, backlog)
+        finally:
+            hub.subscriptions.discard(subscription)
+            self._detach(hub)
+
+    async def _events(self, subscription, backlog):
+        last = None
+        for event_id, data in backlog:
+            last = event_order(event_id)
+            if subscription.matches(data):
+                yield event_id, data
+        async for event in subscription:
+            if event is None or last is None or event_order(event[0]) > last:
+                yield event
+
+    def route(self, hub, message):
+        event_id, _, payload = message.partition(" ")
+        data = json.loads(payload)
+        for subscription in list(hub.subscriptions):
+            subscription.deliver(event_id, data)
+
+    def reset(self, hub):
+        # subscribers reconnect and catch up from the history
+        for subscription in list(hub.subscriptions):
+            subscription.close()
+
+
+class Mailbox:
+    """
+    A ``Fanout`` subscriber's pending values, only the newest per key. A
+    consumer slower than the publisher skips the values it had no time for
+    instead of queueing them, so its backlog is bounded by the keys it follows.
+    """
+
+    def __init__(self, hub):
+        self.keys = set()
+        self.pending = {}
+        self.coalesced = 0
+        self._hub = hub
+        self._wakeup = asyncio.Event()
+
+    def follow(self, keys):
+        for key in set(keys) - self.keys:
+            self._hub.routes.setdefault(key, set()).add(self)
+            self.keys.add(key)
+
+    def unfollow(self, keys):
+        for key in set(keys) & self.keys:
+            subscribers = self._hub.routes[key]
+            subscribers.discard(self)
+            if not subscribers:
+                del self._hub.routes[key]
+            self.keys.discard(key)
+            self.pending.pop(key, None)
+
+    def put(self, key, value):
+        if key in self.pending:
+            self.coalesced += 1
+        self.pending[key] = value
+        self._wakeup.set()
+
+    async def get(self):
+        """Wait for and return ``{key: value}``, the newest value per key since the last call."""
+        while not self.pending:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        pending, self.pending = self.pending, {}
+        return pending
+
+
+class _RoutingHub(_Hub):
+    def __init__(self):
+        super().__init__()
+        self.routes = {}
+        self.mailboxes = set()
+
+    def __bool__(self):
+        return bool(self.mailboxes)
+
+
+class Fanout(_Relay):
+    """
+    Latest-value fan-out of keyed JSON values, e.g. the newest tick per ticker.
+
+    A published batch is one Redis message of ``key<TAB>json`` lines. Each
+    process routes it through a per-loop table of key to subscribers, so a
+    value costs work only for the subscribers of its key and its JSON is
+    passed through as is. Keys must not contain tabs or newlines.
+    """
+
+    hub_class = _RoutingHub
+
+    def __init__(self, name, remote=None, client_factory=None, alias=DEFAULT_CACHE_ALIAS):
+        super().__init__(f"fanout:{name}", remote, client_factory, alias)
+
+    def publish(self, values):
+        """Send ``{key: value}`` to the subscribers of each key. Returns ``False`` if Redis failed."""
+        if not values:
+            return True
+        message = "\n".join(f"{key}\t{json.dumps(value, cls=JSONEncoder)}" for key, value in values.items())
+        client = self._redis()
+        if client is None:
+            self._route_locally(message)
+            return True
+        try:
+            client.publish(self.channel, message)
+        except Exception:
+            logger.exception("Fanout %s: failed to publish %d values", self.channel, len(values))
+            return False
+        return True
+
+    @asynccontextmanager
+    async def subscribe(self, keys=()):
+        """Yield a ``Mailbox`` following ``keys``; ``follow``/``unfollow`` change them later."""
+        hub = self._attach()
+        mailbox = Mailbox(hub)
+        hub.mailboxes.add(mailbox)
+        mailbox.follow(keys)
+        try:
+            await self._until_ready(hub)
+            yield mailbox
+        finally:
+            mailbox.unfollow(list(mailbox.keys))
+            hub.mailboxes.discard(mailbox)
+            self._detach(hub)
+
+    def route(self, hub, message):
+        routes = hub.routes
+        for line in message.split("\n"):
+            key, _, value = line.partition("\t")
+            for mailbox in routes.get(key, ()):
+                mailbox.put(key, value)
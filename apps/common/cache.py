@@ -1,17 +1,407 @@
+import asyncio
+import json
 import logging
+import math
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+
+import redis.asyncio
 from django_redis.cache import RedisCache
 
-from django.core.cache import cache
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CustomRedisCache(RedisCache):
-    def delete_pattern(self, pattern, version=None):
-        """Delete all keys matching the given pattern."""
+    SCAN_COUNT = 1000
+    UNLINK_BATCH_SIZE = 500
+    PIPELINE_BATCHES = 10
+
+    def delete_pattern(self, pattern, version=None, itersize=None, batch_size=None):
+        """
+        Delete all keys matching the given pattern without blocking Redis.
+
+        Keys are found with incremental ``SCAN`` (``itersize`` hint per call)
+        and removed with ``UNLINK`` in ``batch_size`` chunks, several chunks
+        per pipeline round trip. Returns the number of keys deleted.
+        """
+        itersize = itersize or self.SCAN_COUNT
+        batch_size = batch_size or self.UNLINK_BATCH_SIZE
         pattern = self.make_key(pattern, version=version)
-        keys = self.client.keys(pattern)
-        if keys:
-            self.client.delete(*keys)
+        client = self.client.get_client(write=True)
+
+        start = time.perf_counter()
+        deleted = 0
+        batch = []
+        pipeline = client.pipeline(transaction=False)
+        for key in client.scan_iter(match=pattern, count=itersize):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                pipeline.unlink(*batch)
+                batch = []
+                if len(pipeline) >= self.PIPELINE_BATCHES:
+                    deleted += sum(pipeline.execute())
+        if batch:
+            pipeline.unlink(*batch)
+        if len(pipeline):
+            deleted += sum(pipeline.execute())
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "delete_pattern %s: deleted %d keys in %.1f ms",
+            pattern,
+            deleted,
+            elapsed_ms,
+            extra={"cache_keys_deleted": deleted, "cache_delete_ms": elapsed_ms},
+        )
+        return deleted
+
+
+def get_or_compute(
+    key,
+    compute,
+    timeout,
+    beta=1.0,
+    lock_timeout=10,
+    wait_timeout=5,
+    poll_interval=0.05,
+    backend=None,
+):
+    """
+    Return the cached value for ``key``, computing it with ``compute()`` on a miss.
+
+    Only the caller that wins an ``add()`` lock recomputes a cold key; the
+    others poll for its result for up to ``wait_timeout`` seconds before
+    computing it themselves. Warm keys are refreshed early with probability
+    rising towards expiry (XFetch, scaled by ``beta`` and the last compute
+    time), while every other caller keeps serving the current value.
+    """
+    backend = backend or cache
+    lock_key = f"{key}:lock"
+    entry = backend.get(key)
+
+    if entry is not None:
+        value, delta, expires_at = entry
+        if time.time() - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            return value
+        if not backend.add(lock_key, 1, lock_timeout):
+            return value
+        return _recompute(backend, key, lock_key, compute, timeout)
+
+    if backend.add(lock_key, 1, lock_timeout):
+        return _recompute(backend, key, lock_key, compute, timeout)
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        entry = backend.get(key)
+        if entry is not None:
+            return entry[0]
+    logger.warning("get_or_compute %s: gave up waiting for lock holder", key)
+    return compute()
+
+
+def _recompute(backend, key, lock_key, compute, timeout):
+    try:
+        start = time.time()
+        value = compute()
+        delta = time.time() - start
+        backend.set(key, (value, delta, time.time() + timeout), timeout)
+        return value
+    finally:
+        backend.delete(lock_key)
+
+
+class LocalLRUCache:
+    """Thread-safe, size-bounded in-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=10000, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        ttl = self.ttl if timeout is None else min(timeout, self.ttl)
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class AsyncCache:
+    """
+    Async access to a Django cache for async views.
+
+    A django-redis backend is used through a native ``redis.asyncio`` client
+    with the backend's own key format and serializer, so entries are shared
+    with sync code. Other backends fall back to Django's async cache methods,
+    which run the sync ones in a thread. The cache is ``remote`` if given, else
+    the ``alias`` backend from ``CACHES``. ``client_factory`` builds the async
+    client; one is kept per event loop because its connections belong to it.
+    """
+
+    _sentinel = object()
+
+    def __init__(self, remote=None, client_factory=None, alias=DEFAULT_CACHE_ALIAS):
+        self.remote = remote
+        self.alias = alias
+        self.client_factory = client_factory
+        self._clients = weakref.WeakKeyDictionary()
+
+    @property
+    def backend(self):
+        # ``django.core.cache.cache`` is a proxy, not the backend itself
+        return self.remote if self.remote is not None else caches[self.alias]
+
+    def redis_client(self):
+        """Return this event loop's async Redis client, or ``None`` for other backends."""
+        if not isinstance(self.backend, RedisCache):
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            factory = self.client_factory or (lambda: redis.asyncio.from_url(self.backend._server[0]))
+            client = self._clients[loop] = factory()
+        return client
+
+    def _timeout_ms(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.backend.default_timeout
+        return None if timeout is None else int(timeout * 1000)
+
+    async def get(self, key, default=None):
+        client = self.redis_client()
+        if client is None:
+            return await self.backend.aget(key, default)
+        value = await client.get(self.backend.client.make_key(key))
+        return default if value is None else self.backend.client.decode(value)
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        client = self.redis_client()
+        if client is None:
+            return await self.backend.aset(key, value, timeout)
+        await client.set(
+            self.backend.client.make_key(key), self.backend.client.encode(value), px=self._timeout_ms(timeout)
+        )
+
+    async def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT):
+        """Like ``cache.get_or_set``: store ``default()`` only if the key is still missing."""
+        value = await self.get(key, self._sentinel)
+        if value is not self._sentinel:
+            return value
+        client = self.redis_client()
+        if client is None:
+            return await self.backend.aget_or_set(key, default, timeout)
+        nkey = self.backend.client.make_key(key)
+        await client.set(nkey, self.backend.client.encode(default()), nx=True, px=self._timeout_ms(timeout))
+        return self.backend.client.decode(await client.get(nkey))
+
+    async def publish(self, channel, message):
+        client = self.redis_client()
+        if client is not None:
+            await client.publish(channel, message)
+
+    async def close(self):
+        for client in list(self._clients.values()):
+            await client.aclose()
+        self._clients.clear()
+
+
+class TwoTierCache:
+    """
+    An in-process ``LocalLRUCache`` in front of a shared Django cache.
+
+    Writes go to both tiers. When the shared cache is Redis, written keys are
+    published on ``channel`` and every other process evicts its local copy,
+    so local entries are only stale for the pub/sub delay (bounded by
+    ``ttl`` if a message is lost). The shared cache is ``remote`` if given,
+    else the ``alias`` backend from ``CACHES``.
+    """
+
+    _sentinel = object()
+
+    def __init__(self, channel, maxsize=10000, ttl=30, remote=None, alias=DEFAULT_CACHE_ALIAS):
+        self.channel = channel
+        self.local = LocalLRUCache(maxsize=maxsize, ttl=ttl)
+        self._remote = remote
+        self.alias = alias
+        self.aremote = AsyncCache(remote, alias=alias)
+        self.origin = uuid.uuid4().hex
+        self.counters = dict.fromkeys(("local_hits", "local_misses", "remote_hits", "remote_misses"), 0)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    @property
+    def remote(self):
+        # ``django.core.cache.cache`` is a proxy, not the backend itself
+        return self._remote if self._remote is not None else caches[self.alias]
+
+    def get(self, key, default=None):
+        self._ensure_listener()
+        value = self.local.get(key, self._sentinel)
+        if value is not self._sentinel:
+            self.counters["local_hits"] += 1
+            return value
+        self.counters["local_misses"] += 1
+
+        value = self.remote.get(key, self._sentinel)
+        if value is self._sentinel:
+            self.counters["remote_misses"] += 1
+            return default
+        self.counters["remote_hits"] += 1
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value, timeout=None):
+        self.set_many({key: value}, timeout)
+
+    def set_many(self, mapping, timeout=None):
+        self.remote.set_many(mapping, timeout)
+        for key, value in mapping.items():
+            self.local.set(key, value, timeout)
+        self._publish(list(mapping))
+
+    def get_or_set(self, key, default, timeout=None):
+        value = self.get(key, self._sentinel)
+        if value is not self._sentinel:
+            return value
+        value = self.remote.get_or_set(key, default, timeout)
+        self.local.set(key, value, timeout)
+        return value
+
+    def delete_many(self, keys):
+        self.remote.delete_many(keys)
+        self.local.delete_many(keys)
+        self._publish(list(keys))
+
+    async def aget(self, key, default=None):
+        """``get`` for async code; the shared tier is read with the async client."""
+        self._ensure_listener()
+        value = self.local.get(key, self._sentinel)
+        if value is not self._sentinel:
+            self.counters["local_hits"] += 1
+            return value
+        self.counters["local_misses"] += 1
+
+        value = await self.aremote.get(key, self._sentinel)
+        if value is self._sentinel:
+            self.counters["remote_misses"] += 1
+            return default
+        self.counters["remote_hits"] += 1
+        self.local.set(key, value)
+        return value
+
+    async def aset(self, key, value, timeout=None):
+        await self.aremote.set(key, value, timeout)
+        self.local.set(key, value, timeout)
+        if self._redis() is not None:
+            await self.aremote.publish(self.channel, json.dumps({"origin": self.origin, "keys": [key]}))
+
+    async def aget_or_set(self, key, default, timeout=None):
+        value = await self.aget(key, self._sentinel)
+        if value is not self._sentinel:
+            return value
+        value = await self.aremote.get_or_set(key, default, timeout)
+        self.local.set(key, value, timeout)
+        return value
+
+    def stats(self):
+        lookups = self.counters["local_hits"] + self.counters["local_misses"]
+        return {
+            **self.counters,
+            "local_hit_ratio": self.counters["local_hits"] / lookups if lookups else None,
+            "local_size": len(self.local),
+            "local_maxsize": self.local.maxsize,
+            "local_evictions": self.local.evictions,
+        }
+
+    def close(self):
+        self._stopped.set()
+
+    def _redis(self):
+        if isinstance(self.remote, RedisCache):
+            return self.remote.client.get_client(write=True)
+        return None
+
+    def _publish(self, keys):
+        client = self._redis()
+        if client is None or not keys:
+            return
+        try:
+            client.publish(self.channel, json.dumps({"origin": self.origin, "keys": keys}))
+        except Exception:
+            logger.exception("TwoTierCache %s: failed to publish invalidation", self.channel)
+
+    def _ensure_listener(self):
+        if self._listener is not None or self._redis() is None:
+            return
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name=f"cache-invalidation-{self.channel}", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        backoff = 0.5
+        while not self._stopped.is_set():
+            client = self._redis()
+            if client is None:
+                self._listener = None
+                return
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # anything cached before (re)subscribing may have missed an invalidation
+                self.local.clear()
+                backoff = 0.5
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload["origin"] != self.origin:
+                        self.local.delete_many(payload["keys"])
+                pubsub.close()
+            except Exception:
+                logger.exception("TwoTierCache %s: invalidation listener failed", self.channel)
+                self.local.clear()
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30)
 
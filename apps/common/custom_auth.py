@@ -1,7 +1,9 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 User = get_user_model()
@@ -9,15 +11,13 @@ User = get_user_model()
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
-        authenticate_kwargs = {
-            self.username_field: attrs[self.username_field],
-            "password": attrs["password"],
-        }
-        try:
-            authenticate_kwargs["request"] = self.context["request"]
-        except KeyError:
-            pass
+        """
+        Issue a token pair with one user lookup and one password hash check.
 
+        ``authenticate()`` and ``TokenObtainPairSerializer.validate`` would each
+        load the user and run the hasher again, so their checks are done here
+        directly against the fetched row.
+        """
         try:
             user = User.objects.get(**{self.username_field: attrs[self.username_field]})
         except User.DoesNotExist:
@@ -25,21 +25,20 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 "No account found with this email address."
             )
 
-        # If  the user exists, try to authenticate
-        self.user = authenticate(**authenticate_kwargs)
-
-        if self.user is None:
+        # ModelBackend rejected inactive accounts, so they get the password error too
+        if not (user.check_password(attrs["password"]) and user.is_active):
             raise serializers.ValidationError("Incorrect password. Please try again.")
 
-        if not self.user.is_active:
-            raise serializers.ValidationError("User account is disabled.")
-
-        if not self.user.is_verified:
+        if not user.is_verified:
             raise serializers.ValidationError(
                 "User is not verified"
             )
 
-        return super().validate(attrs)
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -0,0 +1,56 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# The replica reads go to in the current context, or None for the primary.
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Send reads in this context to one read replica, picked at random, until
+    something is written; from then on reads stick to the primary so the
+    context sees its own writes. Without replicas this does nothing.
+    """
+    replicas = settings.REPLICA_DATABASES
+    token = _read_alias.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary in this context, e.g. to fill a cache that outlives replication lag."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Route reads inside ``replica_reads()`` to a replica from
+    ``REPLICA_DATABASES`` and everything else to the primary. Replicas hold
+    the same data, so relations across them are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -1,5 +1,9 @@
+import asyncio
 import logging
 import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formataddr
@@ -17,17 +21,111 @@ logger = logging.getLogger(__name__)
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
 
-async def get_smtp_connection():
-    smtp = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, use_tls=True, timeout=10)
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_POOL_IDLE_TIMEOUT = float(os.getenv("SMTP_POOL_IDLE_TIMEOUT", "60"))
+
+DISCONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError)
+
+
+async def get_smtp_connection(
+    hostname=None, port=None, use_tls=True, username=None, password=None, timeout=10
+):
+    smtp = aiosmtplib.SMTP(
+        hostname=hostname or SMTP_HOST,
+        port=port or SMTP_PORT,
+        use_tls=use_tls,
+        timeout=timeout,
+    )
     await smtp.connect()
-    print(os.getenv("EMAIL_HOST_USER", ""), os.getenv("EMAIL_HOST_PASSWORD", ""))
-    try:
-        await smtp.login(os.getenv("EMAIL_HOST_USER", ""), os.getenv("EMAIL_HOST_PASSWORD", ""))
-    except Exception as e:
-        print(f"error: {e}")
+    username = os.getenv("EMAIL_HOST_USER", "") if username is None else username
+    password = os.getenv("EMAIL_HOST_PASSWORD", "") if password is None else password
+    if username:
+        try:
+            await smtp.login(username, password)
+        except Exception as e:
+            # never hand out (or pool) a session that cannot send
+            logger.error(f"SMTP login failed for {username}: {e}")
+            smtp.close()
+            raise
     return smtp
 
 
+class SMTPConnectionPool:
+    """
+    Reuse authenticated SMTP sessions across messages.
+
+    At most ``size`` connections are open at once; idle ones are kept for
+    ``idle_timeout`` seconds. A message that fails because the server dropped
+    the connection is retried once on a fresh connection. The pool belongs to
+    one event loop: if it is used from a new loop, idle connections from the
+    previous loop are discarded.
+    """
+
+    def __init__(self, size=SMTP_POOL_SIZE, idle_timeout=SMTP_POOL_IDLE_TIMEOUT, **connection_kwargs):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.connection_kwargs = connection_kwargs
+        self._idle = deque()
+        self._loop = None
+        self._semaphore = None
+        self.connections_opened = 0
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            for smtp, _ in self._idle:
+                self._discard(smtp)
+            self._idle.clear()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size)
+
+    def _discard(self, smtp):
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+    async def _acquire(self):
+        now = time.monotonic()
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+            if smtp.is_connected and now - released_at < self.idle_timeout:
+                return smtp
+            self._discard(smtp)
+        self.connections_opened += 1
+        return await get_smtp_connection(**self.connection_kwargs)
+
+    @asynccontextmanager
+    async def connection(self):
+        self._bind_loop()
+        async with self._semaphore:
+            smtp = await self._acquire()
+            try:
+                yield smtp
+            except BaseException:
+                self._discard(smtp)
+                raise
+            else:
+                self._idle.append((smtp, time.monotonic()))
+
+    async def send_message(self, message):
+        try:
+            async with self.connection() as smtp:
+                return await smtp.send_message(message)
+        except DISCONNECT_ERRORS as e:
+            logger.warning(f"SMTP connection lost ({e}); retrying on a new connection")
+        async with self.connection() as smtp:
+            return await smtp.send_message(message)
+
+    async def close(self):
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            try:
+                await smtp.quit()
+            except Exception:
+                self._discard(smtp)
+
+
 @lru_cache(maxsize=100)
 def render_personalized_text(username, verification_code):
     return f"""
@@ -39,7 +137,7 @@ def render_personalized_text(username, verification_code):
     Miky Rola
     """
 
-async def send_email(subject, verification_code, recipient_email, username="Friend"):
+def build_message(subject, text_content, recipient_email, username="Friend"):
     sender_email = os.getenv("EMAIL_HOST_USER", default="")
     sender_name = "Research Project"
     formatted_sender = formataddr((sender_name, sender_email))
@@ -49,17 +147,25 @@ async def send_email(subject, verification_code, recipient_email, username="Frie
     message["From"] = formatted_sender
     message["To"] = formatted_recipient
     message["Subject"] = subject
-
-    text_content = render_personalized_text(username, verification_code)
     message.attach(MIMEText(text_content, "plain"))
+    return message
 
-    smtp = await get_smtp_connection()
+
+async def send_email(subject, verification_code, recipient_email, username="Friend", pool=None):
+    """Send a verification email, over ``pool`` if given, else on a one-off connection."""
+    text_content = render_personalized_text(username, verification_code)
+    message = build_message(subject, text_content, recipient_email, username)
 
     try:
-        await smtp.send_message(message)
+        if pool is not None:
+            await pool.send_message(message)
+        else:
+            smtp = await get_smtp_connection()
+            try:
+                await smtp.send_message(message)
+            finally:
+                await smtp.quit()
         logger.info(f"Email sent successfully to {recipient_email}")
     except Exception as e:
         logger.error(f"Failed to send email to {recipient_email}: {e}")
-        raise  
-    finally:
-        await smtp.quit()
\ No newline at end of file
+        raise
\ No newline at end of file
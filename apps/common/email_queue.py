@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+
+from .email import SMTPConnectionPool, build_message, render_personalized_text
+from .models import EmailJob
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, verification_code, recipient_email, username="Friend", expires_in=None):
+    """
+    Queue a verification email for the background worker instead of sending
+    it inline. Pass the code's lifetime as ``expires_in`` so the email is not
+    delivered after the code stopped working.
+    """
+    return EmailJob.objects.enqueue(
+        subject,
+        render_personalized_text(username, verification_code),
+        recipient_email,
+        username,
+        expires_in=expires_in,
+    )
+
+
+class EmailWorker:
+    """
+    Drains the ``EmailJob`` queue over a shared SMTP connection pool.
+
+    Meant to live for the whole process on a single event loop so pooled
+    sessions are reused across batches; database access goes through
+    ``sync_to_async`` and each batch is sent concurrently up to the pool size.
+    """
+
+    def __init__(self, pool=None, batch_size=20, purge_interval=60 * 60):
+        self.pool = pool or SMTPConnectionPool()
+        self.batch_size = batch_size
+        self.purge_interval = purge_interval
+        self._purged_at = None
+
+    async def _send(self, job):
+        message = build_message(job.subject, job.body, job.recipient_email, job.recipient_name or "Friend")
+        await self.pool.send_message(message)
+
+    @sync_to_async
+    def _record(self, jobs, results):
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                job.mark_failed(result)
+                logger.warning(
+                    f"Email to {job.recipient_email} failed (attempt {job.attempts}): {result}",
+                    extra={"email_job": str(job.id), "email_status": job.status},
+                )
+            else:
+                job.mark_sent()
+                latency = (job.sent_at - job.created_at).total_seconds()
+                logger.info(
+                    f"Email sent to {job.recipient_email} in {latency:.2f}s",
+                    extra={"email_job": str(job.id), "email_latency_s": latency},
+                )
+
+    async def process_batch(self):
+        """Claim, send and record one batch. Returns the number of jobs handled."""
+        jobs = await sync_to_async(EmailJob.objects.claim)(self.batch_size)
+        if not jobs:
+            return 0
+        results = await asyncio.gather(*(self._send(job) for job in jobs), return_exceptions=True)
+        await self._record(jobs, results)
+        return len(jobs)
+
+    async def purge(self):
+        """Delete finished jobs at most once per ``purge_interval`` seconds."""
+        now = time.monotonic()
+        if self._purged_at is not None and now - self._purged_at < self.purge_interval:
+            return
+        self._purged_at = now
+        deleted = await sync_to_async(EmailJob.objects.purge)()
+        if deleted:
+            logger.info(f"Purged {deleted} finished email jobs")
+
+    async def run(self, poll_interval=1.0, stop=None):
+        """Process batches until ``stop`` is set, sleeping only when the queue is empty."""
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                if await self.process_batch():
+                    continue
+                await self.purge()
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.pool.close()
+
@@ -0,0 +1,12 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...models import EmailJob
+
+
+class Command(BaseCommand):
+    help = "Print email queue depth and recent delivery latency."
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(EmailJob.objects.stats(), indent=2))
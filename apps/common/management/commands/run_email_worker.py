@@ -0,0 +1,40 @@
+import asyncio
+import signal
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+
+from ...email_queue import EmailWorker
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails over a pooled SMTP connection until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20, help="Jobs claimed per batch.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the due jobs once and exit.")
+
+    def handle(self, *args, **options):
+        worker = EmailWorker(batch_size=options["batch_size"])
+
+        async def main():
+            if options["once"]:
+                total = 0
+                try:
+                    while handled := await worker.process_batch():
+                        total += handled
+                finally:
+                    await worker.pool.close()
+                return total
+
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            await worker.run(poll_interval=options["poll_interval"], stop=stop)
+
+        # async_to_sync keeps ORM calls on this thread while the worker owns one loop.
+        total = async_to_sync(main)()
+        if options["once"]:
+            self.stdout.write(self.style.SUCCESS(f"Processed {total} email jobs"))
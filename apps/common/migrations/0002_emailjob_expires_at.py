@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+def blank_finished_bodies(apps, schema_editor):
+    """Drop the one-time codes kept in the bodies of jobs that are done."""
+    EmailJob = apps.get_model("common", "EmailJob")
+    EmailJob.objects.using(schema_editor.connection.alias).filter(status__in=["sent", "failed"]).exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_emailjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailjob',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(blank_finished_bodies, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
+import random
 import uuid
+from datetime import timedelta
 
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -30,3 +33,142 @@ class BaseModel(models.Model):
         if self.is_active:
             self.is_active = False
             self.save(update_fields=["is_active", "modified_at"] if self.pk else None)
+
+
+class EmailJobManager(models.Manager):
+    def enqueue(self, subject, body, recipient_email, recipient_name="", expires_in=None):
+        """Queue an email; with ``expires_in`` it is dropped if not sent within that time."""
+        return self.create(
+            subject=subject,
+            body=body,
+            recipient_email=recipient_email,
+            recipient_name=recipient_name,
+            expires_at=timezone.now() + expires_in if expires_in is not None else None,
+        )
+
+    def claim(self, batch_size, lease=timedelta(minutes=5)):
+        """
+        Lock up to ``batch_size`` due jobs for this worker and mark them as
+        sending. Jobs left in ``sending`` longer than ``lease`` (a crashed
+        worker) are claimed again.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            self.filter(
+                status__in=[EmailJob.PENDING, EmailJob.SENDING], expires_at__lte=now
+            ).update(status=EmailJob.FAILED, body="", last_error="Expired before it could be sent", modified_at=now)
+            jobs = list(
+                self.select_for_update(skip_locked=True)
+                .filter(
+                    models.Q(status=EmailJob.PENDING, next_attempt_at__lte=now)
+                    | models.Q(status=EmailJob.SENDING, modified_at__lt=now - lease)
+                )
+                .order_by("next_attempt_at")[:batch_size]
+            )
+            self.filter(id__in=[job.id for job in jobs]).update(
+                status=EmailJob.SENDING, modified_at=now
+            )
+        return jobs
+
+    def purge(self, older_than=timedelta(days=1)):
+        """Delete sent and failed jobs last touched more than ``older_than`` ago. Returns the number deleted."""
+        deleted, _ = self.filter(
+            status__in=[EmailJob.SENT, EmailJob.FAILED], modified_at__lt=timezone.now() - older_than
+        ).delete()
+        return deleted
+
+    def stats(self, window=timedelta(hours=1), sample=1000):
+        """Queue depth plus delivery latency percentiles over recently sent jobs."""
+        now = timezone.now()
+        pending = self.filter(status__in=[EmailJob.PENDING, EmailJob.SENDING])
+        oldest = pending.order_by("created_at").values_list("created_at", flat=True).first()
+        latencies = sorted(
+            (sent_at - created_at).total_seconds()
+            for created_at, sent_at in self.filter(
+                status=EmailJob.SENT, sent_at__gte=now - window
+            )
+            .order_by("-sent_at")
+            .values_list("created_at", "sent_at")[:sample]
+        )
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+        return {
+            "depth": pending.count(),
+            "oldest_pending_seconds": (now - oldest).total_seconds() if oldest else None,
+            "failed": self.filter(status=EmailJob.FAILED).count(),
+            "sent_in_window": len(latencies),
+            "latency_p50_seconds": percentile(0.5),
+            "latency_p95_seconds": percentile(0.95),
+        }
+
+
+class EmailJob(BaseModel):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    RETRY_BASE_DELAY = 30
+    RETRY_MAX_DELAY = 60 * 60
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    recipient_email = models.EmailField()
+    recipient_name = models.CharField(max_length=150, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # e.g. a one-time code's own expiry; sending after it is pointless
+    expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    objects = EmailJobManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_email}: {self.subject} ({self.status})"
+
+    def mark_sent(self):
+        """Record delivery. The body may hold a one-time code, so it is not kept."""
+        self.status = self.SENT
+        self.attempts += 1
+        self.sent_at = timezone.now()
+        self.body = ""
+        self.last_error = ""
+        self.save(update_fields=["status", "attempts", "sent_at", "body", "last_error", "modified_at"])
+
+    def mark_failed(self, error):
+        """
+        Record a failed attempt and schedule a retry with exponential backoff
+        and jitter. The job fails for good after ``max_attempts`` or when the
+        retry would come after ``expires_at``.
+        """
+        self.attempts += 1
+        self.last_error = str(error)
+        delay = min(self.RETRY_BASE_DELAY * 2 ** (self.attempts - 1), self.RETRY_MAX_DELAY)
+        next_attempt_at = timezone.now() + timedelta(seconds=delay * random.uniform(0.9, 1.1))
+        if self.attempts >= self.max_attempts or (self.expires_at and next_attempt_at >= self.expires_at):
+            self.status = self.FAILED
+            self.body = ""
+        else:
+            self.status = self.PENDING
+            self.next_attempt_at = next_attempt_at
+        self.save(
+            update_fields=["status", "attempts", "body", "last_error", "next_attempt_at", "modified_at"]
+        )
@@ -1,13 +1,187 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+import uuid
+from datetime import datetime
 
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
-class DefaultPagination(PageNumberPagination):
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over ``(created_at, id)``, newest first.
+
+    Each page is a single indexed range scan regardless of depth. The total
+    ``count`` costs an extra ``COUNT(*)`` and can be skipped with ``?count=false``.
+    The order is fixed, so ``?ordering=`` is rejected rather than ignored.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+    ordering_message = "Cursor pagination is always ordered by newest first; drop the ordering parameter."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size, cursor = self.start_page(request)
+        if self.count_requested(request):
+            self.count = queryset.count()
+        queryset, reverse = self.seek(queryset, cursor)
+        return self.finish_page(list(queryset[: page_size + 1]), page_size, cursor, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, using the async ORM."""
+        page_size, cursor = self.start_page(request)
+        if self.count_requested(request):
+            self.count = await queryset.acount()
+        queryset, reverse = self.seek(queryset, cursor)
+        results = [obj async for obj in queryset[: page_size + 1].aiterator()]
+        return self.finish_page(results, page_size, cursor, reverse)
+
+    def start_page(self, request):
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            raise ValidationError({api_settings.ORDERING_PARAM: [self.ordering_message]})
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.count = None
+        return self.get_page_size(request), self.decode_cursor(request)
+
+    def count_requested(self, request):
+        return request.query_params.get(self.count_query_param, "true").lower() not in ("0", "false")
+
+    def seek(self, queryset, cursor):
+        """Order ``queryset`` for the page direction and filter it past the cursor."""
+        reverse = bool(cursor and cursor["reverse"])
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        if cursor:
+            # The inclusive bound on created_at alone lets the (created_at, id)
+            # index seek to the cursor; the OR only breaks ties within it.
+            lookup = "gt" if reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"created_at__{lookup}e": cursor["created_at"]}),
+                Q(**{f"created_at__{lookup}": cursor["created_at"]})
+                | Q(**{f"id__{lookup}": cursor["id"]}),
+            )
+        return queryset, reverse
+
+    def finish_page(self, results, page_size, cursor, reverse):
+        """Trim the ``page_size + 1`` rows fetched and record the neighbouring positions."""
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = results[-1]
+            if cursor and (has_more or not reverse):
+                self.previous_position = results[0]
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return {
+                "created_at": datetime.fromisoformat(data["c"]),
+                "id": uuid.UUID(data["i"]),
+                "reverse": bool(data.get("r")),
+            }
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse=False):
+        data = {"c": instance.created_at.isoformat(), "i": str(instance.pk)}
+        if reverse:
+            data["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_data(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return response
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class KeysetModeMixin:
+    """
+    Switch a page-number paginator to ``KeysetPagination`` when the ``cursor``
+    query parameter is present (``?cursor=`` starts from the first page).
+    """
+
+    keyset_class = KeysetPagination
+    _keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self._keyset = self.keyset_class()
+        self._keyset.page_size = self.page_size
+        self._keyset.max_page_size = self.max_page_size
+        return self._keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self._keyset is not None:
+            return self._keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self._keyset is not None:
+            return self._keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self._keyset is not None:
+            return self._keyset.get_previous_link()
+        return super().get_previous_link()
+
+
+class DefaultPagination(KeysetModeMixin, PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
 
 
-class LargePagination(PageNumberPagination):
+class LargePagination(KeysetModeMixin, PageNumberPagination):
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 1000
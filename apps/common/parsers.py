@@ -0,0 +1,35 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parse a newline-delimited JSON stream into a list.
+
+    Lines that are not valid JSON are kept as ``None`` so callers can report
+    them per row instead of rejecting the whole payload.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read().decode(encoding)
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"NDJSON parse error - {exc}")
+
+        rows = []
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)
+        return rows
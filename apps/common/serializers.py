@@ -0,0 +1,35 @@
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    Let a ``ModelSerializer`` emit only a subset of its fields, passed as
+    ``fields=[...]``. ``parse_fields`` turns a ``?fields=a,b`` parameter into
+    that list and ``model_fields`` the matching columns for ``QuerySet.only()``.
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_fields(cls, request):
+        """Return the requested field names, or ``None`` for all. Unknown names are a 400."""
+        raw = request.query_params.get(cls.fields_query_param)
+        if not raw:
+            return None
+        fields = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = set(fields) - set(cls.Meta.fields)
+        if unknown:
+            raise ValidationError({cls.fields_query_param: f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return fields
+
+    @classmethod
+    def model_fields(cls, fields=None):
+        """Model columns backing ``fields`` (all declared fields when ``None``)."""
+        model_field_names = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        return [name for name in fields or cls.Meta.fields if name in model_field_names]
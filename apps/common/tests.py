@@ -1,3 +1,506 @@
-from django.test import TestCase
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import aiosmtplib
+import fakeredis
+import pytest
+import redis.asyncio
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from apps.common.broadcast import Broadcast, Fanout
+from apps.common.db_routers import primary_reads, replica_reads
+from apps.common.cache import AsyncCache, LocalLRUCache, TwoTierCache, get_or_compute
+from apps.common.email import SMTPConnectionPool, build_message
+from apps.common.email_queue import EmailWorker, enqueue_email
+from apps.common.models import EmailJob
+
+
+class TestCustomRedisCache:
+    def test_delete_pattern_removes_only_matching_keys(self, redis_cache):
+        redis_cache.set_many({f"signal_{i}": i for i in range(1234)})
+        redis_cache.set("marketdata_1", "keep")
+
+        # fakeredis cursors are list offsets that shift when keys are unlinked
+        # mid-scan (real Redis cursors do not), so fetch everything in one SCAN
+        # page and exercise the UNLINK chunking and pipelining.
+        deleted = redis_cache.delete_pattern("signal_*", itersize=5000, batch_size=50)
+
+        assert deleted == 1234
+        assert redis_cache.get("signal_1") is None
+        assert redis_cache.get("marketdata_1") == "keep"
+
+    def test_delete_pattern_respects_version(self, redis_cache):
+        redis_cache.set("signal_1", 1, version=1)
+        redis_cache.set("signal_1", 2, version=2)
+
+        assert redis_cache.delete_pattern("signal_*", version=2) == 1
+        assert redis_cache.get("signal_1", version=1) == 1
+
+    def test_delete_pattern_does_not_use_keys(self, redis_cache, monkeypatch):
+        client = redis_cache.client.get_client(write=True)
+        monkeypatch.setattr(client, "keys", pytest.fail)
+        redis_cache.set("signal_1", 1)
+
+        assert redis_cache.delete_pattern("signal_*") == 1
+
+    def test_delete_pattern_no_match(self, redis_cache, caplog):
+        with caplog.at_level("INFO", logger="apps.common.cache"):
+            assert redis_cache.delete_pattern("missing_*") == 0
+        assert caplog.records[-1].cache_keys_deleted == 0
+
+
+class TestGetOrCompute:
+    def test_cold_key_computed_once(self, redis_cache):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"page": 1}
+
+        assert get_or_compute("page", compute, 60, backend=redis_cache) == {"page": 1}
+        assert get_or_compute("page", compute, 60, backend=redis_cache) == {"page": 1}
+        assert len(calls) == 1
+
+    def test_concurrent_cold_misses_single_flight(self, redis_cache):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(2)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            futures = [
+                pool.submit(get_or_compute, "hot", compute, 60, poll_interval=0.01, backend=redis_cache)
+                for _ in range(20)
+            ]
+            time.sleep(0.2)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["value"] * 20
+        assert len(calls) == 1
+
+    def test_early_refresh_near_expiry(self, redis_cache):
+        redis_cache.set("page", ("old", 1.0, time.time() + 0.5), 60)
+
+        # beta scales the refresh window; a large one makes the refresh certain
+        assert get_or_compute("page", lambda: "new", 60, beta=1000, backend=redis_cache) == "new"
+        assert redis_cache.get("page")[0] == "new"
+
+    def test_early_refresh_serves_stale_while_locked(self, redis_cache):
+        redis_cache.set("page", ("old", 1.0, time.time() + 0.5), 60)
+        redis_cache.add("page:lock", 1, 10)
+
+        assert get_or_compute("page", pytest.fail, 60, beta=1000, backend=redis_cache) == "old"
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRUCache(maxsize=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("b") is None
+        assert (lru.get("a"), lru.get("c")) == (1, 3)
+        assert lru.evictions == 1
+
+    def test_entries_expire(self, monkeypatch):
+        lru = LocalLRUCache(ttl=60)
+        lru.set("a", 1, timeout=5)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+        assert lru.get("a") is None
+
+
+class TestTwoTierCache:
+    def test_counts_hits_per_tier(self, redis_cache):
+        two_tier = TwoTierCache("test-invalidation", remote=redis_cache)
+        redis_cache.set("signal", {"id": 1})
+
+        assert two_tier.get("signal") == {"id": 1}
+        assert two_tier.get("signal") == {"id": 1}
+        assert two_tier.get("missing") is None
+        two_tier.close()
+
+        stats = two_tier.stats()
+        assert (stats["local_hits"], stats["local_misses"]) == (1, 2)
+        assert (stats["remote_hits"], stats["remote_misses"]) == (1, 1)
+
+    def test_writes_invalidate_other_processes(self, redis_cache):
+        worker_a = TwoTierCache("test-invalidation", remote=redis_cache)
+        worker_b = TwoTierCache("test-invalidation", remote=redis_cache)
+        worker_a.set("version", 1)
+        assert worker_b.get("version") == 1
+
+        deadline = time.monotonic() + 5
+        while True:
+            worker_a.set("version", 2)
+            if worker_b.local.get("version") is None or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+
+        assert worker_b.get("version") == 2
+        worker_a.close()
+        worker_b.close()
+
+
+    def test_default_backend_invalidates_other_processes(self, redis_default_cache):
+        worker_a, worker_b = TwoTierCache("test-default-invalidation"), TwoTierCache("test-default-invalidation")
+        assert worker_a._redis() is not None
+
+        worker_a.set("version", 1)
+        assert worker_b.get("version") == 1
+        deadline = time.monotonic() + 5
+        while worker_b.local.get("version") is not None and time.monotonic() < deadline:
+            worker_a.set("version", 2)
+            time.sleep(0.05)
+
+        assert worker_b.get("version") == 2
+        assert redis_default_cache.get("version") == 2
+        worker_a.close()
+        worker_b.close()
+
+
+class TestAsyncCache:
+    def test_shares_entries_with_sync_cache(self, redis_cache):
+        server = redis_cache.client.get_client().connection_pool.connection_kwargs["server"]
+        async_cache = AsyncCache(redis_cache, client_factory=lambda: fakeredis.FakeAsyncRedis(server=server))
+        redis_cache.set("from_sync", {"id": 1})
+
+        async def main():
+            assert await async_cache.get("from_sync") == {"id": 1}
+            assert await async_cache.get("missing", "default") == "default"
+            await async_cache.set("from_async", [1, 2], 60)
+            assert await async_cache.get_or_set("from_async", lambda: "ignored") == [1, 2]
+            assert await async_cache.get_or_set("version", lambda: 7, None) == 7
+            await async_cache.close()
+
+        asyncio.run(main())
+        assert redis_cache.get("from_async") == [1, 2]
+        assert redis_cache.ttl("from_async") <= 60
+        assert redis_cache.get("version") == 7
+
+    def test_default_backend_is_resolved_from_caches(self, redis_default_cache, monkeypatch):
+        server = redis_default_cache.client.get_client().connection_pool.connection_kwargs["server"]
+        monkeypatch.setattr(redis.asyncio, "from_url", lambda url: fakeredis.FakeAsyncRedis(server=server))
+        async_cache = AsyncCache()
+
+        async def main():
+            assert async_cache.redis_client() is not None
+            await async_cache.set("from_default", "value", 60)
+            await async_cache.close()
+
+        asyncio.run(main())
+        assert async_cache.backend is redis_default_cache
+        assert redis_default_cache.get("from_default") == "value"
+
+    def test_falls_back_to_django_async_methods(self):
+        async_cache = AsyncCache()
+
+        async def main():
+            await async_cache.set("async_fallback", "value", 60)
+            assert await async_cache.get("async_fallback") == "value"
+            assert await async_cache.get_or_set("async_fallback_default", lambda: 3, 60) == 3
+
+        asyncio.run(main())
+
+
+def fake_async_redis(redis_cache):
+    server = redis_cache.client.get_client().connection_pool.connection_kwargs["server"]
+    return lambda: fakeredis.FakeAsyncRedis(server=server)
+
+
+class TestBroadcast:
+    def test_subscribers_receive_matching_events(self):
+        broadcast = Broadcast("test-local")
+
+        async def main():
+            async with broadcast.subscribe(lambda data: data["ticker"] == "AAPL") as events:
+                broadcast.publish({"ticker": "MSFT"})
+                event_id = broadcast.publish({"ticker": "AAPL"})
+                assert await anext(events) == (event_id, {"ticker": "AAPL"})
+
+        asyncio.run(main())
+
+    def test_resume_replays_missed_events_then_live_ones(self):
+        broadcast = Broadcast("test-resume")
+        seen, missed = broadcast.publish({"n": 1}), broadcast.publish({"n": 2})
+
+        async def main():
+            async with broadcast.subscribe(last_event_id=seen) as events:
+                live = broadcast.publish({"n": 3})
+                assert await anext(events) == (missed, {"n": 2})
+                assert await anext(events) == (live, {"n": 3})
+
+        asyncio.run(main())
+
+    def test_slow_subscriber_is_cut_off(self):
+        broadcast = Broadcast("test-slow", queue_size=2)
+
+        async def main():
+            async with broadcast.subscribe() as events:
+                for n in range(5):
+                    broadcast.publish({"n": n})
+                return [data["n"] async for _, data in events]
+
+        assert asyncio.run(main()) == [0, 1]
+
+    def test_heartbeat_when_idle(self):
+        broadcast = Broadcast("test-heartbeat")
+
+        async def main():
+            async with broadcast.subscribe(heartbeat=0.01) as events:
+                assert await anext(events) is None
+
+        asyncio.run(main())
+
+    def test_fan_out_and_resume_through_redis(self, redis_cache):
+        broadcast = Broadcast("test-redis", remote=redis_cache, client_factory=fake_async_redis(redis_cache))
+        first = broadcast.publish({"n": 1})
+
+        async def main():
+            async with broadcast.subscribe(last_event_id=first) as events:
+                second = await asyncio.to_thread(broadcast.publish, {"n": 2})
+                assert await asyncio.wait_for(anext(events), 5) == (second, {"n": 2})
+            await broadcast.aremote.close()
+
+        asyncio.run(main())
+        assert redis_cache.client.get_client().xlen("broadcast:test-redis:stream") == 2
+
+
+class TestFanout:
+    def test_routes_values_to_followers_of_each_key(self):
+        fanout = Fanout("test-routing")
+
+        async def main():
+            async with fanout.subscribe(["AAPL"]) as apple, fanout.subscribe(["AAPL", "MSFT"]) as both:
+                fanout.publish({"AAPL": {"iv": 0.2}, "TSLA": {"iv": 0.5}})
+                fanout.publish({"MSFT": {"iv": 0.3}})
+                assert await apple.get() == {"AAPL": '{"iv": 0.2}'}
+                assert await both.get() == {"AAPL": '{"iv": 0.2}', "MSFT": '{"iv": 0.3}'}
+
+                apple.unfollow(["AAPL"])
+                apple.follow(["TSLA"])
+                fanout.publish({"AAPL": {"iv": 0.4}, "TSLA": {"iv": 0.6}})
+                assert await apple.get() == {"TSLA": '{"iv": 0.6}'}
+
+        asyncio.run(main())
+
+    def test_slow_subscriber_gets_latest_value(self):
+        fanout = Fanout("test-coalesce")
+
+        async def main():
+            async with fanout.subscribe(["AAPL"]) as mailbox:
+                for n in range(100):
+                    fanout.publish({"AAPL": n})
+                await asyncio.sleep(0)
+                assert await mailbox.get() == {"AAPL": "99"}
+                assert mailbox.coalesced == 99
+
+        asyncio.run(main())
+
+    def test_fan_out_through_redis(self, redis_cache):
+        fanout = Fanout("test-redis", remote=redis_cache, client_factory=fake_async_redis(redis_cache))
+
+        async def main():
+            async with fanout.subscribe(["AAPL"]) as mailbox:
+                assert await asyncio.to_thread(fanout.publish, {"AAPL": 1, "MSFT": 2})
+                assert await asyncio.wait_for(mailbox.get(), 5) == {"AAPL": "1"}
+            await fanout.aremote.close()
+
+        asyncio.run(main())
+
+
+def pool_for(controller, size=4, idle_timeout=60):
+    return SMTPConnectionPool(
+        size=size,
+        idle_timeout=idle_timeout,
+        hostname=controller.hostname,
+        port=controller.port,
+        use_tls=False,
+        username="",
+    )
+
+
+def messages(count):
+    return [build_message("Digest", f"body {i}", f"user{i}@example.com", f"user{i}") for i in range(count)]
+
+
+class TestSMTPConnectionPool:
+    def test_reuses_connections(self, smtp_server):
+        controller, handler = smtp_server
+        pool = pool_for(controller, size=4)
+
+        async def run():
+            await asyncio.gather(*(pool.send_message(message) for message in messages(50)))
+            await pool.close()
+
+        asyncio.run(run())
+        assert len(handler.messages) == 50
+        assert pool.connections_opened == 4
+
+    def test_reconnects_after_disconnect(self, smtp_server):
+        controller, handler = smtp_server
+        pool = pool_for(controller, size=1)
+
+        async def run():
+            await pool.send_message(messages(1)[0])
+            # simulate the server dropping the idle session
+            pool._idle[0][0].transport.close()
+            await asyncio.sleep(0)
+            await pool.send_message(messages(1)[0])
+            await pool.close()
+
+        asyncio.run(run())
+        assert len(handler.messages) == 2
+        assert pool.connections_opened == 2
+
+    def test_idle_connections_expire(self, smtp_server):
+        controller, handler = smtp_server
+        pool = pool_for(controller, size=1, idle_timeout=0)
+
+        async def run():
+            for message in messages(3):
+                await pool.send_message(message)
+            await pool.close()
+
+        asyncio.run(run())
+        assert pool.connections_opened == 3
+
+    def test_failed_login_is_raised_and_not_pooled(self, smtp_server):
+        controller, handler = smtp_server
+        pool = pool_for(controller, size=1)
+        pool.connection_kwargs["username"] = "user"
+
+        async def run():
+            with pytest.raises(aiosmtplib.SMTPException):
+                await pool.send_message(messages(1)[0])
+
+        asyncio.run(run())
+        assert not pool._idle
+        assert handler.messages == []
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEmailWorker:
+    def test_delivers_queued_jobs(self, smtp_server):
+        controller, handler = smtp_server
+        for i in range(5):
+            enqueue_email("Your Password Reset", "123456", f"user{i}@example.com", f"user{i}")
+        worker = EmailWorker(pool=pool_for(controller, size=2), batch_size=3)
+
+        async def drain():
+            while await worker.process_batch():
+                pass
+            await worker.pool.close()
+
+        async_to_sync(drain)()
+        assert len(handler.messages) == 5
+        assert worker.pool.connections_opened == 2
+        assert EmailJob.objects.filter(status=EmailJob.SENT).count() == 5
+        stats = EmailJob.objects.stats()
+        assert stats["depth"] == 0
+        assert stats["sent_in_window"] == 5
+        assert stats["latency_p95_seconds"] is not None
+
+    def test_failed_send_is_retried_with_backoff(self):
+        job = enqueue_email("Your Password Reset", "123456", "user@example.com")
+        # nothing listens on this port, so every attempt fails
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        pool = SMTPConnectionPool(hostname="127.0.0.1", port=port, use_tls=False, username="", timeout=1)
+        worker = EmailWorker(pool=pool)
+
+        assert async_to_sync(worker.process_batch)() == 1
+        job.refresh_from_db()
+        assert job.status == EmailJob.PENDING
+        assert job.attempts == 1
+        assert job.last_error
+        assert job.next_attempt_at > timezone.now() + timedelta(seconds=20)
+        # not due yet, so the next pass finds nothing to do
+        assert async_to_sync(worker.process_batch)() == 0
+
+        job.attempts = job.max_attempts - 1
+        job.next_attempt_at = timezone.now()
+        job.save()
+        async_to_sync(worker.process_batch)()
+        job.refresh_from_db()
+        assert job.status == EmailJob.FAILED
+        assert EmailJob.objects.stats()["failed"] == 1
+
+    def test_finished_jobs_keep_no_body_and_are_purged(self, smtp_server):
+        controller, handler = smtp_server
+        job = enqueue_email("Your Password Reset", "123456", "user@example.com")
+        worker = EmailWorker(pool=pool_for(controller, size=1))
+
+        async def drain():
+            await worker.process_batch()
+            await worker.pool.close()
+
+        async_to_sync(drain)()
+        job.refresh_from_db()
+        assert job.status == EmailJob.SENT
+        assert job.body == ""
+
+        assert EmailJob.objects.purge() == 0
+        EmailJob.objects.filter(id=job.id).update(modified_at=timezone.now() - timedelta(days=2))
+        assert EmailJob.objects.purge() == 1
+
+    def test_expired_jobs_are_not_sent(self):
+        expired = enqueue_email("Your Password Reset", "123456", "a@example.com", expires_in=timedelta(0))
+        due = enqueue_email("Your Password Reset", "654321", "b@example.com", expires_in=timedelta(seconds=45))
+
+        assert [job.id for job in EmailJob.objects.claim(10)] == [due.id]
+        expired.refresh_from_db()
+        assert (expired.status, expired.body) == (EmailJob.FAILED, "")
+
+        # the first retry (~30s) still fits before the deadline, the second (~60s) does not
+        due.mark_failed("connection refused")
+        assert due.status == EmailJob.PENDING
+        due.mark_failed("connection refused")
+        assert (due.status, due.body) == (EmailJob.FAILED, "")
+
+    def test_claim_skips_jobs_already_sending(self):
+        job = enqueue_email("Your Password Reset", "123456", "user@example.com")
+        assert [claimed.id for claimed in EmailJob.objects.claim(10)] == [job.id]
+        assert EmailJob.objects.claim(10) == []
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReplicaRouter:
+    @pytest.fixture(autouse=True)
+    def replica(self, settings):
+        settings.REPLICA_DATABASES = ["replica"]
+        EmailJob.objects.using("replica").create(subject="Replica", body="", recipient_email="replica@example.com")
+
+    def subjects(self):
+        return sorted(EmailJob.objects.values_list("subject", flat=True))
+
+    def test_reads_use_replica_until_a_write(self):
+        assert self.subjects() == []
+        with replica_reads():
+            assert self.subjects() == ["Replica"]
+            with primary_reads():
+                assert self.subjects() == []
+            assert self.subjects() == ["Replica"]
+
+            EmailJob.objects.enqueue("Primary", "", "primary@example.com")
+            assert self.subjects() == ["Primary"]
+        assert EmailJob.objects.using("replica").count() == 1
+
+    def test_without_replicas_reads_use_primary(self, settings):
+        settings.REPLICA_DATABASES = []
+        with replica_reads():
+            assert self.subjects() == []
 
-# Create your tests here.
@@ -1,6 +1,8 @@
 import base64
 import json
 import logging
+import time
+from datetime import timedelta
 
 import pyotp
 from django.contrib.auth import get_user_model
@@ -10,6 +12,9 @@ from rest_framework.filters import OrderingFilter
 
 User = get_user_model()
 
+# seconds a one-time password stays valid
+OTP_LIFE = 600
+
 
 def encode_uid(pk):
     return force_str(urlsafe_base64_encode(force_bytes(pk)))
@@ -42,7 +47,7 @@ class OTPUtils:
         return encoded.decode()
 
     @classmethod
-    def generate_otp(cls, user: User, life=600):
+    def generate_otp(cls, user: User, life=OTP_LIFE):
         secret = pyotp.random_base32()
         data = {"user_id": str(user.id), "secret": secret}
         
@@ -65,6 +70,11 @@ class OTPUtils:
         return data
 
     @classmethod
-    def verify_otp(cls, code, secret, life=600):
+    def remaining_life(cls, life=OTP_LIFE):
+        """Time until a code generated now stops verifying (the end of its TOTP step)."""
+        return timedelta(seconds=life - time.time() % life)
+
+    @classmethod
+    def verify_otp(cls, code, secret, life=OTP_LIFE):
         totp = pyotp.TOTP(secret, interval=life)
         return totp.verify(code)
@@ -1,3 +1,49 @@
-from django.shortcuts import render
+from contextlib import ExitStack
+
+from django.db import connections, transaction
+from rest_framework.permissions import SAFE_METHODS
+
+from .db_routers import replica_reads
+
+
+class NonAtomicReadsMixin:
+    """
+    Exempt a viewset from ``ATOMIC_REQUESTS`` for safe methods while writes
+    keep running in a transaction per database, as before.
+
+    A wrapping transaction costs reads a BEGIN/COMMIT round trip each and
+    holds the connection in a transaction until the view returns. Without
+    it every query autocommits, so a read issuing several queries may see
+    writes that committed in between.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        view = super().as_view(*args, **kwargs)
+        for alias in connections:
+            view = transaction.non_atomic_requests(using=alias)(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with ExitStack() as stack:
+            for alias, settings_dict in connections.settings.items():
+                if settings_dict["ATOMIC_REQUESTS"]:
+                    stack.enter_context(transaction.atomic(using=alias))
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaReadsMixin:
+    """
+    Serve safe-method requests from a read replica (see ``ReplicaRouter``).
+    A request that writes reads the primary afterwards; separate requests
+    may still see replication lag.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
 
-# Create your views here.
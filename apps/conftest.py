@@ -1,8 +1,15 @@
+import socket
+
+import fakeredis
 import pytest
+from aiosmtpd.controller import Controller
+from django.core.cache import cache, caches
 from pytest_factoryboy import register
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.common.cache import CustomRedisCache
 from apps.common.utils import OTPUtils
+from apps.signals.caching import signal_cache
 from apps.users.models import User
 from apps.users.tests.factories import (
     UserFactory,
@@ -17,6 +24,12 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    signal_cache.local.clear()
+
+
 @pytest.fixture()
 def test_email():
     return "mikyrola8@gmail.com"
@@ -70,3 +83,64 @@ def api_client_auth(api_client):
         return api_client
 
     return make_auth
+
+
+class SMTPSink:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = SMTPSink()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_redis_cache(server):
+    return CustomRedisCache(
+        "redis://localhost:6379/0",
+        {
+            "OPTIONS": {
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": server,
+                }
+            }
+        },
+    )
+
+
+@pytest.fixture
+def redis_cache():
+    redis_cache = make_redis_cache(fakeredis.FakeServer())
+    # django-redis shares connection pools per URL, so start every test empty
+    redis_cache.clear()
+    return redis_cache
+
+
+@pytest.fixture
+def redis_default_cache(settings, redis_cache):
+    """Configure the default cache as production does, backed by the fake server of ``redis_cache``."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "apps.common.cache.CustomRedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "OPTIONS": {
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": redis_cache.client.get_client().connection_pool.connection_kwargs["server"],
+                }
+            },
+        }
+    }
+    return caches["default"]
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import MarketData, Signal, UserInteraction
+from .models import MarketData, MarketDataRollup, Signal, SignalPerformance, TickerRollingStats, UserInteraction
 
 
 @admin.register(MarketData)
@@ -49,3 +49,45 @@ class UserInteractionAdmin(admin.ModelAdmin):
     list_filter = ("status", "user")
     search_fields = ("user__username", "signal__ticker")
     ordering = ("-created_at",)
+
+
+@admin.register(SignalPerformance)
+class SignalPerformanceAdmin(admin.ModelAdmin):
+    list_display = (
+        "signal",
+        "total_trades",
+        "pnl_count",
+        "pnl_sum",
+        "modified_at"
+    )
+    search_fields = ("signal__ticker",)
+    ordering = ("-modified_at",)
+
+
+@admin.register(TickerRollingStats)
+class TickerRollingStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "ticker",
+        "count",
+        "mean",
+        "last_value",
+        "last_timestamp"
+    )
+    search_fields = ("ticker",)
+    ordering = ("ticker",)
+
+
+@admin.register(MarketDataRollup)
+class MarketDataRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "ticker",
+        "resolution",
+        "bucket_start",
+        "count",
+        "iv_close",
+        "hv_close",
+        "skew_close"
+    )
+    list_filter = ("resolution",)
+    search_fields = ("ticker",)
+    ordering = ("ticker", "-bucket_start")
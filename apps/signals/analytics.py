@@ -0,0 +1,89 @@
+import numpy as np
+
+from .models import UserInteraction
+
+
+def load_trades(user_id):
+    """
+    Load a user's taken interactions in chronological order as column arrays:
+    ``(pnl, strategy)``. Open trades without a pnl come back as NaN.
+    """
+    rows = list(
+        UserInteraction.objects.filter(user_id=user_id, status="taken")
+        .order_by("created_at", "id")
+        .values_list("pnl", "strategy")
+    )
+    if not rows:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype="U10")
+
+    # column comprehensions rather than zip(*rows), which is slow at this many arguments
+    return np.array([row[0] for row in rows], dtype=np.float64), np.array([row[1] for row in rows])
+
+
+def _sharpe(count, total, sum_squares):
+    """Mean over sample standard deviation of per-trade pnl, ``None`` below two trades."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        variance = (sum_squares - count * mean * mean) / (count - 1)
+        sharpe = mean / np.sqrt(np.maximum(variance, 0.0))
+    return np.where((count > 1) & (variance > 0), sharpe, np.nan)
+
+
+def _none_if_nan(values):
+    return [None if np.isnan(value) else value for value in values.tolist()]
+
+
+def portfolio_metrics(pnl, strategy):
+    """
+    Summarize closed trades overall and per strategy: total and average pnl,
+    win rate, a per-trade Sharpe-like ratio (mean / stddev, not annualized)
+    and the max drawdown of the cumulative pnl curve. ``trades`` also counts
+    open positions; every other figure only uses trades with a pnl.
+    """
+    closed = ~np.isnan(pnl)
+    closed_pnl = pnl[closed]
+
+    strategies, codes = np.unique(strategy, return_inverse=True)
+    closed_codes = codes[closed]
+    width = strategies.size
+    trades = np.bincount(codes, minlength=width)
+    # one row per strategy plus a final row for the whole portfolio
+    count = np.append(np.bincount(closed_codes, minlength=width), closed_pnl.size).astype(np.float64)
+    total = np.append(np.bincount(closed_codes, weights=closed_pnl, minlength=width), closed_pnl.sum())
+    sum_squares = np.append(
+        np.bincount(closed_codes, weights=closed_pnl * closed_pnl, minlength=width),
+        np.dot(closed_pnl, closed_pnl),
+    )
+    won = (closed_pnl > 0).astype(np.float64)
+    wins = np.append(np.bincount(closed_codes, weights=won, minlength=width), won.sum())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_pnl = np.where(count > 0, total / count, np.nan)
+        win_rate = np.where(count > 0, wins / count, np.nan)
+    sharpe = _sharpe(count, total, sum_squares)
+
+    equity = np.cumsum(closed_pnl)
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    max_drawdown = float(np.max(peak - equity)) if equity.size else 0.0
+
+    avg_pnl, win_rate, sharpe = _none_if_nan(avg_pnl), _none_if_nan(win_rate), _none_if_nan(sharpe)
+    return {
+        "total_trades": int(pnl.size),
+        "closed_trades": int(count[-1]),
+        "total_pnl": float(total[-1]),
+        "avg_pnl": avg_pnl[-1],
+        "win_rate": win_rate[-1],
+        "sharpe_ratio": sharpe[-1],
+        "max_drawdown": max_drawdown,
+        "strategies": {
+            name: {
+                "total_trades": int(trades[i]),
+                "closed_trades": int(count[i]),
+                "total_pnl": float(total[i]),
+                "avg_pnl": avg_pnl[i],
+                "win_rate": win_rate[i],
+                "sharpe_ratio": sharpe[i],
+            }
+            for i, name in enumerate(strategies.tolist())
+        },
+    }
@@ -0,0 +1,18 @@
+from django.urls import path
+
+from .async_views import (
+    marketdata_detail,
+    marketdata_list,
+    signal_detail,
+    signal_list,
+    signal_stream,
+)
+
+
+urlpatterns = [
+    path("", signal_list, name="async-signals-list"),
+    path("stream/", signal_stream, name="async-signals-stream"),
+    path("<uuid:pk>/", signal_detail, name="async-signals-detail"),
+    path("marketdata/", marketdata_list, name="async-marketdata-list"),
+    path("marketdata/<uuid:pk>/", marketdata_detail, name="async-marketdata-detail"),
+]
@@ -0,0 +1,160 @@
+"""
+Async read-only views for signals and market data, served under ASGI.
+
+They mirror the list/retrieve actions of ``SignalViewSet`` and
+``MarketDataViewSet`` with the async ORM and cache, so a slow database or
+Redis call parks a coroutine instead of holding a worker thread. List pages
+use keyset pagination (``?cursor=``, ``?page_size=``, ``?count=false``).
+``signal_stream`` pushes new signals as server-sent events.
+"""
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from .caching import asignal_cache_key, asignal_list_cache_key, astart_signal_version, signal_cache
+from .events import signal_events
+from .models import MarketData, Signal
+from .serializers import MarketDataSerializer, SignalSerializer
+from ..common.authentication import CachedJWTAuthentication
+from ..common.broadcast import event_order
+from ..common.paginations import KeysetPagination
+
+
+authenticator = CachedJWTAuthentication()
+
+# how long EventSource clients wait before reconnecting, in milliseconds
+STREAM_RETRY = 3000
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    return JsonResponse(data, status=status_code, headers=headers, encoder=JSONEncoder, safe=False)
+
+
+def async_api_view(view):
+    """
+    Authenticate the request with a JWT and turn DRF ``APIException``s into
+    JSON error responses, like ``APIView`` does for the sync views. Django
+    refuses ``ATOMIC_REQUESTS`` for async views, and these only read anyway.
+    """
+
+    @transaction.non_atomic_requests
+    @require_safe
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                raise NotAuthenticated()
+            request.user, request.auth = result
+            return await view(Request(request), *args, **kwargs)
+        except APIException as exc:
+            headers = None
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                headers = {"WWW-Authenticate": authenticator.authenticate_header(request)}
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            return json_response(detail, exc.status_code, headers=headers)
+
+    return wrapper
+
+
+async def paginated_data(request, queryset, serializer_class, paginator):
+    page = await paginator.apaginate_queryset(queryset, request)
+    return paginator.get_paginated_data(serializer_class(page, many=True).data)
+
+
+@async_api_view
+async def signal_list(request):
+    """
+    Cached like ``SignalViewSet.list``, but without its single-flight lock:
+    concurrent misses on a cold page each query the database.
+    """
+    paginator = KeysetPagination()
+    cache_key = await asignal_list_cache_key(request, paginator)
+    data = await signal_cache.aget(cache_key)
+    if data is None:
+        data = await paginated_data(request, Signal.objects.with_performance(), SignalSerializer, paginator)
+        await signal_cache.aset(cache_key, data, settings.SIGNAL_LIST_CACHE_TIMEOUT)
+    return json_response(data)
+
+
+@async_api_view
+async def signal_detail(request, pk):
+    cache_key = await asignal_cache_key(pk)
+    data = await signal_cache.aget(cache_key) if cache_key else None
+    if data is None:
+        try:
+            signal = await Signal.objects.with_performance().aget(pk=pk)
+        except Signal.DoesNotExist:
+            raise NotFound()
+        data = SignalSerializer(signal).data
+        if cache_key is None:
+            cache_key = await astart_signal_version(pk)
+        if cache_key is not None:
+            await signal_cache.aset(cache_key, data, settings.SIGNAL_CACHE_TIMEOUT)
+    return json_response(data)
+
+
+@async_api_view
+async def marketdata_list(request):
+    data = await paginated_data(request, MarketData.objects.all(), MarketDataSerializer, KeysetPagination())
+    return json_response(data)
+
+
+@async_api_view
+async def marketdata_detail(request, pk):
+    try:
+        market_data = await MarketData.objects.aget(pk=pk)
+    except MarketData.DoesNotExist:
+        raise NotFound()
+    return json_response(MarketDataSerializer(market_data).data)
+
+
+def list_param(request, param):
+    return {value for value in request.query_params.get(param, "").split(",") if value}
+
+
+@async_api_view
+async def signal_stream(request):
+    """
+    Stream new signals as server-sent events, optionally filtered by
+    comma-separated ``?ticker=`` and ``?strategy=``. Reconnecting clients
+    send ``Last-Event-ID`` (or ``?last_event_id=``) and first receive the
+    signals they missed.
+    """
+    tickers, strategies = list_param(request, "ticker"), list_param(request, "strategy")
+    last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+    if last_event_id:
+        try:
+            event_order(last_event_id)
+        except ValueError:
+            raise ValidationError({"last_event_id": "Invalid event id."})
+
+    def matches(data):
+        return (not tickers or data["ticker"] in tickers) and (not strategies or data["strategy"] in strategies)
+
+    async def events():
+        async with signal_events.subscribe(
+            matches, last_event_id, heartbeat=settings.SIGNAL_STREAM_HEARTBEAT
+        ) as subscription:
+            yield f"retry: {STREAM_RETRY}\n\n"
+            async for event in subscription:
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                event_id, data = event
+                yield f"id: {event_id}\nevent: signal\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n"
+
+    return StreamingHttpResponse(
+        events(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
@@ -0,0 +1,147 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from ..common.cache import TwoTierCache
+
+
+SIGNAL_LIST_VERSION_KEY = "signal_list_version"
+SIGNAL_LIST_PARAMS = ("ordering", "page", "page_size", "cursor", "count")
+
+# Version keys and versioned payloads, served from process memory when possible.
+signal_cache = TwoTierCache(
+    "signal_cache_invalidation",
+    maxsize=settings.SIGNAL_LOCAL_CACHE_SIZE,
+    ttl=settings.SIGNAL_LOCAL_CACHE_TTL,
+)
+
+
+def _version_key(signal_id):
+    return f"signal_{signal_id}_version"
+
+
+def _signal_key(signal_id, version):
+    return f"signal_{signal_id}_v{version}"
+
+
+def signal_cache_key(signal_id):
+    """
+    Return the cache key for a signal's current version, or ``None`` if it
+    has none yet. Read it before loading the signal so a write that commits
+    in between bumps the version and the stale payload is stored under a key
+    nobody reads again.
+    """
+    version = signal_cache.get(_version_key(signal_id))
+    return None if version is None else _signal_key(signal_id, version)
+
+
+def start_signal_version(signal_id):
+    """
+    Give a signal without a version one and return its cache key. Call it
+    only once the signal is known to exist, so lookups of unknown ids leave
+    no keys behind. Returns ``None`` if a concurrent write created the
+    version first, since a payload loaded before that may be stale.
+    """
+    version = time.time_ns()
+    stored = signal_cache.get_or_set(_version_key(signal_id), lambda: version, settings.SIGNAL_VERSION_TIMEOUT)
+    return _signal_key(signal_id, version) if stored == version else None
+
+
+async def asignal_cache_key(signal_id):
+    """``signal_cache_key`` for async views."""
+    version = await signal_cache.aget(_version_key(signal_id))
+    return None if version is None else _signal_key(signal_id, version)
+
+
+async def astart_signal_version(signal_id):
+    """``start_signal_version`` for async views."""
+    version = time.time_ns()
+    stored = await signal_cache.aget_or_set(
+        _version_key(signal_id), lambda: version, settings.SIGNAL_VERSION_TIMEOUT
+    )
+    return _signal_key(signal_id, version) if stored == version else None
+
+
+def signal_list_cache_key(request, paginator):
+    """
+    Return the cache key for a signal list page: the list version plus the
+    normalized pagination/ordering parameters and the scheme and host used in links.
+    """
+    version = signal_cache.get_or_set(SIGNAL_LIST_VERSION_KEY, time.time_ns, settings.SIGNAL_VERSION_TIMEOUT)
+    return f"signal_list_v{version}_{_list_params_digest(request, paginator)}"
+
+
+async def asignal_list_cache_key(request, paginator):
+    """``signal_list_cache_key`` for the async list, whose pages are keyset pages with their own links."""
+    version = await signal_cache.aget_or_set(
+        SIGNAL_LIST_VERSION_KEY, time.time_ns, settings.SIGNAL_VERSION_TIMEOUT
+    )
+    return f"signal_list_v{version}_async_{_list_params_digest(request, paginator)}"
+
+
+def _list_params_digest(request, paginator):
+    params = {"page": "1", "page_size": str(paginator.page_size)}
+    params.update(
+        (name, request.query_params[name])
+        for name in SIGNAL_LIST_PARAMS
+        if name in request.query_params
+    )
+    normalized = "&".join(f"{name}={params[name]}" for name in sorted(params))
+    # pages embed absolute next/previous links
+    return hashlib.sha1(f"{request.scheme}://{request.get_host()}?{normalized}".encode()).hexdigest()
+
+
+def portfolio_cache_key(user_id):
+    """Return the cache key for a user's portfolio analytics at its current version."""
+    version = signal_cache.get_or_set(
+        _portfolio_version_key(user_id), time.time_ns, settings.SIGNAL_VERSION_TIMEOUT
+    )
+    return f"portfolio_{user_id}_v{version}"
+
+
+def _portfolio_version_key(user_id):
+    return f"portfolio_{user_id}_version"
+
+
+def invalidate_portfolios(*user_ids):
+    """Bump the cache version of the given users' portfolios once the current transaction commits."""
+    keys = [_portfolio_version_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        transaction.on_commit(
+            lambda: signal_cache.set_many(
+                {key: time.time_ns() for key in keys}, settings.SIGNAL_VERSION_TIMEOUT
+            )
+        )
+
+
+def cache_signal(signal_id, data):
+    """Store a newly created signal's payload once the current transaction commits."""
+
+    def store():
+        cache_key = start_signal_version(signal_id)
+        if cache_key is not None:
+            signal_cache.set(cache_key, data, settings.SIGNAL_CACHE_TIMEOUT)
+
+    transaction.on_commit(store)
+    invalidate_signal_lists()
+
+
+def invalidate_signals(*signal_ids):
+    """Bump the cache version of the given signals once the current transaction commits."""
+    keys = [_version_key(signal_id) for signal_id in set(signal_ids) if signal_id]
+    if keys:
+        transaction.on_commit(
+            lambda: signal_cache.set_many(
+                {key: time.time_ns() for key in keys}, settings.SIGNAL_VERSION_TIMEOUT
+            )
+        )
+        invalidate_signal_lists()
+
+
+def invalidate_signal_lists():
+    """Bump the version shared by all cached signal list pages once the current transaction commits."""
+    transaction.on_commit(
+        lambda: signal_cache.set(SIGNAL_LIST_VERSION_KEY, time.time_ns(), settings.SIGNAL_VERSION_TIMEOUT)
+    )
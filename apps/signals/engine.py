@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate_signal_lists
+from .models import MarketData, Signal, SignalPerformance
+
+
+def load_market_data(since, tickers=None):
+    """
+    Load market data created at or after ``since`` as column arrays sorted by
+    ``(ticker, created_at)``, which is the order of the existing index.
+    """
+    queryset = MarketData.objects.filter(created_at__gte=since)
+    if tickers:
+        queryset = queryset.filter(ticker__in=tickers)
+    rows = list(
+        queryset.order_by("ticker", "created_at").values_list(
+            "ticker", "implied_volatility", "historical_volatility", "skew"
+        )
+    )
+    if not rows:
+        empty = np.empty(0, dtype=np.float64)
+        return np.empty(0, dtype="U10"), empty, empty, empty
+
+    tickers, implied, historical, skew = zip(*rows)
+    return (
+        np.array(tickers),
+        np.array(implied, dtype=np.float64),
+        np.array(historical, dtype=np.float64),
+        np.array(skew, dtype=np.float64),
+    )
+
+
+def _zscore(latest, mean, std):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (latest - mean) / std, 0.0)
+
+
+def _confidence(zscore):
+    return np.clip(np.rint(99 * np.tanh(np.abs(zscore) / 2)), 0, 99).astype(np.int64)
+
+
+def compute_metrics(tickers, implied, historical, skew, window=20, min_observations=5):
+    """
+    Compute per-ticker signal metrics over the last ``window`` observations in
+    a single vectorized pass. Inputs must be grouped by ticker in time order.
+
+    Returns a dict of equally sized arrays, one entry per ticker with at least
+    ``min_observations`` usable rows.
+    """
+    # Both vols divide something below; a zero or negative quote is unusable.
+    usable = (historical > 0) & (implied > 0)
+    tickers, implied, historical, skew = tickers[usable], implied[usable], historical[usable], skew[usable]
+    if not tickers.size:
+        return {"ticker": tickers}
+
+    starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+    counts = np.diff(np.r_[starts, tickers.size])
+    ends = starts + counts
+    group = np.repeat(np.arange(starts.size), counts)
+
+    # Keep only the trailing ``window`` rows of each ticker.
+    in_window = np.repeat(ends, counts) - np.arange(tickers.size) <= window
+    group = group[in_window]
+    implied, historical, skew = implied[in_window], historical[in_window], skew[in_window]
+    ratio = implied / historical
+    size = np.bincount(group, minlength=starts.size).astype(np.float64)
+
+    def mean_std(values):
+        mean = np.bincount(group, weights=values, minlength=starts.size) / size
+        squares = np.bincount(group, weights=values * values, minlength=starts.size) / size
+        return mean, np.sqrt(np.maximum(squares - mean * mean, 0.0))
+
+    last = np.cumsum(size).astype(np.int64) - 1
+    ratio_mean, ratio_std = mean_std(ratio)
+    skew_mean, skew_std = mean_std(skew)
+    iv_mean, iv_std = mean_std(implied)
+
+    # Term structure proxy: the recent quarter of the window against the whole window.
+    recent = np.repeat(np.cumsum(size), size.astype(np.int64)) - np.arange(group.size) <= np.maximum(
+        np.repeat(size, size.astype(np.int64)) // 4, 1
+    )
+    recent_size = np.bincount(group, weights=recent, minlength=starts.size)
+    recent_iv = np.bincount(group, weights=implied * recent, minlength=starts.size) / recent_size
+
+    keep = size >= min_observations
+    latest_iv, latest_hv = implied[last], historical[last]
+    metrics = {
+        "ticker": tickers[starts],
+        "vrp_ratio": ratio[last],
+        "vrp_zscore": _zscore(ratio[last], ratio_mean, ratio_std),
+        "vrp_return": 1 - latest_hv / latest_iv,
+        "skew_zscore": _zscore(skew[last], skew_mean, skew_std),
+        "skew_return": (skew_mean - skew[last]) * latest_iv,
+        "term_zscore": _zscore(recent_iv, iv_mean, iv_std),
+        "term_return": (iv_mean - recent_iv) / iv_mean,
+    }
+    return {name: values[keep] for name, values in metrics.items()}
+
+
+def build_signals(metrics, min_zscore=2.0, expires_at=None):
+    """Turn computed metrics into unsaved ``Signal`` rows for every strategy that triggers."""
+    if not metrics["ticker"].size:
+        return []
+
+    expires_at = expires_at or timezone.now() + timedelta(days=1)
+    signals = []
+    for strategy, zscore, expected_return in (
+        ("VRP", "vrp_zscore", "vrp_return"),
+        ("SKEW", "skew_zscore", "skew_return"),
+        ("TERM", "term_zscore", "term_return"),
+    ):
+        triggered = np.abs(metrics[zscore]) >= min_zscore
+        confidence = _confidence(metrics[zscore][triggered])
+        signals.extend(
+            Signal(
+                ticker=ticker,
+                strategy=strategy,
+                vrp_zscore=vrp_zscore,
+                vrp_ratio=vrp_ratio,
+                expected_return=ret,
+                confidence=conf,
+                expires_at=expires_at,
+            )
+            for ticker, vrp_zscore, vrp_ratio, ret, conf in zip(
+                metrics["ticker"][triggered].tolist(),
+                metrics["vrp_zscore"][triggered].tolist(),
+                metrics["vrp_ratio"][triggered].tolist(),
+                metrics[expected_return][triggered].tolist(),
+                confidence.tolist(),
+            )
+        )
+    return signals
+
+
+@transaction.atomic
+def generate_signals(
+    lookback=timedelta(days=30),
+    window=20,
+    min_observations=5,
+    min_zscore=2.0,
+    expires_in=timedelta(days=1),
+    tickers=None,
+    batch_size=1000,
+):
+    """Load market data, compute metrics for the whole universe and insert the triggered signals."""
+    now = timezone.now()
+    columns = load_market_data(now - lookback, tickers)
+    metrics = compute_metrics(*columns, window=window, min_observations=min_observations)
+    signals = build_signals(metrics, min_zscore=min_zscore, expires_at=now + expires_in)
+    created = Signal.objects.bulk_create(signals, batch_size=batch_size)
+    SignalPerformance.objects.start(created, batch_size=batch_size)
+    if created:
+        invalidate_signal_lists()
+    return created
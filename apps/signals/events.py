@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import transaction
+
+from .serializers import MarketDataSerializer
+from ..common.broadcast import Broadcast, Fanout
+
+
+# Newly created signals, streamed to clients by the async ``signal_stream`` view.
+signal_events = Broadcast("signals", history=settings.SIGNAL_STREAM_HISTORY)
+
+# The newest MarketData row per ticker, pushed to ``marketdata_socket`` subscribers.
+market_ticks = Fanout("marketdata")
+
+
+def publish_created_signal(data):
+    """Push a serialized signal to stream subscribers once the current transaction commits."""
+    transaction.on_commit(lambda: signal_events.publish(data))
+
+
+def publish_ticks(instances):
+    """
+    Push the last of ``instances`` per ticker, in insertion order, to socket
+    subscribers once the current transaction commits.
+    """
+    latest = {instance.ticker: instance for instance in instances}
+    if latest:
+        values = {ticker: MarketDataSerializer(instance).data for ticker, instance in latest.items()}
+        transaction.on_commit(lambda: market_ticks.publish(values))
@@ -0,0 +1,42 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+EXPORT_FIELDS = (
+    "id",
+    "ticker",
+    "implied_volatility",
+    "historical_volatility",
+    "skew",
+    "created_at",
+)
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+        )
+
+
+def stream_ndjson(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_FIELDS, row))) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
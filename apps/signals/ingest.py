@@ -0,0 +1,99 @@
+import numpy as np
+
+from django.db import transaction
+
+from .events import publish_ticks
+from .models import MarketData, MarketDataRollup, TickerRollingStats
+
+
+TICKER_MAX_LENGTH = MarketData._meta.get_field("ticker").max_length
+NUMERIC_FIELDS = ("implied_volatility", "historical_volatility", "skew")
+
+
+def _to_float(value):
+    if isinstance(value, bool) or value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+def validate_snapshots(rows):
+    """
+    Validate raw market data snapshots column by column.
+
+    Returns ``(instances, errors)`` where ``instances`` are unsaved
+    ``MarketData`` objects for the valid rows and ``errors`` is a list of
+    ``{"index": ..., "errors": {field: [message]}}`` for the rest.
+    """
+    size = len(rows)
+    is_object = np.fromiter((isinstance(row, dict) for row in rows), dtype=bool, count=size)
+    records = [row if isinstance(row, dict) else {} for row in rows]
+
+    tickers = [record.get("ticker") for record in records]
+    ticker_missing = np.fromiter((ticker is None for ticker in tickers), dtype=bool, count=size)
+    tickers = [ticker.strip() if isinstance(ticker, str) else "" for ticker in tickers]
+    ticker_lengths = np.fromiter((len(ticker) for ticker in tickers), dtype=np.int64, count=size)
+
+    columns, column_missing = {}, {}
+    for field in NUMERIC_FIELDS:
+        raw = [record.get(field) for record in records]
+        column_missing[field] = np.fromiter((value is None for value in raw), dtype=bool, count=size)
+        columns[field] = np.fromiter((_to_float(value) for value in raw), dtype=np.float64, count=size)
+
+    checks = [
+        ("ticker", ticker_missing, "This field is required."),
+        ("ticker", ~ticker_missing & (ticker_lengths == 0), "This field may not be blank."),
+        (
+            "ticker",
+            ticker_lengths > TICKER_MAX_LENGTH,
+            f"Ensure this field has no more than {TICKER_MAX_LENGTH} characters.",
+        ),
+    ]
+    for field in NUMERIC_FIELDS:
+        checks.append((field, column_missing[field], "This field is required."))
+        checks.append(
+            (field, ~column_missing[field] & ~np.isfinite(columns[field]), "A valid number is required.")
+        )
+
+    invalid = ~is_object
+    for _, mask, _ in checks:
+        invalid |= mask & is_object
+
+    errors = []
+    for index in np.flatnonzero(invalid).tolist():
+        if not is_object[index]:
+            errors.append({"index": index, "errors": {"non_field_errors": ["Expected a JSON object."]}})
+            continue
+        row_errors = {}
+        for field, mask, message in checks:
+            if mask[index]:
+                row_errors.setdefault(field, []).append(message)
+        errors.append({"index": index, "errors": row_errors})
+
+    instances = [
+        MarketData(
+            ticker=tickers[index],
+            implied_volatility=columns["implied_volatility"][index],
+            historical_volatility=columns["historical_volatility"][index],
+            skew=columns["skew"][index],
+        )
+        for index in np.flatnonzero(~invalid).tolist()
+    ]
+    return instances, errors
+
+
+def market_data_created(instances):
+    """Update state derived from ``MarketData`` after new rows were inserted."""
+    TickerRollingStats.objects.update_from(instances)
+    MarketDataRollup.objects.update_from(instances)
+    publish_ticks(instances)
+
+
+@transaction.atomic
+def ingest_market_data(instances, batch_size):
+    """Insert validated snapshots in ``batch_size`` chunks and return the saved rows."""
+    created = MarketData.objects.bulk_create(instances, batch_size=batch_size)
+    market_data_created(created)
+    return created
@@ -0,0 +1,196 @@
+import logging
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import transaction
+from django.db.models import Count, Sum
+from django_redis.cache import RedisCache
+
+from .models import UserInteraction
+
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("strategy", "ticker")
+ORDERINGS = ("avg_pnl", "trades")
+
+# KEYS: stats hash, trades zset, avg_pnl zset. ARGV: member, trades, pnl_count, pnl_sum deltas.
+# Running the increments and the average in one script keeps concurrent writers consistent.
+RECORD_SCRIPT = """
+local member = ARGV[1]
+local trades = tonumber(redis.call('ZINCRBY', KEYS[2], ARGV[2], member))
+if trades <= 0 then
+    redis.call('ZREM', KEYS[2], member)
+end
+local count = redis.call('HINCRBY', KEYS[1], member .. ':count', ARGV[3])
+local total = tonumber(redis.call('HINCRBYFLOAT', KEYS[1], member .. ':sum', ARGV[4]))
+if count > 0 then
+    redis.call('ZADD', KEYS[3], total / count, member)
+else
+    redis.call('ZREM', KEYS[3], member)
+    redis.call('HDEL', KEYS[1], member .. ':count', member .. ':sum')
+end
+"""
+
+
+class Leaderboard:
+    """
+    Strategy and ticker rankings by average pnl and trade count over taken
+    interactions, kept in Redis sorted sets and updated by deltas.
+
+    Per dimension there is a hash of closed-trade pnl counts and sums plus two
+    sorted sets, ``trades`` and ``avg_pnl``. Writes are applied after the
+    surrounding transaction commits; if Redis is unreachable they are logged
+    and dropped, and ``rebuild`` repopulates everything from the database.
+    Unless a ``remote`` cache is given, the ``alias`` cache is used; without a
+    Redis-backed one the leaderboard is unavailable.
+    """
+
+    def __init__(self, prefix="leaderboard", remote=None, alias=DEFAULT_CACHE_ALIAS):
+        self.prefix = prefix
+        self._remote = remote
+        self.alias = alias
+
+    @property
+    def remote(self):
+        return self._remote if self._remote is not None else caches[self.alias]
+
+    def _redis(self):
+        remote = self.remote
+        if isinstance(remote, RedisCache):
+            return remote.client.get_client(write=True)
+        return None
+
+    def keys(self, dimension):
+        base = f"{self.prefix}:{dimension}"
+        return f"{base}:stats", f"{base}:trades", f"{base}:avg_pnl"
+
+    @staticmethod
+    def contribution(interaction):
+        """
+        Return what ``interaction`` adds to the leaderboard as
+        ``({dimension: member}, (trades, pnl_count, pnl_sum))``.
+        """
+        _, (trades, pnl_count, pnl_sum, _) = interaction.performance_contribution()
+        signal = interaction.signal
+        return {"strategy": signal.strategy, "ticker": signal.ticker}, (trades, pnl_count, pnl_sum)
+
+    @staticmethod
+    def signal_contribution(signal):
+        """Return what all taken interactions on ``signal`` add, in the shape of ``contribution``."""
+        totals = signal.userinteractions.filter(status="taken").aggregate(
+            trades=Count("id"), pnl_count=Count("pnl"), pnl_sum=Sum("pnl")
+        )
+        return (
+            {"strategy": signal.strategy, "ticker": signal.ticker},
+            (totals["trades"], totals["pnl_count"], totals["pnl_sum"] or 0.0),
+        )
+
+    def record(self, before=None, after=None):
+        """Apply the change from ``before`` to ``after`` (``contribution`` values) on commit."""
+        deltas = {}
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            members, values = contribution
+            for dimension, member in members.items():
+                current = deltas.get((dimension, member), (0, 0, 0.0))
+                deltas[(dimension, member)] = tuple(c + sign * v for c, v in zip(current, values))
+        deltas = {key: values for key, values in deltas.items() if any(values)}
+        if deltas:
+            transaction.on_commit(lambda: self._apply(deltas))
+
+    def _apply(self, deltas):
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            script = client.register_script(RECORD_SCRIPT)
+            pipeline = client.pipeline(transaction=False)
+            for (dimension, member), (trades, pnl_count, pnl_sum) in deltas.items():
+                script(keys=self.keys(dimension), args=[member, trades, pnl_count, pnl_sum], client=pipeline)
+            pipeline.execute()
+        except Exception:
+            logger.exception("Leaderboard: failed to apply %d deltas; run rebuild_leaderboard", len(deltas))
+
+    def top(self, dimension, order="avg_pnl", limit=10):
+        """Return up to ``limit`` members ranked by ``order``, or ``None`` without Redis."""
+        client = self._redis()
+        if client is None:
+            return None
+        stats_key, trades_key, avg_key = self.keys(dimension)
+        ranked = client.zrevrange(avg_key if order == "avg_pnl" else trades_key, 0, limit - 1)
+        if not ranked:
+            return []
+
+        pipeline = client.pipeline(transaction=False)
+        for member in ranked:
+            pipeline.zscore(trades_key, member)
+            pipeline.hmget(stats_key, [member + b":count", member + b":sum"])
+        replies = pipeline.execute()
+
+        results = []
+        for member, trades, (pnl_count, pnl_sum) in zip(ranked, replies[::2], replies[1::2]):
+            pnl_count = int(pnl_count or 0)
+            results.append(
+                {
+                    "name": member.decode(),
+                    "total_trades": int(trades or 0),
+                    "pnl_count": pnl_count,
+                    "avg_pnl": float(pnl_sum) / pnl_count if pnl_count else None,
+                }
+            )
+        return results
+
+    def compute(self, dimension):
+        """Aggregate ``{member: (trades, pnl_count, pnl_sum)}`` for ``dimension`` from the database."""
+        field = f"signal__{dimension}"
+        rows = (
+            UserInteraction.objects.filter(status="taken")
+            .values(field)
+            .annotate(trades=Count("id"), pnl_count=Count("pnl"), pnl_sum=Sum("pnl"))
+        )
+        return {row[field]: (row["trades"], row["pnl_count"], row["pnl_sum"] or 0.0) for row in rows}
+
+    def rebuild(self):
+        """
+        Repopulate every dimension from the database. Each one is written to
+        scratch keys and renamed into place, so readers never see it half built.
+        Returns the number of members per dimension.
+        """
+        client = self._redis()
+        if client is None:
+            raise RuntimeError("The leaderboard needs a Redis cache backend")
+
+        sizes = {}
+        for dimension in DIMENSIONS:
+            rows = self.compute(dimension)
+            keys = self.keys(dimension)
+            scratch = [f"{key}:rebuild" for key in keys]
+            stats, trades, averages = {}, {}, {}
+            for member, (total_trades, pnl_count, pnl_sum) in rows.items():
+                if total_trades:
+                    trades[member] = total_trades
+                if pnl_count:
+                    stats[f"{member}:count"] = pnl_count
+                    stats[f"{member}:sum"] = repr(float(pnl_sum))
+                    averages[member] = pnl_sum / pnl_count
+
+            pipeline = client.pipeline(transaction=True)
+            pipeline.delete(*scratch)
+            if stats:
+                pipeline.hset(scratch[0], mapping=stats)
+            if trades:
+                pipeline.zadd(scratch[1], trades)
+            if averages:
+                pipeline.zadd(scratch[2], averages)
+            for source, target, mapping in zip(scratch, keys, (stats, trades, averages)):
+                if mapping:
+                    pipeline.rename(source, target)
+                else:
+                    pipeline.delete(target)
+            pipeline.execute()
+            sizes[dimension] = len(trades)
+        return sizes
+
+
+leaderboard = Leaderboard()
@@ -0,0 +1,45 @@
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...engine import generate_signals
+from ...notifications import notify_new_signals
+
+
+class Command(BaseCommand):
+    help = "Generate VRP, SKEW and TERM signals for every ticker from recent MarketData."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lookback-days", type=float, default=30, help="Market data history to load.")
+        parser.add_argument("--window", type=int, default=20, help="Observations per ticker in the rolling window.")
+        parser.add_argument("--min-observations", type=int, default=5, help="Skip tickers with fewer rows.")
+        parser.add_argument("--min-zscore", type=float, default=2.0, help="Absolute z-score that triggers a signal.")
+        parser.add_argument("--expires-in-hours", type=float, default=24, help="Lifetime of generated signals.")
+        parser.add_argument("--tickers", nargs="*", help="Restrict generation to these tickers.")
+        parser.add_argument("--notify", action="store_true", help="Email a digest of the new signals to matching users.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        signals = generate_signals(
+            lookback=timedelta(days=options["lookback_days"]),
+            window=options["window"],
+            min_observations=options["min_observations"],
+            min_zscore=options["min_zscore"],
+            expires_in=timedelta(hours=options["expires_in_hours"]),
+            tickers=options["tickers"],
+        )
+        elapsed = time.perf_counter() - start
+
+        by_strategy = Counter(signal.strategy for signal in signals)
+        summary = ", ".join(f"{strategy}={count}" for strategy, count in sorted(by_strategy.items()))
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(signals)} signals in {elapsed:.2f}s ({summary or 'none'})")
+        )
+
+        if options["notify"] and signals:
+            stats = notify_new_signals(signals)
+            self.stdout.write(
+                self.style.SUCCESS(f"Sent {stats['sent']} digests ({stats['failed']} failed)")
+            )
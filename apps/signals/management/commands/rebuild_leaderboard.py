@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...leaderboard import leaderboard
+
+
+class Command(BaseCommand):
+    help = "Repopulate the Redis strategy/ticker leaderboard from taken UserInteractions."
+
+    def handle(self, *args, **options):
+        try:
+            sizes = leaderboard.rebuild()
+        except RuntimeError as e:
+            self.stderr.write(self.style.ERROR(str(e)))
+            return
+
+        summary = ", ".join(f"{dimension}={count}" for dimension, count in sizes.items())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboard ({summary})"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ...models import MarketDataRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the 1m/1h/1d MarketData OHLC rollups from the raw rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tickers", nargs="*", help="Only rebuild these tickers.")
+        parser.add_argument("--since", help="ISO 8601 datetime; only rebuild buckets from this day on.")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                self.stderr.write(self.style.ERROR("--since must be an ISO 8601 datetime"))
+                return
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        with transaction.atomic():
+            written = MarketDataRollup.objects.rebuild(tickers=options["tickers"], since=since)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup buckets"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from ...models import TickerRollingStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-ticker rolling VRP ratio statistics from MarketData."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tickers", nargs="*", help="Only rebuild these tickers.")
+        parser.add_argument("--since", help="ISO 8601 datetime; start the window here instead of the full history.")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                self.stderr.write(self.style.ERROR("--since must be an ISO 8601 datetime"))
+                return
+
+        with transaction.atomic():
+            states = TickerRollingStats.objects.rebuild(tickers=options["tickers"], since=since)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rolling stats for {len(states)} tickers"))
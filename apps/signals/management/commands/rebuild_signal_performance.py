@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...caching import invalidate_signals
+from ...models import SignalPerformance
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-signal performance rollup from UserInteraction and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing the rebuilt rollups.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = SignalPerformance.objects.rebuild()
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+            else:
+                invalidate_signals(*(signal_id for signal_id, _, _ in drift))
+
+        for signal_id, stored, expected in drift:
+            self.stdout.write(f"{signal_id}: stored={stored} expected={expected}")
+
+        if drift:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} signal rollup(s) drifted"))
+        else:
+            self.stdout.write(self.style.SUCCESS("No drift found"))
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:15
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0003_alter_userinteraction_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignalPerformance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created_at')),
+                ('modified_at', models.DateTimeField(auto_now=True, verbose_name='modified at')),
+                ('is_active', models.BooleanField(default=True)),
+                ('total_trades', models.PositiveIntegerField(default=0)),
+                ('pnl_count', models.PositiveIntegerField(default=0)),
+                ('pnl_sum', models.FloatField(default=0.0)),
+                ('pnl_sum_squares', models.FloatField(default=0.0)),
+                ('signal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='performance_rollup', to='signals.signal')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
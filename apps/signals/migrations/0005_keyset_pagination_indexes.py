@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0004_signalperformance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userinteraction',
+            name='signals_use_created_bd653e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='marketdata',
+            index=models.Index(fields=['created_at', 'id'], name='signals_mar_created_3638de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(fields=['created_at', 'id'], name='signals_sig_created_fb3cbd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userinteraction',
+            index=models.Index(fields=['created_at', 'id'], name='signals_use_created_ce97bb_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:22
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TickerRollingStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created_at')),
+                ('modified_at', models.DateTimeField(auto_now=True, verbose_name='modified at')),
+                ('is_active', models.BooleanField(default=True)),
+                ('ticker', models.CharField(max_length=10, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(default=0.0)),
+                ('m2', models.FloatField(default=0.0)),
+                ('last_value', models.FloatField(null=True)),
+                ('last_timestamp', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Ticker rolling stats',
+            },
+        ),
+    ]
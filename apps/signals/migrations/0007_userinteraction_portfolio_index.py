@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0006_tickerrollingstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userinteraction',
+            index=models.Index(fields=['user', 'status', 'created_at', 'id'], name='signals_use_user_id_88bfec_idx'),
+        ),
+    ]
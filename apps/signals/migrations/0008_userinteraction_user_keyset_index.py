@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0007_userinteraction_portfolio_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userinteraction',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='signals_use_user_id_a756f0_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:42
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0008_userinteraction_user_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketDataRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created_at')),
+                ('modified_at', models.DateTimeField(auto_now=True, verbose_name='modified at')),
+                ('is_active', models.BooleanField(default=True)),
+                ('ticker', models.CharField(max_length=10)),
+                ('resolution', models.CharField(choices=[('1m', '1 minute'), ('1h', '1 hour'), ('1d', '1 day')], max_length=2)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('first_at', models.DateTimeField(null=True)),
+                ('last_at', models.DateTimeField(null=True)),
+                ('iv_open', models.FloatField(null=True)),
+                ('iv_high', models.FloatField(null=True)),
+                ('iv_low', models.FloatField(null=True)),
+                ('iv_close', models.FloatField(null=True)),
+                ('iv_sum', models.FloatField(default=0.0)),
+                ('hv_open', models.FloatField(null=True)),
+                ('hv_high', models.FloatField(null=True)),
+                ('hv_low', models.FloatField(null=True)),
+                ('hv_close', models.FloatField(null=True)),
+                ('hv_sum', models.FloatField(default=0.0)),
+                ('skew_open', models.FloatField(null=True)),
+                ('skew_high', models.FloatField(null=True)),
+                ('skew_low', models.FloatField(null=True)),
+                ('skew_close', models.FloatField(null=True)),
+                ('skew_sum', models.FloatField(default=0.0)),
+            ],
+            options={
+                'unique_together': {('ticker', 'resolution', 'bucket_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Count, F, Sum
+
+
+def backfill(apps, schema_editor):
+    """Seed a rollup for every signal that has none from its taken interactions."""
+    Signal = apps.get_model("signals", "Signal")
+    SignalPerformance = apps.get_model("signals", "SignalPerformance")
+    UserInteraction = apps.get_model("signals", "UserInteraction")
+    db = schema_editor.connection.alias
+
+    rows = (
+        UserInteraction.objects.using(db).filter(status="taken")
+        .values("signal_id")
+        .annotate(
+            total_trades=Count("id"),
+            pnl_count=Count("pnl"),
+            pnl_sum=Sum("pnl"),
+            pnl_sum_squares=Sum(F("pnl") * F("pnl")),
+        )
+    )
+    totals = {row.pop("signal_id"): row for row in rows}
+    missing = Signal.objects.using(db).filter(performance_rollup__isnull=True).values_list("id", flat=True)
+
+    rollups = []
+    for signal_id in missing.iterator():
+        values = totals.get(signal_id, {})
+        rollups.append(
+            SignalPerformance(
+                signal_id=signal_id,
+                total_trades=values.get("total_trades", 0),
+                pnl_count=values.get("pnl_count", 0),
+                pnl_sum=values.get("pnl_sum") or 0.0,
+                pnl_sum_squares=values.get("pnl_sum_squares") or 0.0,
+            )
+        )
+    SignalPerformance.objects.using(db).bulk_create(rollups, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0009_marketdatarollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+def refill_windows(apps, schema_editor):
+    """
+    Replace the cumulative state with statistics over each ticker's last
+    ``VRP_ZSCORE_WINDOW`` observations.
+    """
+    MarketData = apps.get_model("signals", "MarketData")
+    TickerRollingStats = apps.get_model("signals", "TickerRollingStats")
+    window = settings.VRP_ZSCORE_WINDOW
+    db = schema_editor.connection.alias
+
+    states = list(TickerRollingStats.objects.using(db))
+    for state in states:
+        rows = (
+            MarketData.objects.using(db).filter(ticker=state.ticker, historical_volatility__gt=0)
+            .order_by("-created_at")
+            .values_list("implied_volatility", "historical_volatility")[:window]
+        )
+        values = [implied / historical for implied, historical in reversed(rows)]
+        state.window_values = values
+        state.count = len(values)
+        state.mean = sum(values) / len(values) if values else 0.0
+        state.m2 = sum((value - state.mean) ** 2 for value in values)
+    TickerRollingStats.objects.using(db).bulk_update(
+        states, ["window_values", "count", "mean", "m2"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0010_backfill_signalperformance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickerrollingstats',
+            name='window_values',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(refill_windows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+
+RESOLUTIONS = ("1m", "1h", "1d")
+METRICS = {"implied_volatility": "iv", "historical_volatility": "hv", "skew": "skew"}
+
+
+def bucket_start(timestamp, resolution):
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if resolution == "1m":
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def backfill(apps, schema_editor):
+    """
+    Rebuild every rollup from the stored market data, so history ingested
+    before rollups were maintained on insert can be charted. Rows are streamed
+    in (ticker, created_at) order and each bucket is written once it closes.
+    """
+    MarketData = apps.get_model("signals", "MarketData")
+    MarketDataRollup = apps.get_model("signals", "MarketDataRollup")
+    db = schema_editor.connection.alias
+    MarketDataRollup.objects.using(db).delete()
+
+    rows = (
+        MarketData.objects.using(db).order_by("ticker", "created_at").values_list("ticker", "created_at", *METRICS)
+    )
+    open_buckets, closed = {}, []
+    for ticker, created_at, *values in rows.iterator(chunk_size=5000):
+        for resolution in RESOLUTIONS:
+            start = bucket_start(created_at, resolution)
+            rollup = open_buckets.get(resolution)
+            if rollup is None or rollup.ticker != ticker or rollup.bucket_start != start:
+                if rollup is not None:
+                    closed.append(rollup)
+                rollup = open_buckets[resolution] = MarketDataRollup(
+                    ticker=ticker, resolution=resolution, bucket_start=start, first_at=created_at
+                )
+                for prefix, value in zip(METRICS.values(), values):
+                    setattr(rollup, f"{prefix}_open", value)
+                    setattr(rollup, f"{prefix}_high", value)
+                    setattr(rollup, f"{prefix}_low", value)
+            for prefix, value in zip(METRICS.values(), values):
+                setattr(rollup, f"{prefix}_high", max(getattr(rollup, f"{prefix}_high"), value))
+                setattr(rollup, f"{prefix}_low", min(getattr(rollup, f"{prefix}_low"), value))
+                setattr(rollup, f"{prefix}_close", value)
+                setattr(rollup, f"{prefix}_sum", getattr(rollup, f"{prefix}_sum") + value)
+            rollup.last_at = created_at
+            rollup.count += 1
+        if len(closed) >= 1000:
+            MarketDataRollup.objects.using(db).bulk_create(closed)
+            closed = []
+
+    closed.extend(open_buckets.values())
+    MarketDataRollup.objects.using(db).bulk_create(closed, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0011_tickerrollingstats_window_values'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def refill_windows(apps, schema_editor):
+    """
+    Recompute each ticker's state over its last ``VRP_ZSCORE_WINDOW`` rows with
+    both vols positive, as population statistics like the signal engine's.
+    """
+    MarketData = apps.get_model("signals", "MarketData")
+    TickerRollingStats = apps.get_model("signals", "TickerRollingStats")
+    window = settings.VRP_ZSCORE_WINDOW
+    db = schema_editor.connection.alias
+
+    states = list(TickerRollingStats.objects.using(db))
+    for state in states:
+        rows = list(
+            MarketData.objects.using(db)
+            .filter(ticker=state.ticker, implied_volatility__gt=0, historical_volatility__gt=0)
+            .order_by("-created_at", "-id")
+            .values_list("implied_volatility", "historical_volatility", "created_at")[:window]
+        )
+        rows.reverse()
+        values = [implied / historical for implied, historical, _ in rows]
+        state.count = len(values)
+        state.mean = sum(values) / len(values) if values else 0.0
+        state.m2 = sum((value - state.mean) ** 2 for value in values)
+        state.window_start = rows[0][2] if rows else None
+        state.last_value = values[-1] if values else None
+        state.last_timestamp = rows[-1][2] if rows else None
+    TickerRollingStats.objects.using(db).bulk_update(
+        states, ["count", "mean", "m2", "window_start", "last_value", "last_timestamp"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0012_backfill_marketdatarollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickerrollingstats',
+            name='window_start',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(refill_windows, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='tickerrollingstats',
+            name='window_values',
+        ),
+    ]
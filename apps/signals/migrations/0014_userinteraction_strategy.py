@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_strategies(apps, schema_editor):
+    """Copy each interaction's signal strategy onto it."""
+    Signal = apps.get_model("signals", "Signal")
+    UserInteraction = apps.get_model("signals", "UserInteraction")
+    db = schema_editor.connection.alias
+    UserInteraction.objects.using(db).update(
+        strategy=Subquery(Signal.objects.using(db).filter(id=OuterRef("signal_id")).values("strategy")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0013_tickerrollingstats_window_start'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userinteraction',
+            name='signals_use_user_id_88bfec_idx',
+        ),
+        migrations.AddField(
+            model_name='userinteraction',
+            name='strategy',
+            field=models.CharField(choices=[('VRP', 'Volatility Risk Premium'), ('SKEW', 'Volatility Skew'), ('TERM', 'Term Structure')], default='', editable=False, max_length=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_strategies, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userinteraction',
+            index=models.Index(fields=['user', 'status', 'created_at', 'id', 'pnl', 'strategy'], name='signals_use_user_id_3619f9_idx'),
+        ),
+    ]
@@ -1,7 +1,15 @@
-from django.db import models
+import math
+from collections import deque
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, models
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Avg, Count
+from django.db.models import Avg, Case, Count, F, OuterRef, Subquery, Sum, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 
 from ..common.models import BaseModel as base_model
 
@@ -18,11 +26,33 @@ class MarketData(base_model):
     class Meta:
         indexes = [
             models.Index(fields=["ticker", "created_at"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
     def __str__(self):
         return f"{self.ticker}: {self.implied_volatility}: {self.implied_volatility}: {self.skew}"
 
+    @property
+    def vrp_ratio(self):
+        return self.implied_volatility / self.historical_volatility
+
+
+class SignalQuerySet(models.QuerySet):
+    def with_performance(self):
+        """
+        Join the materialized performance rollup so reads need no aggregate.
+        Signals without a rollup row yet aggregate their taken interactions
+        in a subquery instead, which only runs for those rows.
+        """
+        taken = UserInteraction.objects.filter(signal=OuterRef("pk"), status="taken").order_by().values("signal")
+        missing = {"performance_rollup__isnull": True}
+        return self.select_related("performance_rollup").annotate(
+            fallback_avg_pnl=Case(When(**missing, then=Subquery(taken.annotate(value=Avg("pnl")).values("value")))),
+            fallback_total_trades=Case(
+                When(**missing, then=Subquery(taken.annotate(value=Count("id")).values("value")))
+            ),
+        )
+
 
 class Signal(base_model):
     STRATEGY_CHOICES = [
@@ -42,18 +72,26 @@ class Signal(base_model):
     in_lab = models.BooleanField(default=True)
     expires_at = models.DateTimeField()
 
+    objects = SignalQuerySet.as_manager()
+
     @property
     def calculate_performance(self):
-        taken_signals = self.userinteractions.filter(status="taken")
-        return taken_signals.aggregate(
-            avg_pnl=Avg("pnl"),
-            total_trades=Count("id")
-        )
+        try:
+            rollup = self.performance_rollup
+        except ObjectDoesNotExist:
+            # no rollup yet, e.g. interactions written outside the viewset
+            if hasattr(self, "fallback_total_trades"):
+                return {"avg_pnl": self.fallback_avg_pnl, "total_trades": self.fallback_total_trades or 0}
+            return self.userinteractions.filter(status="taken").aggregate(
+                avg_pnl=Avg("pnl"), total_trades=Count("id")
+            )
+        return rollup.as_dict()
 
     class Meta:
         indexes = [
             models.Index(fields=["ticker", "strategy", "created_at"]),
             models.Index(fields=["is_active", "expires_at"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
     def __str__(self):
@@ -74,13 +112,554 @@ class UserInteraction(base_model):
     position_size = models.IntegerField(null=True)
     pnl = models.FloatField(null=True)
     exit_price = models.FloatField(null=True)
+    # Copy of signal.strategy, so portfolio analytics read a covering index without the join
+    strategy = models.CharField(max_length=10, choices=Signal.STRATEGY_CHOICES, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=["signal", "status"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["user", "status", "created_at", "id", "pnl", "strategy"]),
+            models.Index(fields=["user", "created_at", "id"]),
         ]
         unique_together = ["user", "signal"]
     
     def __str__(self):
-        return f"{self.user.username}: {self.signal.ticker}: {self.position_size}"
\ No newline at end of file
+        return f"{self.user.username}: {self.signal.ticker}: {self.position_size}"
+
+    def save(self, *args, **kwargs):
+        self.strategy = self.signal.strategy
+        super().save(*args, **kwargs)
+
+    def performance_contribution(self):
+        """
+        Return what this interaction adds to its signal's rollup as
+        ``(signal_id, (total_trades, pnl_count, pnl_sum, pnl_sum_squares))``.
+        """
+        if self.status != "taken":
+            return self.signal_id, (0, 0, 0.0, 0.0)
+        if self.pnl is None:
+            return self.signal_id, (1, 0, 0.0, 0.0)
+        return self.signal_id, (1, 1, self.pnl, self.pnl * self.pnl)
+
+
+class SignalPerformanceManager(models.Manager):
+    def start(self, signals, batch_size=1000):
+        """
+        Create the empty rollups of newly created ``signals``, so they never take
+        the aggregate fallback. Each signal's ``performance_rollup`` is set too.
+        """
+        return self.bulk_create((self.model(signal=signal) for signal in signals), batch_size=batch_size)
+
+    def record(self, before=None, after=None):
+        """
+        Apply the change from ``before`` to ``after`` (``UserInteraction.performance_contribution``
+        values, ``None`` for create/delete) to the affected rollup rows.
+        """
+        deltas = {}
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            signal_id, values = contribution
+            current = deltas.get(signal_id, (0, 0, 0.0, 0.0))
+            deltas[signal_id] = tuple(c + sign * v for c, v in zip(current, values))
+
+        for signal_id, values in deltas.items():
+            if not any(values) or self._add(signal_id, values):
+                continue
+            # No rollup yet: seed it from the table, which already holds this write.
+            # If a concurrent writer seeded it first, apply the delta on top instead.
+            seed = self.compute([signal_id]).get(signal_id, (0, 0, 0.0, 0.0))
+            _, created = self.get_or_create(
+                signal_id=signal_id,
+                defaults=dict(zip(("total_trades", "pnl_count", "pnl_sum", "pnl_sum_squares"), seed)),
+            )
+            if not created:
+                self._add(signal_id, values)
+
+    def _add(self, signal_id, values):
+        trades, pnl_count, pnl_sum, pnl_sum_squares = values
+        return self.filter(signal_id=signal_id).update(
+            total_trades=F("total_trades") + trades,
+            pnl_count=F("pnl_count") + pnl_count,
+            pnl_sum=F("pnl_sum") + pnl_sum,
+            pnl_sum_squares=F("pnl_sum_squares") + pnl_sum_squares,
+            modified_at=timezone.now(),
+        )
+
+    def compute(self, signal_ids=None):
+        """Aggregate the rollup values from ``UserInteraction`` keyed by signal id."""
+        interactions = UserInteraction.objects.filter(status="taken")
+        if signal_ids is not None:
+            interactions = interactions.filter(signal_id__in=signal_ids)
+        rows = interactions.values("signal_id").annotate(
+            total_trades=Count("id"),
+            pnl_count=Count("pnl"),
+            pnl_sum=Sum("pnl"),
+            pnl_sum_squares=Sum(F("pnl") * F("pnl")),
+        )
+        return {
+            row["signal_id"]: (
+                row["total_trades"],
+                row["pnl_count"],
+                row["pnl_sum"] or 0.0,
+                row["pnl_sum_squares"] or 0.0,
+            )
+            for row in rows
+        }
+
+    def rebuild(self, signal_ids=None):
+        """
+        Recompute rollups from scratch and return the drift found as a list of
+        ``(signal_id, stored, expected)`` tuples.
+        """
+        expected = self.compute(signal_ids)
+        signals = Signal.objects.all()
+        if signal_ids is not None:
+            signals = signals.filter(id__in=signal_ids)
+        stored = {
+            rollup.signal_id: rollup
+            for rollup in self.filter(signal_id__in=signals.values("id"))
+        }
+
+        drift = []
+        to_create, to_update = [], []
+        for signal_id in signals.values_list("id", flat=True).iterator():
+            values = expected.get(signal_id, (0, 0, 0.0, 0.0))
+            rollup = stored.get(signal_id)
+            if rollup is None:
+                if any(values):
+                    drift.append((signal_id, None, values))
+                to_create.append(self.model(signal_id=signal_id))
+                rollup = to_create[-1]
+            elif not rollup.matches(values):
+                drift.append((signal_id, rollup.values, values))
+                to_update.append(rollup)
+            else:
+                continue
+            (
+                rollup.total_trades,
+                rollup.pnl_count,
+                rollup.pnl_sum,
+                rollup.pnl_sum_squares,
+            ) = values
+            rollup.modified_at = timezone.now()
+
+        self.bulk_create(to_create, batch_size=1000)
+        self.bulk_update(
+            to_update,
+            ["total_trades", "pnl_count", "pnl_sum", "pnl_sum_squares", "modified_at"],
+            batch_size=1000,
+        )
+        return drift
+
+
+class SignalPerformance(base_model):
+    """
+    Denormalized performance of a signal over its taken interactions, kept up
+    to date incrementally by ``UserInteractionViewSet``.
+    """
+
+    signal = models.OneToOneField(
+        Signal, on_delete=models.CASCADE, related_name="performance_rollup"
+    )
+    total_trades = models.PositiveIntegerField(default=0)
+    pnl_count = models.PositiveIntegerField(default=0)
+    pnl_sum = models.FloatField(default=0.0)
+    pnl_sum_squares = models.FloatField(default=0.0)
+
+    objects = SignalPerformanceManager()
+
+    def __str__(self):
+        return f"{self.signal_id}: {self.total_trades}"
+
+    @property
+    def values(self):
+        return (self.total_trades, self.pnl_count, self.pnl_sum, self.pnl_sum_squares)
+
+    @property
+    def avg_pnl(self):
+        if not self.pnl_count:
+            return None
+        return self.pnl_sum / self.pnl_count
+
+    @property
+    def pnl_stddev(self):
+        if not self.pnl_count:
+            return None
+        variance = self.pnl_sum_squares / self.pnl_count - self.avg_pnl ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def matches(self, values, rel_tol=1e-9):
+        trades, pnl_count, pnl_sum, pnl_sum_squares = values
+        return (
+            self.total_trades == trades
+            and self.pnl_count == pnl_count
+            and math.isclose(self.pnl_sum, pnl_sum, rel_tol=rel_tol, abs_tol=1e-6)
+            and math.isclose(
+                self.pnl_sum_squares, pnl_sum_squares, rel_tol=rel_tol, abs_tol=1e-6
+            )
+        )
+
+    def as_dict(self):
+        return {"avg_pnl": self.avg_pnl, "total_trades": self.total_trades}
+
+class TickerRollingStatsManager(models.Manager):
+    # tickers per window query; each adds a bounded range to its OR
+    WINDOW_QUERY_TICKERS = 100
+
+    def update_from(self, market_data):
+        """
+        Recompute the window of every ticker in newly inserted ``MarketData``
+        rows. Only the rows from each ticker's ``window_start`` on are read,
+        i.e. the previous window plus the new rows, and the states are written
+        back with a single upsert.
+        """
+        tickers = sorted(
+            {row.ticker for row in market_data if row.implied_volatility > 0 and row.historical_volatility > 0}
+        )
+        if not tickers:
+            return
+
+        # A concurrent ingest of the same ticker waits on this row lock and then
+        # reads the rows this one added.
+        self.bulk_create([self.model(ticker=ticker) for ticker in tickers], ignore_conflicts=True)
+        states = list(self.select_for_update().filter(ticker__in=tickers).order_by("ticker"))
+        window = settings.VRP_ZSCORE_WINDOW
+
+        recent = {state.ticker: [] for state in states}
+        seeded = [state for state in states if state.window_start is not None]
+        for start in range(0, len(seeded), self.WINDOW_QUERY_TICKERS):
+            bounds = models.Q()
+            for state in seeded[start : start + self.WINDOW_QUERY_TICKERS]:
+                bounds |= models.Q(ticker=state.ticker, created_at__gte=state.window_start)
+            for ticker, ratio, created_at in window_rows(bounds).order_by("created_at", "id"):
+                recent[ticker].append((ratio, created_at))
+
+        # tickers without a window yet, usually new ones, take their latest rows
+        unseeded = [state.ticker for state in states if state.window_start is None]
+        if unseeded:
+            rows = window_rows(models.Q(ticker__in=unseeded), latest=window)
+            for ticker, ratio, created_at in rows.order_by("created_at", "id"):
+                recent[ticker].append((ratio, created_at))
+
+        for state in states:
+            state.fill(recent[state.ticker][-window:])
+
+        self.bulk_create(
+            states,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["ticker"],
+            update_fields=TickerRollingStats.STATE_FIELDS,
+        )
+
+    def rebuild(self, tickers=None, since=None):
+        """Recompute state by streaming ``MarketData`` in (ticker, created_at) order."""
+        bounds = models.Q()
+        if tickers is not None:
+            bounds &= models.Q(ticker__in=tickers)
+        if since is not None:
+            bounds &= models.Q(created_at__gte=since)
+        rows = window_rows(bounds).order_by("ticker", "created_at", "id")
+
+        window = settings.VRP_ZSCORE_WINDOW
+        windows = {}
+        for ticker, ratio, created_at in rows.iterator(chunk_size=5000):
+            windows.setdefault(ticker, deque(maxlen=window)).append((ratio, created_at))
+
+        states = []
+        for ticker, values in windows.items():
+            states.append(self.model(ticker=ticker))
+            states[-1].fill(list(values))
+
+        stale = self.all() if tickers is None else self.filter(ticker__in=tickers)
+        stale.delete()
+        return self.bulk_create(states, batch_size=1000)
+
+
+def window_rows(bounds, latest=None):
+    """
+    ``(ticker, vrp_ratio, created_at)`` of the ``MarketData`` rows matching
+    ``bounds`` that the signal engine can use, i.e. with both vols positive,
+    optionally only each ticker's ``latest`` ones.
+    """
+    rows = MarketData.objects.filter(bounds, implied_volatility__gt=0, historical_volatility__gt=0)
+    if latest is not None:
+        rows = rows.annotate(
+            recency=Window(RowNumber(), partition_by=F("ticker"), order_by=[F("created_at").desc(), F("id").desc()])
+        ).filter(recency__lte=latest)
+    return rows.values_list("ticker", F("implied_volatility") / F("historical_volatility"), "created_at")
+
+
+class TickerRollingStats(base_model):
+    """
+    Count/mean/M2 of each ticker's VRP ratio (implied / historical volatility)
+    over its last ``VRP_ZSCORE_WINDOW`` usable observations, with the signal
+    engine's filter and population statistics. The window's rows stay in
+    ``MarketData``; ``window_start`` is the oldest one's timestamp.
+    """
+
+    STATE_FIELDS = ["count", "mean", "m2", "window_start", "last_value", "last_timestamp", "modified_at"]
+
+    ticker = models.CharField(max_length=10, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(default=0.0)
+    m2 = models.FloatField(default=0.0)
+    window_start = models.DateTimeField(null=True)
+    last_value = models.FloatField(null=True)
+    last_timestamp = models.DateTimeField(null=True)
+
+    objects = TickerRollingStatsManager()
+
+    class Meta:
+        verbose_name_plural = "Ticker rolling stats"
+
+    def __str__(self):
+        return f"{self.ticker}: {self.count}"
+
+    def fill(self, window):
+        """Set the state from the window's ``(value, timestamp)`` pairs in time order."""
+        values = [value for value, _ in window]
+        self.count = len(values)
+        self.mean = sum(values) / self.count if values else 0.0
+        self.m2 = sum((value - self.mean) ** 2 for value in values)
+        self.window_start = window[0][1] if window else None
+        self.last_value, self.last_timestamp = window[-1] if window else (None, None)
+        self.modified_at = timezone.now()
+
+    @property
+    def stddev(self):
+        if not self.count:
+            return None
+        return math.sqrt(self.m2 / self.count)
+
+    @property
+    def vrp_zscore(self):
+        stddev = self.stddev
+        if not stddev:
+            return None
+        return (self.last_value - self.mean) / stddev
+
+
+def bucket_start(timestamp, resolution):
+    """Floor ``timestamp`` to the start of its ``resolution`` bucket (UTC)."""
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if resolution == MarketDataRollup.MINUTE:
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == MarketDataRollup.HOUR:
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class MarketDataRollupManager(models.Manager):
+    def update_from(self, market_data, batch_size=500):
+        """
+        Fold newly inserted ``MarketData`` rows into their buckets at every
+        resolution. Each batch is summarized per bucket and merged into the
+        table with a single upsert, so nothing is read back or locked and
+        concurrent ingests into the same bucket add up.
+        """
+        buckets = {}
+        for row in market_data:
+            values = [getattr(row, metric) for metric in MarketDataRollup.METRICS]
+            for resolution in MarketDataRollup.RESOLUTIONS:
+                key = (row.ticker, resolution, bucket_start(row.created_at, resolution))
+                delta = buckets.get(key)
+                if delta is None:
+                    delta = buckets[key] = self.model(ticker=key[0], resolution=key[1], bucket_start=key[2])
+                delta.push(values, row.created_at)
+
+        # a consistent order keeps concurrent upserts from deadlocking
+        deltas = [buckets[key] for key in sorted(buckets)]
+        for start in range(0, len(deltas), batch_size):
+            self._merge(deltas[start : start + batch_size])
+
+    def _merge(self, deltas):
+        """Insert ``deltas`` as new buckets, or combine each with the bucket already stored."""
+        connection = connections[self.db]
+        fields = self.model._meta.concrete_fields
+        params = []
+        for delta in deltas:
+            params.extend(
+                field.get_db_prep_save(field.pre_save(delta, add=True), connection) for field in fields
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(self._merge_sql(connection, len(deltas)), params)
+
+    def _merge_sql(self, connection, rows):
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+
+        def column(name):
+            return connection.ops.quote_name(meta.get_field(name).column)
+
+        def old(name):
+            return f"{table}.{column(name)}"
+
+        def new(name):
+            return f"EXCLUDED.{column(name)}"
+
+        def when(condition, name):
+            return f"CASE WHEN {condition} THEN {new(name)} ELSE {old(name)} END"
+
+        greatest, least = ("MAX", "MIN") if connection.vendor == "sqlite" else ("GREATEST", "LEAST")
+        earlier = f"{old('first_at')} IS NULL OR {new('first_at')} < {old('first_at')}"
+        later = f"{old('last_at')} IS NULL OR {new('last_at')} >= {old('last_at')}"
+        updates = {
+            "count": f"{old('count')} + {new('count')}",
+            "first_at": when(earlier, "first_at"),
+            "last_at": when(later, "last_at"),
+            "modified_at": new("modified_at"),
+        }
+        for prefix in MarketDataRollup.METRICS.values():
+            high, low, total = f"{prefix}_high", f"{prefix}_low", f"{prefix}_sum"
+            updates[f"{prefix}_open"] = when(earlier, f"{prefix}_open")
+            updates[f"{prefix}_close"] = when(later, f"{prefix}_close")
+            # a bucket created empty has no high/low yet
+            updates[high] = f"{greatest}(COALESCE({old(high)}, {new(high)}), {new(high)})"
+            updates[low] = f"{least}(COALESCE({old(low)}, {new(low)}), {new(low)})"
+            updates[total] = f"{old(total)} + {new(total)}"
+
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in meta.concrete_fields)
+        row = "(" + ", ".join(["%s"] * len(meta.concrete_fields)) + ")"
+        return (
+            f"INSERT INTO {table} ({columns}) VALUES {', '.join([row] * rows)} "
+            f"ON CONFLICT ({column('ticker')}, {column('resolution')}, {column('bucket_start')}) "
+            f"DO UPDATE SET {', '.join(f'{column(name)} = {value}' for name, value in updates.items())}"
+        )
+
+    def rebuild(self, tickers=None, since=None, batch_size=1000):
+        """
+        Recompute rollups by streaming ``MarketData`` in (ticker, created_at)
+        order, writing each bucket once it closes. ``since`` is floored to the
+        day so every resolution is rebuilt from a bucket boundary.
+        Returns the number of rollup rows written.
+        """
+        queryset = MarketData.objects.all()
+        stale = self.all()
+        if tickers is not None:
+            queryset = queryset.filter(ticker__in=tickers)
+            stale = stale.filter(ticker__in=tickers)
+        if since is not None:
+            since = bucket_start(since, MarketDataRollup.DAY)
+            queryset = queryset.filter(created_at__gte=since)
+            stale = stale.filter(bucket_start__gte=since)
+        stale.delete()
+
+        rows = queryset.order_by("ticker", "created_at").values_list(
+            "ticker", "created_at", *MarketDataRollup.METRICS
+        )
+        open_buckets, closed, written = {}, [], 0
+        for ticker, created_at, *values in rows.iterator(chunk_size=5000):
+            for resolution in MarketDataRollup.RESOLUTIONS:
+                start = bucket_start(created_at, resolution)
+                current = open_buckets.get(resolution)
+                if current is None or current.ticker != ticker or current.bucket_start != start:
+                    if current is not None:
+                        closed.append(current)
+                    current = open_buckets[resolution] = self.model(
+                        ticker=ticker, resolution=resolution, bucket_start=start
+                    )
+                current.push(values, created_at)
+            if len(closed) >= batch_size:
+                written += len(self.bulk_create(closed, batch_size=batch_size))
+                closed = []
+
+        closed.extend(open_buckets.values())
+        written += len(self.bulk_create(closed, batch_size=batch_size))
+        return written
+
+
+class MarketDataRollup(base_model):
+    """
+    Open/high/low/close/mean of implied vol, historical vol and skew for one
+    ticker over a 1-minute, 1-hour or 1-day bucket, maintained on insert.
+    """
+
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+    RESOLUTION_CHOICES = [
+        (MINUTE, "1 minute"),
+        (HOUR, "1 hour"),
+        (DAY, "1 day"),
+    ]
+    RESOLUTIONS = (MINUTE, HOUR, DAY)
+    BUCKET_WIDTHS = {
+        MINUTE: timedelta(minutes=1),
+        HOUR: timedelta(hours=1),
+        DAY: timedelta(days=1),
+    }
+    # MarketData field -> column prefix
+    METRICS = {"implied_volatility": "iv", "historical_volatility": "hv", "skew": "skew"}
+    AGGREGATE_FIELDS = [
+        "count", "first_at", "last_at",
+        "iv_open", "iv_high", "iv_low", "iv_close", "iv_sum",
+        "hv_open", "hv_high", "hv_low", "hv_close", "hv_sum",
+        "skew_open", "skew_high", "skew_low", "skew_close", "skew_sum",
+    ]
+
+    ticker = models.CharField(max_length=10)
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+    first_at = models.DateTimeField(null=True)
+    last_at = models.DateTimeField(null=True)
+    iv_open = models.FloatField(null=True)
+    iv_high = models.FloatField(null=True)
+    iv_low = models.FloatField(null=True)
+    iv_close = models.FloatField(null=True)
+    iv_sum = models.FloatField(default=0.0)
+    hv_open = models.FloatField(null=True)
+    hv_high = models.FloatField(null=True)
+    hv_low = models.FloatField(null=True)
+    hv_close = models.FloatField(null=True)
+    hv_sum = models.FloatField(default=0.0)
+    skew_open = models.FloatField(null=True)
+    skew_high = models.FloatField(null=True)
+    skew_low = models.FloatField(null=True)
+    skew_close = models.FloatField(null=True)
+    skew_sum = models.FloatField(default=0.0)
+
+    objects = MarketDataRollupManager()
+
+    class Meta:
+        unique_together = ["ticker", "resolution", "bucket_start"]
+
+    def __str__(self):
+        return f"{self.ticker} {self.resolution} {self.bucket_start:%Y-%m-%d %H:%M}: {self.count}"
+
+    def push(self, values, timestamp):
+        """Add one observation; rows may arrive out of order within the bucket."""
+        first = self.count == 0
+        for prefix, value in zip(self.METRICS.values(), values):
+            if first:
+                for aggregate in ("open", "high", "low", "close"):
+                    setattr(self, f"{prefix}_{aggregate}", value)
+            else:
+                setattr(self, f"{prefix}_high", max(getattr(self, f"{prefix}_high"), value))
+                setattr(self, f"{prefix}_low", min(getattr(self, f"{prefix}_low"), value))
+                if timestamp < self.first_at:
+                    setattr(self, f"{prefix}_open", value)
+                if timestamp >= self.last_at:
+                    setattr(self, f"{prefix}_close", value)
+            setattr(self, f"{prefix}_sum", getattr(self, f"{prefix}_sum") + value)
+        if first or timestamp < self.first_at:
+            self.first_at = timestamp
+        if first or timestamp >= self.last_at:
+            self.last_at = timestamp
+        self.count += 1
+        self.modified_at = timezone.now()
+
+    def as_dict(self):
+        data = {"bucket_start": self.bucket_start, "count": self.count}
+        for metric, prefix in self.METRICS.items():
+            data[metric] = {
+                "open": getattr(self, f"{prefix}_open"),
+                "high": getattr(self, f"{prefix}_high"),
+                "low": getattr(self, f"{prefix}_low"),
+                "close": getattr(self, f"{prefix}_close"),
+                "mean": getattr(self, f"{prefix}_sum") / self.count if self.count else None,
+            }
+        return data
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from itertools import islice
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from ..common.email import SMTPConnectionPool, build_message
+from ..users.models import Profile
+
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SUBJECT = "New research signals"
+
+
+def wants_email(preferences):
+    """Email notifications are on unless the profile sets ``{"email": false}``."""
+    return not isinstance(preferences, dict) or preferences.get("email", True) is not False
+
+
+def iter_recipients(strategies, chunk_size=2000):
+    """
+    Yield ``(email, username, strategies)`` for every verified user who should
+    hear about ``strategies``. An empty ``preferred_strategies`` means all of them.
+
+    Profiles are streamed from a single query in ``chunk_size`` rows so the
+    whole user base is never held in memory. The JSON preferences are filtered
+    here rather than in SQL to stay portable across database backends.
+    """
+    strategies = set(strategies)
+    rows = (
+        Profile.objects.filter(user__is_active=True, user__is_verified=True, user__deleted=False)
+        .order_by()
+        .values_list("user__email", "user__username", "preferred_strategies", "notification_preferences")
+        .iterator(chunk_size=chunk_size)
+    )
+    for email, username, preferred, preferences in rows:
+        if not wants_email(preferences):
+            continue
+        wanted = strategies.intersection(preferred) if preferred else strategies
+        if wanted:
+            yield email, username, wanted
+
+
+def render_digest(username, signals):
+    lines = [f"Dear {username},", "", "New signals matching your strategies:", ""]
+    for signal in signals:
+        lines.append(
+            f"  {signal.ticker} {signal.strategy}: z-score {signal.vrp_zscore:+.2f}, "
+            f"expected return {signal.expected_return:+.4f}, confidence {signal.confidence}"
+        )
+    lines += ["", "Best regards,", "Miky Rola"]
+    return "\n".join(lines)
+
+
+def iter_digests(signals, chunk_size=2000):
+    """Group ``signals`` into one message per matching recipient."""
+    strategies = {signal.strategy for signal in signals}
+    for email, username, wanted in iter_recipients(strategies, chunk_size=chunk_size):
+        digest = [signal for signal in signals if signal.strategy in wanted]
+        yield build_message(DIGEST_SUBJECT, render_digest(username, digest), email, username)
+
+
+async def _send_batch(pool, messages):
+    results = await asyncio.gather(*(pool.send_message(message) for message in messages), return_exceptions=True)
+    failed = 0
+    for message, result in zip(messages, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.error(f"Failed to send signal digest to {message['To']}: {result}")
+    return failed
+
+
+def notify_new_signals(signals, pool=None, batch_size=500, chunk_size=2000):
+    """
+    Send one digest email per matching user for a batch of new signals.
+
+    Digests are built ``batch_size`` at a time from the streamed profile query
+    and each batch is sent concurrently; ``pool`` caps how many SMTP sessions
+    are open at once. Returns ``{"recipients", "sent", "failed"}``.
+    """
+    if not signals:
+        return {"recipients": 0, "sent": 0, "failed": 0}
+    pool = pool or SMTPConnectionPool()
+    digests = iter_digests(signals, chunk_size=chunk_size)
+    next_batch = sync_to_async(lambda: list(islice(digests, batch_size)))
+
+    async def run():
+        recipients = failed = 0
+        try:
+            while messages := await next_batch():
+                recipients += len(messages)
+                failed += await _send_batch(pool, messages)
+        finally:
+            await pool.close()
+        return {"recipients": recipients, "sent": recipients - failed, "failed": failed}
+
+    # async_to_sync keeps the streaming query on this thread while sends share one loop.
+    stats = async_to_sync(run)()
+    logger.info(
+        f"Sent {stats['sent']} signal digests ({stats['failed']} failed) for {len(signals)} signals",
+        extra={"digest_recipients": stats["recipients"], "digest_failed": stats["failed"]},
+    )
+    return stats
@@ -5,6 +5,7 @@ from .models import (
     Signal, 
     UserInteraction
 )
+from ..common.serializers import SparseFieldsetMixin
 
 
 class MarketDataSerializer(serializers.ModelSerializer):
@@ -45,7 +46,7 @@ class SignalSerializer(serializers.ModelSerializer):
         return obj.calculate_performance
 
 
-class UserInteractionSerializer(serializers.ModelSerializer):
+class UserInteractionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = UserInteraction
         fields = [
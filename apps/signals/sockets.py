@@ -0,0 +1,121 @@
+"""
+WebSocket endpoint pushing live MarketData ticks for the tickers a client follows.
+
+Clients authenticate with a JWT, either as ``?token=`` (browsers cannot set
+headers on a WebSocket) or an ``Authorization: Bearer`` header, and may
+follow tickers right away with ``?tickers=AAPL,MSFT``. Afterwards they send
+
+    {"action": "subscribe", "tickers": ["TSLA"]}
+    {"action": "unsubscribe", "tickers": ["AAPL"]}
+
+and receive ``{"type": "subscribed", "tickers": [...]}`` after each change
+and ``{"type": "ticks", "ticks": [...]}`` with the newest tick per ticker.
+A client reading slower than ticks arrive gets fewer, fresher ticks.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .events import market_ticks
+from ..common.authentication import CachedJWTAuthentication
+
+
+authenticator = CachedJWTAuthentication()
+
+# close codes in the private 4000-4999 range, mirroring HTTP statuses
+UNAUTHORIZED = 4401
+
+COMMAND_ERROR = 'Send {"action": "subscribe" or "unsubscribe", "tickers": [...]}.'
+
+
+async def authenticate_socket(scope):
+    """Return the user for the connection's token, or ``None``."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    raw_token = query.get("token", [None])[0]
+    if raw_token is None:
+        header = dict(scope.get("headers", ())).get(b"authorization")
+        if header is not None:
+            raw_token = authenticator.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        return await authenticator.aget_user(authenticator.get_validated_token(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    finally:
+        await sync_to_async(close_old_connections)()
+
+
+def ticks_frame(values):
+    # values are already JSON; join them rather than decoding and re-encoding per client
+    return '{"type": "ticks", "ticks": [' + ", ".join(values) + "]}"
+
+
+async def send_ticks(mailbox, send, lock):
+    while True:
+        values = await mailbox.get()
+        async with lock:
+            await send({"type": "websocket.send", "text": ticks_frame(values.values())})
+
+
+async def send_json(send, lock, data):
+    async with lock:
+        await send({"type": "websocket.send", "text": json.dumps(data)})
+
+
+def clean_tickers(tickers):
+    if not isinstance(tickers, list) or not all(isinstance(ticker, str) and ticker for ticker in tickers):
+        return None
+    return set(tickers)
+
+
+async def marketdata_socket(scope, receive, send):
+    """ASGI application for ``/ws/marketdata/``."""
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    if await authenticate_socket(scope) is None:
+        await send({"type": "websocket.close", "code": UNAUTHORIZED})
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode())
+    initial = {ticker for value in query.get("tickers", ()) for ticker in value.split(",") if ticker}
+    limit = settings.MARKETDATA_SOCKET_MAX_TICKERS
+    await send({"type": "websocket.accept"})
+
+    lock = asyncio.Lock()
+    async with market_ticks.subscribe(list(initial)[:limit]) as mailbox:
+        sender = asyncio.ensure_future(send_ticks(mailbox, send, lock))
+        try:
+            if mailbox.keys:
+                await send_json(send, lock, {"type": "subscribed", "tickers": sorted(mailbox.keys)})
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message["type"] != "websocket.receive":
+                    continue
+                try:
+                    command = json.loads(message.get("text") or message.get("bytes") or b"")
+                    action, tickers = command["action"], clean_tickers(command["tickers"])
+                except (ValueError, TypeError, KeyError):
+                    action, tickers = None, None
+                if tickers is None or action not in ("subscribe", "unsubscribe"):
+                    await send_json(send, lock, {"type": "error", "detail": COMMAND_ERROR})
+                    continue
+                if action == "unsubscribe":
+                    mailbox.unfollow(tickers)
+                elif len(mailbox.keys | tickers) > limit:
+                    await send_json(send, lock, {"type": "error", "detail": f"Follow at most {limit} tickers."})
+                    continue
+                else:
+                    mailbox.follow(tickers)
+                await send_json(send, lock, {"type": "subscribed", "tickers": sorted(mailbox.keys)})
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..engine import build_signals, compute_metrics
+from ..models import MarketData, Signal
+
+
+def columns(rows):
+    tickers, implied, historical, skew = zip(*rows)
+    return (
+        np.array(tickers),
+        np.array(implied, dtype=np.float64),
+        np.array(historical, dtype=np.float64),
+        np.array(skew, dtype=np.float64),
+    )
+
+
+def test_compute_metrics_uses_trailing_window_per_ticker():
+    rows = [("AAA", 10.0, 1.0, 0.0)] + [("AAA", 1.0, 1.0, 0.0)] * 3 + [("AAA", 2.0, 1.0, 0.0)]
+    rows += [("BBB", 0.2, 0.2, 0.1)] * 4 + [("BBB", 0.2, 0.0, 0.1)]
+    metrics = compute_metrics(*columns(rows), window=4, min_observations=4)
+
+    assert metrics["ticker"].tolist() == ["AAA", "BBB"]
+    # AAA window is [1, 1, 1, 2]: mean 1.25, std ~0.433; the 10.0 outlier fell out of the window
+    assert metrics["vrp_ratio"].tolist() == [2.0, 1.0]
+    assert metrics["vrp_zscore"][0] == pytest.approx(0.75 / np.sqrt(0.1875))
+    assert metrics["vrp_return"][0] == pytest.approx(0.5)
+    # BBB is flat, and the row with zero historical vol is ignored
+    assert metrics["vrp_zscore"][1] == 0.0
+
+
+def test_compute_metrics_ignores_zero_implied_vol():
+    rows = [("AAA", 0.2, 0.1, 0.0)] * 4 + [("AAA", 0.0, 0.1, 0.0)]
+    metrics = compute_metrics(*columns(rows), min_observations=4)
+
+    assert metrics["vrp_ratio"].tolist() == [2.0]
+    assert all(np.isfinite(values).all() for name, values in metrics.items() if name != "ticker")
+
+
+def test_compute_metrics_skips_sparse_tickers():
+    metrics = compute_metrics(*columns([("AAA", 0.2, 0.1, 0.0)] * 3), min_observations=5)
+    assert metrics["ticker"].size == 0
+    assert build_signals(metrics) == []
+
+
+def test_build_signals_per_triggered_strategy():
+    metrics = {
+        "ticker": np.array(["AAA", "BBB"]),
+        "vrp_ratio": np.array([1.5, 1.0]),
+        "vrp_zscore": np.array([3.0, 0.1]),
+        "vrp_return": np.array([0.3, 0.0]),
+        "skew_zscore": np.array([0.0, -2.5]),
+        "skew_return": np.array([0.0, 0.01]),
+        "term_zscore": np.array([0.0, 0.0]),
+        "term_return": np.array([0.0, 0.0]),
+    }
+    signals = build_signals(metrics, min_zscore=2.0)
+    assert [(s.ticker, s.strategy) for s in signals] == [("AAA", "VRP"), ("BBB", "SKEW")]
+    assert signals[0].confidence == 90
+    assert signals[1].expected_return == 0.01
+
+
+@pytest.mark.django_db
+def test_generate_signals_command():
+    MarketData.objects.bulk_create(
+        [MarketData(ticker="AAPL", implied_volatility=0.2, historical_volatility=0.2, skew=0.1) for _ in range(9)]
+        + [MarketData(ticker="AAPL", implied_volatility=0.4, historical_volatility=0.2, skew=0.1)]
+    )
+    MarketData.objects.filter(implied_volatility=0.4).update(created_at=timezone.now() + timedelta(seconds=1))
+    out = StringIO()
+    call_command("generate_signals", "--min-zscore", "2", stdout=out)
+
+    assert "Created 1 signals" in out.getvalue()
+    vrp = Signal.objects.get(strategy="VRP")
+    assert vrp.ticker == "AAPL"
+    assert vrp.vrp_ratio == 2.0
+    assert vrp.vrp_zscore == pytest.approx(3.0)
+    assert vrp.confidence == 90
+    assert vrp.performance_rollup.values == (0, 0, 0.0, 0.0)
@@ -0,0 +1,78 @@
+from email import message_from_bytes
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.common.email import SMTPConnectionPool
+from apps.users.models import Profile
+from apps.users.tests.factories import UserFactory
+
+from ..models import Signal
+from ..notifications import iter_recipients, notify_new_signals
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_profile(email, preferred_strategies=(), notification_preferences=None, **user_fields):
+    # usernames are unique and the factory's random words can collide
+    user = UserFactory(email=email, **{"username": email.split("@")[0], "is_verified": True, **user_fields})
+    return Profile.objects.create(
+        user=user,
+        risk_tolerance=5,
+        preferred_strategies=list(preferred_strategies),
+        notification_preferences=notification_preferences or {},
+    )
+
+
+def make_signals(*strategies):
+    return [
+        Signal(
+            ticker="AAPL",
+            strategy=strategy,
+            vrp_zscore=2.5,
+            vrp_ratio=1.3,
+            expected_return=0.02,
+            confidence=80,
+            expires_at=timezone.now(),
+        )
+        for strategy in strategies
+    ]
+
+
+@pytest.fixture
+def profiles():
+    make_profile("all@example.com")
+    make_profile("vrp@example.com", preferred_strategies=["VRP"])
+    make_profile("term@example.com", preferred_strategies=["TERM"])
+    make_profile("muted@example.com", notification_preferences={"email": False})
+    make_profile("unverified@example.com", is_verified=False)
+
+
+def test_recipients_resolved_with_one_query(profiles):
+    with CaptureQueriesContext(connection) as ctx:
+        recipients = {email: wanted for email, _, wanted in iter_recipients({"VRP", "SKEW"}, chunk_size=2)}
+
+    assert len(ctx.captured_queries) == 1
+    assert recipients == {"all@example.com": {"VRP", "SKEW"}, "vrp@example.com": {"VRP"}}
+
+
+def test_notify_sends_one_digest_per_user(profiles, smtp_server):
+    controller, handler = smtp_server
+    pool = SMTPConnectionPool(
+        size=2, hostname=controller.hostname, port=controller.port, use_tls=False, username=""
+    )
+
+    stats = notify_new_signals(make_signals("VRP", "SKEW"), pool=pool, batch_size=1)
+
+    assert stats == {"recipients": 2, "sent": 2, "failed": 0}
+    bodies = {
+        envelope.rcpt_tos[0]: message_from_bytes(envelope.content).get_payload()[0].get_payload(decode=True).decode()
+        for envelope in handler.messages
+    }
+    assert set(bodies) == {"all@example.com", "vrp@example.com"}
+    assert "SKEW" in bodies["all@example.com"] and "VRP" in bodies["all@example.com"]
+    assert "SKEW" not in bodies["vrp@example.com"]
+    assert pool.connections_opened <= 2
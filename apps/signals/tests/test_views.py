@@ -1,11 +1,37 @@
+import asyncio
+import base64
+
+import fakeredis
+import numpy as np
 import pytest
+import redis.asyncio
 from django.urls import reverse
 from rest_framework import status
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from datetime import date
+from datetime import date, timedelta
+import importlib
+import json
+import uuid
+from unittest import mock
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from ..models import MarketData, Signal, UserInteraction
+from ..caching import signal_cache
+from ..events import market_ticks, signal_events
+from ..engine import compute_metrics, load_market_data
+from ..views import SignalViewSet
+from ..leaderboard import leaderboard
+from ..models import MarketData, MarketDataRollup, Signal, SignalPerformance, TickerRollingStats, UserInteraction
 from ..serializers import MarketDataSerializer, SignalSerializer, UserInteractionSerializer
 
 User = get_user_model()
@@ -26,6 +52,17 @@ def authenticated_api_client(user):
     return client
 
 
+@pytest.fixture
+def token_api_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def as_json(data):
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
 @pytest.fixture
 def market_data():
     return MarketData.objects.create(
@@ -87,10 +124,54 @@ def test_signal_retrieve(authenticated_api_client, signal):
 def test_user_interaction_list(authenticated_api_client, user_interaction):
     url = reverse("api:userinteractions-user-signals", args=(str(user_interaction.user.id),))
     response = authenticated_api_client.get(url)
-    print(response.data)
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0] == UserInteractionSerializer(user_interaction).data
+    assert response.data["count"] == 1
+    assert response.data["results"][0] == UserInteractionSerializer(user_interaction).data
+
+
+@pytest.mark.django_db
+def test_user_interaction_list_keyset_pages(authenticated_api_client, user):
+    for i in range(5):
+        UserInteraction.objects.create(
+            user=user,
+            status="watching",
+            signal=Signal.objects.create(
+                ticker=f"T{i}", strategy="VRP", vrp_zscore=2.0, vrp_ratio=1.1,
+                expected_return=0.01, confidence=50, expires_at=timezone.now(),
+            ),
+        )
+    expected = [
+        str(pk) for pk in UserInteraction.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+    ]
+    url = reverse("api:userinteractions-user-signals", args=(str(user.id),))
+
+    first = authenticated_api_client.get(url, {"page_size": 3}).data
+    second = authenticated_api_client.get(first["next"]).data
+    assert second["next"] is None
+    assert [row["id"] for row in first["results"] + second["results"]] == expected
+
+
+@pytest.mark.django_db
+def test_user_interaction_list_unknown_id_is_not_found(authenticated_api_client):
+    url = reverse("api:userinteractions-user-signals", args=["not-a-uuid"])
+    assert authenticated_api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_user_interaction_list_sparse_fields(authenticated_api_client, user_interaction):
+    url = reverse("api:userinteractions-user-signals", args=(str(user_interaction.user.id),))
+    with CaptureQueriesContext(connection) as ctx:
+        response = authenticated_api_client.get(url, {"fields": "id,status,pnl", "count": "false"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": str(user_interaction.id), "status": "taken", "pnl": 500.0}
+    ]
+    select = next(q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT"))
+    assert '"notes"' not in select and "JOIN" not in select
+
+    response = authenticated_api_client.get(url, {"fields": "id,password"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 @pytest.mark.django_db
 def test_user_interaction_create(authenticated_api_client, signal, user):
@@ -104,4 +185,1193 @@ def test_user_interaction_create(authenticated_api_client, signal, user):
     }
     response = authenticated_api_client.post(url, data, format="json")
     assert response.status_code == status.HTTP_201_CREATED
-    assert UserInteraction.objects.count() == 1
\ No newline at end of file
+    assert UserInteraction.objects.count() == 1
+
+@pytest.mark.django_db
+def test_signal_list_performance_from_rollup(authenticated_api_client, signal, user):
+    url = reverse("api:userinteractions-list")
+    data = {"user": user.id, "signal": signal.id, "status": "taken", "pnl": 500.0}
+    authenticated_api_client.post(url, data, format="json")
+
+    response = authenticated_api_client.get(reverse("api:signals-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["performance"] == {"avg_pnl": 500.0, "total_trades": 1}
+
+
+@pytest.mark.django_db
+def test_created_signal_starts_with_empty_rollup(authenticated_api_client):
+    response = authenticated_api_client.post(reverse("api:signals-list"), signal_payload("AAPL"), format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["performance"] == {"avg_pnl": None, "total_trades": 0}
+    rollup = SignalPerformance.objects.get(signal_id=response.data["id"])
+    assert rollup.values == (0, 0, 0.0, 0.0)
+
+
+@pytest.mark.django_db
+def test_signal_list_performance_without_rollup(authenticated_api_client, signal, user_interaction):
+    response = authenticated_api_client.get(reverse("api:signals-list"))
+    assert response.data["results"][0]["performance"] == {"avg_pnl": 500.0, "total_trades": 1}
+
+
+@pytest.mark.django_db
+def test_signal_performance_rollup_tracks_updates_and_deletes(authenticated_api_client, signal, user):
+    other = User.objects.create_user(email="other@email.com", username="otheruser", password="testpass")
+    url = reverse("api:userinteractions-list")
+    first = authenticated_api_client.post(
+        url, {"user": user.id, "signal": signal.id, "status": "taken", "pnl": 100.0}, format="json"
+    ).data
+    authenticated_api_client.post(
+        url, {"user": other.id, "signal": signal.id, "status": "taken", "pnl": 300.0}, format="json"
+    )
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 200.0, "total_trades": 2}
+
+    detail = reverse("api:userinteractions-detail", args=[first["id"]])
+    authenticated_api_client.patch(detail, {"status": "passed"}, format="json")
+    signal.performance_rollup.refresh_from_db()
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 300.0, "total_trades": 1}
+
+    authenticated_api_client.patch(detail, {"status": "taken", "pnl": -100.0}, format="json")
+    signal.performance_rollup.refresh_from_db()
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 100.0, "total_trades": 2}
+    assert signal.performance_rollup.pnl_stddev == 200.0
+
+    authenticated_api_client.delete(detail)
+    signal.performance_rollup.refresh_from_db()
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 300.0, "total_trades": 1}
+    assert SignalPerformance.objects.rebuild() == []
+
+
+@pytest.mark.django_db
+def test_signal_performance_backfill_migration(signal, user_interaction):
+    migration = importlib.import_module("apps.signals.migrations.0010_backfill_signalperformance")
+    schema_editor = mock.Mock(connection=connection)
+    migration.backfill(apps, schema_editor)
+    migration.backfill(apps, schema_editor)
+
+    assert SignalPerformance.objects.get().as_dict() == {"avg_pnl": 500.0, "total_trades": 1}
+    assert SignalPerformance.objects.rebuild() == []
+
+
+@pytest.mark.django_db
+def test_signal_performance_seeding_race(signal, user, monkeypatch):
+    first = UserInteraction.objects.create(user=user, signal=signal, status="taken", pnl=100.0)
+    compute = SignalPerformance.objects.compute
+
+    def seeded_concurrently(signal_ids=None):
+        # another writer seeds the rollup between our failed update and our insert
+        values = compute(signal_ids)
+        SignalPerformance.objects.create(signal=signal, total_trades=1, pnl_count=1, pnl_sum=300.0, pnl_sum_squares=9e4)
+        return values
+
+    monkeypatch.setattr(SignalPerformance.objects, "compute", seeded_concurrently)
+    SignalPerformance.objects.record(after=first.performance_contribution())
+
+    signal.performance_rollup.refresh_from_db()
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 200.0, "total_trades": 2}
+
+
+@pytest.mark.django_db
+def test_rebuild_signal_performance_reports_drift(signal, user_interaction):
+    out = StringIO()
+    call_command("rebuild_signal_performance", stdout=out)
+    assert "1 signal rollup(s) drifted" in out.getvalue()
+    assert signal.performance_rollup.as_dict() == {"avg_pnl": 500.0, "total_trades": 1}
+
+    out = StringIO()
+    call_command("rebuild_signal_performance", stdout=out)
+    assert "No drift found" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_signal_list_query_count_is_constant(
+    authenticated_api_client, django_assert_num_queries
+):
+    for i in range(25):
+        signal = Signal.objects.create(
+            ticker=f"T{i}",
+            strategy="VRP",
+            vrp_zscore=1.0,
+            vrp_ratio=1.1,
+            expected_return=0.02,
+            confidence=50,
+            expires_at="2019-08-24T14:15:22Z",
+        )
+        trader = User.objects.create_user(email=f"trader{i}@email.com", username=f"trader{i}", password="testpass")
+        interaction = UserInteraction.objects.create(user=trader, signal=signal, status="taken", pnl=float(i))
+        SignalPerformance.objects.record(after=interaction.performance_contribution())
+
+    url = reverse("api:signals-list")
+    # COUNT(*) + one annotated SELECT; reads skip the ATOMIC_REQUESTS transaction
+    with django_assert_num_queries(2):
+        response = authenticated_api_client.get(url, {"page_size": 20})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 20
+
+
+@pytest.mark.django_db
+def test_signal_performance_action(authenticated_api_client, signal, user_interaction):
+    url = reverse("api:signals-performance", args=[signal.id])
+    response = authenticated_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"avg_pnl": 500.0, "total_trades": 1}
+
+
+@pytest.mark.django_db
+def test_market_data_bulk_json(authenticated_api_client):
+    url = reverse("api:marketdata-bulk")
+    rows = [
+        {"ticker": "AAPL", "implied_volatility": 0.2, "historical_volatility": 0.18, "skew": 0.1},
+        {"ticker": "MSFT", "implied_volatility": "0.3", "historical_volatility": 0.25, "skew": -0.1},
+        {"ticker": "TOOLONGTICKER", "implied_volatility": 0.2, "historical_volatility": 0.18},
+        "not an object",
+    ]
+    response = authenticated_api_client.post(f"{url}?batch_size=1", rows, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["created"] == 2
+    assert response.data["errors"] == [
+        {
+            "index": 2,
+            "errors": {
+                "ticker": ["Ensure this field has no more than 10 characters."],
+                "skew": ["This field is required."],
+            },
+        },
+        {"index": 3, "errors": {"non_field_errors": ["Expected a JSON object."]}},
+    ]
+    assert set(MarketData.objects.values_list("ticker", flat=True)) == {"AAPL", "MSFT"}
+
+
+@pytest.mark.django_db
+def test_market_data_bulk_ndjson(authenticated_api_client):
+    url = reverse("api:marketdata-bulk")
+    body = "\n".join([
+        '{"ticker": "AAPL", "implied_volatility": 0.2, "historical_volatility": 0.18, "skew": 0.1}',
+        "{broken",
+        '{"ticker": "SPY", "implied_volatility": "nan", "historical_volatility": 0.1, "skew": 0.0}',
+        "",
+    ])
+    response = authenticated_api_client.post(url, body, content_type="application/x-ndjson")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["created"] == 1
+    assert [error["index"] for error in response.data["errors"]] == [1, 2]
+    assert response.data["errors"][1]["errors"] == {"implied_volatility": ["A valid number is required."]}
+
+
+@pytest.mark.django_db
+def test_market_data_bulk_query_count_is_per_batch(authenticated_api_client, django_assert_max_num_queries):
+    url = reverse("api:marketdata-bulk")
+    rows = [
+        {"ticker": f"T{i % 200}", "implied_volatility": 0.2 + i * 1e-4, "historical_volatility": 0.18, "skew": 0.0}
+        for i in range(400)
+    ]
+    # Unseeded and then seeded tickers: a per-row or per-ticker query here
+    # would cost hundreds of queries rather than a handful per batch.
+    for _ in range(2):
+        with django_assert_max_num_queries(20):
+            response = authenticated_api_client.post(f"{url}?batch_size=400", rows, format="json")
+        assert response.data["created"] == 400
+
+
+@pytest.mark.django_db
+def test_market_data_create_query_count(authenticated_api_client, django_assert_max_num_queries):
+    url = reverse("api:marketdata-list")
+    row = {"ticker": "AAPL", "implied_volatility": 0.2, "historical_volatility": 0.18, "skew": 0.1}
+    authenticated_api_client.post(url, row, format="json")
+    with django_assert_max_num_queries(10):
+        response = authenticated_api_client.post(url, row, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_market_data_export_ndjson(authenticated_api_client, market_data):
+    MarketData.objects.create(ticker="MSFT", implied_volatility=0.3, historical_volatility=0.2, skew=0.1)
+    url = reverse("api:marketdata-export")
+    response = authenticated_api_client.get(url, {"ticker": "AAPL"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert len(lines) == 1
+    row = json.loads(lines[0])
+    assert row["id"] == str(market_data.id)
+    assert row["implied_volatility"] == 0.2
+
+
+@pytest.mark.django_db
+def test_market_data_export_csv_time_range(authenticated_api_client, market_data):
+    url = reverse("api:marketdata-export")
+    response = authenticated_api_client.get(
+        url, {"ticker": "AAPL", "output": "csv", "start": "2000-01-01T00:00:00Z"}
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == "id,ticker,implied_volatility,historical_volatility,skew,created_at"
+    assert lines[1].startswith(f"{market_data.id},AAPL,0.2,0.18,0.15,")
+
+    response = authenticated_api_client.get(
+        url, {"ticker": "AAPL", "output": "csv", "end": "2000-01-01T00:00:00Z"}
+    )
+    assert len(b"".join(response.streaming_content).decode().splitlines()) == 1
+
+
+@pytest.mark.django_db
+def test_market_data_export_requires_ticker(authenticated_api_client):
+    response = authenticated_api_client.get(reverse("api:marketdata-export"))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_market_data_keyset_pagination(authenticated_api_client):
+    MarketData.objects.bulk_create(
+        MarketData(ticker=f"T{i}", implied_volatility=0.2, historical_volatility=0.1, skew=0.0)
+        for i in range(5)
+    )
+    expected = [
+        str(pk) for pk in MarketData.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+    ]
+    url = reverse("api:marketdata-list")
+
+    first = authenticated_api_client.get(url, {"cursor": "", "page_size": 2}).data
+    assert first["count"] == 5
+    assert first["previous"] is None
+    second = authenticated_api_client.get(first["next"]).data
+    third = authenticated_api_client.get(second["next"]).data
+    assert third["next"] is None
+    seen = [row["id"] for page in (first, second, third) for row in page["results"]]
+    assert seen == expected
+
+    back = authenticated_api_client.get(third["previous"]).data
+    assert [row["id"] for row in back["results"]] == expected[2:4]
+    back = authenticated_api_client.get(back["previous"]).data
+    assert [row["id"] for row in back["results"]] == expected[:2]
+    assert back["previous"] is None
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_count_opt_out(authenticated_api_client, signal, django_assert_num_queries):
+    url = reverse("api:signals-list")
+    with django_assert_num_queries(1):
+        response = authenticated_api_client.get(url, {"cursor": "", "count": "false"})
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 1
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_invalid_cursor(authenticated_api_client):
+    url = reverse("api:userinteractions-list")
+    response = authenticated_api_client.get(url, {"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    bad_id = base64.urlsafe_b64encode(json.dumps({"c": "2024-01-01T00:00:00+00:00", "i": "1"}).encode()).decode()
+    response = authenticated_api_client.get(reverse("api:signals-list"), {"cursor": bad_id})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+def test_keyset_pagination_rejects_ordering(authenticated_api_client, signal):
+    url = reverse("api:signals-list")
+    response = authenticated_api_client.get(url, {"cursor": "", "ordering": "confidence"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "ordering" in response.data
+    assert authenticated_api_client.get(url, {"ordering": "confidence"}).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_rolling_stats_follow_inserts_and_rebuild(authenticated_api_client):
+    url = reverse("api:marketdata-list")
+    for implied in (0.2, 0.3, 0.4):
+        authenticated_api_client.post(
+            url,
+            {"ticker": "AAPL", "implied_volatility": implied, "historical_volatility": 0.2, "skew": 0.0},
+            format="json",
+        )
+    authenticated_api_client.post(
+        reverse("api:marketdata-bulk"),
+        [{"ticker": "AAPL", "implied_volatility": 0.6, "historical_volatility": 0.2, "skew": 0.0}],
+        format="json",
+    )
+
+    response = authenticated_api_client.get(reverse("api:marketdata-vrp-zscore"), {"ticker": "AAPL"})
+    assert response.status_code == status.HTTP_200_OK
+    ratios = np.array([1.0, 1.5, 2.0, 3.0])
+    assert response.data["count"] == 4
+    assert response.data["mean"] == pytest.approx(ratios.mean())
+    assert response.data["stddev"] == pytest.approx(ratios.std())
+    assert response.data["vrp_zscore"] == pytest.approx((3.0 - ratios.mean()) / ratios.std())
+
+    incremental = TickerRollingStats.objects.get(ticker="AAPL")
+    call_command("rebuild_rolling_stats", stdout=StringIO())
+    rebuilt = TickerRollingStats.objects.get(ticker="AAPL")
+    assert rebuilt.count == incremental.count
+    assert rebuilt.mean == pytest.approx(incremental.mean)
+    assert rebuilt.m2 == pytest.approx(incremental.m2)
+
+
+@pytest.mark.django_db
+def test_rolling_stats_keep_a_trailing_window(authenticated_api_client, settings):
+    settings.VRP_ZSCORE_WINDOW = 3
+    bulk = reverse("api:marketdata-bulk")
+    implied = [0.9, 0.2, 0.3, 0.4, 0.6]
+    for batch in (implied[:2], implied[2:]):
+        authenticated_api_client.post(
+            bulk,
+            [{"ticker": "AAPL", "implied_volatility": iv, "historical_volatility": 0.2, "skew": 0.0} for iv in batch],
+            format="json",
+        )
+
+    response = authenticated_api_client.get(reverse("api:marketdata-vrp-zscore"), {"ticker": "AAPL"})
+    ratios = np.array([1.5, 2.0, 3.0])
+    assert response.data["count"] == 3
+    assert response.data["mean"] == pytest.approx(ratios.mean())
+    assert response.data["stddev"] == pytest.approx(ratios.std())
+
+    incremental = TickerRollingStats.objects.get(ticker="AAPL")
+    TickerRollingStats.objects.rebuild()
+    rebuilt = TickerRollingStats.objects.get(ticker="AAPL")
+    assert rebuilt.window_start == incremental.window_start
+    assert rebuilt.m2 == pytest.approx(incremental.m2)
+
+
+@pytest.mark.django_db
+def test_rolling_stats_seed_new_tickers_from_the_table():
+    rows = MarketData.objects.bulk_create(
+        MarketData(ticker="AAPL", implied_volatility=iv, historical_volatility=0.2, skew=0.0) for iv in (0.2, 0.4)
+    )
+    TickerRollingStats.objects.update_from(rows)
+    state = TickerRollingStats.objects.get(ticker="AAPL")
+    assert (state.count, state.mean, state.window_start) == (2, pytest.approx(1.5), rows[0].created_at)
+
+    rows = MarketData.objects.bulk_create(
+        [MarketData(ticker="AAPL", implied_volatility=0.6, historical_volatility=0.2, skew=0.0)]
+    )
+    TickerRollingStats.objects.update_from(rows)
+    state = TickerRollingStats.objects.get(ticker="AAPL")
+    assert (state.count, state.mean, state.last_value) == (3, pytest.approx(2.0), pytest.approx(3.0))
+
+
+@pytest.mark.django_db
+def test_rolling_stats_match_the_signal_engine(settings):
+    settings.VRP_ZSCORE_WINDOW = 5
+    rng = np.random.default_rng(3)
+    for ticker in ("AAPL", "MSFT"):
+        implied = rng.uniform(0.1, 0.5, 12)
+        historical = rng.uniform(0.1, 0.5, 12)
+        # quotes the engine drops, inside and before the trailing window
+        implied[[3, 10]] = 0.0
+        historical[8] = -0.1
+        for start in range(0, 12, 4):
+            rows = MarketData.objects.bulk_create(
+                MarketData(ticker=ticker, implied_volatility=iv, historical_volatility=hv, skew=0.0)
+                for iv, hv in zip(implied[start : start + 4], historical[start : start + 4])
+            )
+            TickerRollingStats.objects.update_from(rows)
+
+    metrics = compute_metrics(*load_market_data(timezone.now() - timedelta(days=1)), window=5, min_observations=1)
+    assert metrics["ticker"].tolist() == ["AAPL", "MSFT"]
+    for ticker, zscore in zip(metrics["ticker"].tolist(), metrics["vrp_zscore"].tolist()):
+        state = TickerRollingStats.objects.get(ticker=ticker)
+        assert state.count == 5
+        assert state.vrp_zscore == pytest.approx(zscore)
+
+
+@pytest.mark.django_db
+def test_vrp_zscore_unknown_ticker(authenticated_api_client):
+    response = authenticated_api_client.get(reverse("api:marketdata-vrp-zscore"), {"ticker": "NOPE"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_signal_cache_invalidated_on_writes(
+    authenticated_api_client, signal, user, django_capture_on_commit_callbacks
+):
+    url = reverse("api:signals-detail", args=[signal.id])
+    assert authenticated_api_client.get(url).data["confidence"] == 90
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(url, {"confidence": 50}, format="json")
+    assert authenticated_api_client.get(url).data["confidence"] == 50
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.post(
+            reverse("api:userinteractions-list"),
+            {"user": user.id, "signal": signal.id, "status": "taken", "pnl": 10.0},
+            format="json",
+        )
+    assert authenticated_api_client.get(url).data["performance"] == {"avg_pnl": 10.0, "total_trades": 1}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(url)
+    assert authenticated_api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_signal_cache_hit_skips_database(authenticated_api_client, signal, django_assert_num_queries):
+    url = reverse("api:signals-detail", args=[signal.id])
+    authenticated_api_client.get(url)
+    with django_assert_num_queries(0):
+        response = authenticated_api_client.get(url)
+    assert response.data == SignalSerializer(signal).data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_signal_version_keys_only_for_existing_signals(authenticated_api_client, signal, settings, monkeypatch):
+    settings.SIGNAL_VERSION_TIMEOUT = 123
+    timeouts = []
+    get_or_set = signal_cache.remote.get_or_set
+    monkeypatch.setattr(
+        signal_cache.remote,
+        "get_or_set",
+        lambda key, default, timeout: timeouts.append(timeout) or get_or_set(key, default, timeout),
+    )
+    unknown = uuid.uuid4()
+
+    response = authenticated_api_client.get(reverse("api:signals-detail", args=[unknown]))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert signal_cache.get(f"signal_{unknown}_version") is None
+
+    authenticated_api_client.get(reverse("api:signals-detail", args=[signal.id]))
+    assert signal_cache.get(f"signal_{signal.id}_version") is not None
+    assert timeouts == [123]
+
+
+@pytest.mark.django_db
+def test_signal_list_cached_until_signal_write(
+    authenticated_api_client, signal, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    url = reverse("api:signals-list")
+    authenticated_api_client.get(url, {"page_size": 10})
+    with django_assert_num_queries(0):
+        response = authenticated_api_client.get(url, {"page_size": "10", "page": "1"})
+    assert response.data["count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            reverse("api:signals-detail", args=[signal.id]), {"confidence": 10}, format="json"
+        )
+    response = authenticated_api_client.get(url, {"page_size": 10})
+    assert response.data["results"][0]["confidence"] == 10
+
+
+@pytest.mark.django_db
+def test_signal_list_cache_keeps_links_per_scheme_and_host(authenticated_api_client, signal, settings):
+    settings.ALLOWED_HOSTS = ["testserver", "api.example.com"]
+    Signal.objects.bulk_create(
+        Signal(
+            ticker="MSFT", strategy="VRP", vrp_zscore=1.0, vrp_ratio=1.1,
+            expected_return=0.02, confidence=50, expires_at=timezone.now(),
+        )
+        for _ in range(2)
+    )
+    url = reverse("api:signals-list")
+
+    links = {
+        authenticated_api_client.get(url, {"page_size": 1}, **extra).data["next"]
+        for extra in ({}, {"secure": True}, {"HTTP_HOST": "api.example.com"})
+    }
+    assert {link.split("/api/")[0] for link in links} == {
+        "http://testserver",
+        "https://testserver",
+        "http://api.example.com",
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_signal_cache_stats_admin_only(authenticated_api_client, user, signal):
+    url = reverse("api:signals-cache-stats")
+    assert authenticated_api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    user.is_staff = True
+    user.save()
+    authenticated_api_client.get(reverse("api:signals-detail", args=[signal.id]))
+    response = authenticated_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["local_misses"] >= 1
+
+
+@pytest.mark.django_db
+def test_user_portfolio_analytics(authenticated_api_client, user):
+    trades = [("VRP", 100.0), ("SKEW", -50.0), ("VRP", None), ("SKEW", -30.0), ("VRP", 40.0)]
+    start = timezone.now() - timedelta(days=1)
+    for i, (strategy, pnl) in enumerate(trades):
+        signal = Signal.objects.create(
+            ticker=f"T{i}", strategy=strategy, vrp_zscore=2.0, vrp_ratio=1.1,
+            expected_return=0.01, confidence=50, expires_at=start,
+        )
+        interaction = UserInteraction.objects.create(user=user, signal=signal, status="taken", pnl=pnl)
+        UserInteraction.objects.filter(pk=interaction.pk).update(created_at=start + timedelta(minutes=i))
+    UserInteraction.objects.create(
+        user=user, status="watching", pnl=999.0,
+        signal=Signal.objects.create(
+            ticker="W", strategy="TERM", vrp_zscore=2.0, vrp_ratio=1.1,
+            expected_return=0.01, confidence=50, expires_at=start,
+        ),
+    )
+
+    response = authenticated_api_client.get(reverse("api:userinteractions-portfolio", args=[user.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data
+    closed = np.array([100.0, -50.0, -30.0, 40.0])
+    assert data["total_trades"] == 5
+    assert data["closed_trades"] == 4
+    assert data["total_pnl"] == pytest.approx(60.0)
+    assert data["avg_pnl"] == pytest.approx(15.0)
+    assert data["win_rate"] == pytest.approx(0.5)
+    assert data["sharpe_ratio"] == pytest.approx(closed.mean() / closed.std(ddof=1))
+    # equity 100, 50, 20, 60 against a peak of 100
+    assert data["max_drawdown"] == pytest.approx(80.0)
+    assert set(data["strategies"]) == {"VRP", "SKEW"}
+    assert data["strategies"]["VRP"]["total_trades"] == 3
+    assert data["strategies"]["VRP"]["closed_trades"] == 2
+    assert data["strategies"]["VRP"]["avg_pnl"] == pytest.approx(70.0)
+    assert data["strategies"]["SKEW"]["win_rate"] == 0.0
+
+
+@pytest.mark.django_db
+def test_user_portfolio_analytics_without_trades(authenticated_api_client, user):
+    response = authenticated_api_client.get(reverse("api:userinteractions-portfolio", args=[user.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total_trades"] == 0
+    assert response.data["avg_pnl"] is None
+    assert response.data["max_drawdown"] == 0.0
+    assert response.data["strategies"] == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_portfolio_is_private(api_client, authenticated_api_client, user):
+    other = User.objects.create_user(email="other@email.com", username="other", password="testpass")
+    url = reverse("api:userinteractions-portfolio", args=[other.id])
+
+    assert api_client.get(url).status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+    assert authenticated_api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    user.is_staff = True
+    user.save()
+    assert authenticated_api_client.get(url).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_user_portfolio_unknown_id_is_not_found(authenticated_api_client):
+    url = reverse("api:userinteractions-portfolio", args=["not-a-uuid"])
+    assert authenticated_api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_user_portfolio_cached_until_interactions_change(
+    authenticated_api_client, user, signal, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    url = reverse("api:userinteractions-portfolio", args=[user.id])
+    assert authenticated_api_client.get(url).data["total_trades"] == 0
+    with django_assert_num_queries(0):
+        assert authenticated_api_client.get(url).data["total_trades"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_api_client.post(
+            reverse("api:userinteractions-list"),
+            {"user": user.id, "signal": signal.id, "status": "taken", "pnl": 12.5},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_201_CREATED
+    data = authenticated_api_client.get(url).data
+    assert data["total_trades"] == 1
+    assert data["total_pnl"] == pytest.approx(12.5)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(reverse("api:userinteractions-detail", args=[response.data["id"]]))
+    assert authenticated_api_client.get(url).data["total_trades"] == 0
+
+
+@pytest.mark.django_db
+def test_user_portfolio_follows_signal_strategy(
+    authenticated_api_client, user, user_interaction, signal, django_capture_on_commit_callbacks
+):
+    url = reverse("api:userinteractions-portfolio", args=[user.id])
+    assert set(authenticated_api_client.get(url).data["strategies"]) == {"VRP"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(reverse("api:signals-detail", args=[signal.id]), {"strategy": "TERM"}, format="json")
+
+    assert UserInteraction.objects.get().strategy == "TERM"
+    assert set(authenticated_api_client.get(url).data["strategies"]) == {"TERM"}
+
+
+@pytest.mark.django_db
+def test_user_interaction_strategy_migration(user_interaction, signal):
+    UserInteraction.objects.update(strategy="")
+    migration = importlib.import_module("apps.signals.migrations.0014_userinteraction_strategy")
+    migration.copy_strategies(apps, mock.Mock(connection=connection))
+
+    assert UserInteraction.objects.get().strategy == signal.strategy
+
+
+@pytest.fixture
+def redis_leaderboard(redis_default_cache):
+    return leaderboard
+
+
+def make_signal(ticker, strategy):
+    return Signal.objects.create(
+        ticker=ticker, strategy=strategy, vrp_zscore=2.0, vrp_ratio=1.1,
+        expected_return=0.01, confidence=50, expires_at=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_leaderboard_follows_interaction_writes(
+    authenticated_api_client, user, redis_leaderboard, django_capture_on_commit_callbacks
+):
+    interactions_url = reverse("api:userinteractions-list")
+    url = reverse("api:signals-leaderboard")
+    vrp, skew, other_vrp = make_signal("AAPL", "VRP"), make_signal("MSFT", "SKEW"), make_signal("MSFT", "VRP")
+    created = []
+    with django_capture_on_commit_callbacks(execute=True):
+        for signal, pnl in ((vrp, 100.0), (skew, -20.0), (other_vrp, 50.0)):
+            response = authenticated_api_client.post(
+                interactions_url,
+                {"user": user.id, "signal": signal.id, "status": "taken", "pnl": pnl},
+                format="json",
+            )
+            created.append(response.data["id"])
+
+    results = authenticated_api_client.get(url).data["results"]
+    assert [(row["name"], row["total_trades"], row["avg_pnl"]) for row in results] == [
+        ("VRP", 2, 75.0),
+        ("SKEW", 1, -20.0),
+    ]
+    by_ticker = authenticated_api_client.get(url, {"by": "ticker", "order": "trades"}).data["results"]
+    assert [(row["name"], row["total_trades"]) for row in by_ticker] == [("MSFT", 2), ("AAPL", 1)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            reverse("api:userinteractions-detail", args=[created[0]]), {"status": "passed"}, format="json"
+        )
+        authenticated_api_client.delete(reverse("api:userinteractions-detail", args=[created[1]]))
+
+    results = authenticated_api_client.get(url).data["results"]
+    assert [(row["name"], row["total_trades"], row["avg_pnl"]) for row in results] == [("VRP", 1, 50.0)]
+
+
+@pytest.mark.django_db
+def test_leaderboard_follows_signal_writes(
+    authenticated_api_client, user, redis_leaderboard, django_capture_on_commit_callbacks
+):
+    url = reverse("api:signals-leaderboard")
+    vrp, other_vrp = make_signal("AAPL", "VRP"), make_signal("MSFT", "VRP")
+    other_user = User.objects.create_user(email="other@email.com", username="other")
+    UserInteraction.objects.create(user=user, signal=vrp, status="taken", pnl=100.0)
+    UserInteraction.objects.create(user=other_user, signal=vrp, status="taken")
+    UserInteraction.objects.create(user=user, signal=other_vrp, status="taken", pnl=50.0)
+    leaderboard.rebuild()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_api_client.patch(
+            reverse("api:signals-detail", args=[vrp.id]), {"strategy": "SKEW"}, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    results = authenticated_api_client.get(url, {"order": "trades"}).data["results"]
+    assert [(row["name"], row["total_trades"], row["avg_pnl"]) for row in results] == [
+        ("SKEW", 2, 100.0),
+        ("VRP", 1, 50.0),
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_api_client.delete(reverse("api:signals-detail", args=[vrp.id]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    results = authenticated_api_client.get(url, {"order": "trades"}).data["results"]
+    assert [(row["name"], row["total_trades"], row["avg_pnl"]) for row in results] == [("VRP", 1, 50.0)]
+    by_ticker = authenticated_api_client.get(url, {"by": "ticker"}).data["results"]
+    assert [row["name"] for row in by_ticker] == ["MSFT"]
+
+
+@pytest.mark.django_db
+def test_rebuild_leaderboard(authenticated_api_client, user, redis_leaderboard):
+    UserInteraction.objects.create(user=user, signal=make_signal("AAPL", "VRP"), status="taken", pnl=10.0)
+    UserInteraction.objects.create(user=user, signal=make_signal("AAPL", "TERM"), status="taken")
+    UserInteraction.objects.create(user=user, signal=make_signal("MSFT", "VRP"), status="watching", pnl=5.0)
+    out = StringIO()
+
+    call_command("rebuild_leaderboard", stdout=out)
+
+    assert "strategy=2, ticker=1" in out.getvalue()
+    response = authenticated_api_client.get(reverse("api:signals-leaderboard"), {"order": "trades"})
+    assert {row["name"]: (row["total_trades"], row["avg_pnl"]) for row in response.data["results"]} == {
+        "VRP": (1, 10.0),
+        "TERM": (1, None),
+    }
+
+
+@pytest.mark.django_db
+def test_leaderboard_without_redis(authenticated_api_client):
+    url = reverse("api:signals-leaderboard")
+    assert authenticated_api_client.get(url).status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert authenticated_api_client.get(url, {"by": "user"}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+def rollup_rows(ticker, resolution):
+    def rounded(value):
+        if isinstance(value, dict):
+            return {key: rounded(item) for key, item in value.items()}
+        return round(value, 9) if isinstance(value, float) else value
+
+    return [
+        rounded(rollup.as_dict())
+        for rollup in MarketDataRollup.objects.filter(ticker=ticker, resolution=resolution).order_by("bucket_start")
+    ]
+
+
+@pytest.mark.django_db
+def test_marketdata_rollups_incremental_matches_rebuild(django_capture_on_commit_callbacks):
+    base = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    # (seconds after base, implied vol); the last batch arrives out of order
+    batches = [[(0, 0.20), (20, 0.25)], [(40, 0.15), (70, 0.30)], [(3700, 0.22), (10, 0.40)]]
+    for batch in batches:
+        rows = MarketData.objects.bulk_create(
+            MarketData(ticker="AAPL", implied_volatility=iv, historical_volatility=0.2, skew=0.1)
+            for _, iv in batch
+        )
+        for row, (offset, _) in zip(rows, batch):
+            row.created_at = base + timedelta(seconds=offset)
+            MarketData.objects.filter(pk=row.pk).update(created_at=row.created_at)
+        with transaction.atomic():
+            MarketDataRollup.objects.update_from(rows)
+
+    minutes = rollup_rows("AAPL", MarketDataRollup.MINUTE)
+    assert [row["count"] for row in minutes] == [4, 1, 1]
+    assert minutes[0]["implied_volatility"] == {
+        "open": 0.20, "high": 0.40, "low": 0.15, "close": 0.15, "mean": 0.25,
+    }
+    assert [row["count"] for row in rollup_rows("AAPL", MarketDataRollup.HOUR)] == [5, 1]
+    day = rollup_rows("AAPL", MarketDataRollup.DAY)
+    assert day[0]["implied_volatility"]["close"] == 0.22
+
+    incremental = {resolution: rollup_rows("AAPL", resolution) for resolution in MarketDataRollup.RESOLUTIONS}
+    call_command("rebuild_marketdata_rollups", stdout=StringIO())
+    for resolution, rows in incremental.items():
+        assert rollup_rows("AAPL", resolution) == rows
+
+
+def backdated_market_data(ticker, timestamps):
+    rows = MarketData.objects.bulk_create(
+        MarketData(ticker=ticker, implied_volatility=0.2 + i / 100, historical_volatility=0.2, skew=0.1)
+        for i in range(len(timestamps))
+    )
+    for row, timestamp in zip(rows, timestamps):
+        row.created_at = timestamp
+        MarketData.objects.filter(pk=row.pk).update(created_at=timestamp)
+    return rows
+
+
+@pytest.mark.django_db
+def test_marketdata_rollups_merge_into_stored_buckets(django_assert_num_queries):
+    base = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    first, second, earlier = backdated_market_data(
+        "AAPL", [base + timedelta(seconds=5), base + timedelta(seconds=10), base]
+    )
+    # a bucket left empty by an interrupted ingest is filled like a new one
+    MarketDataRollup.objects.create(ticker="MSFT", resolution=MarketDataRollup.MINUTE, bucket_start=base)
+    [msft] = backdated_market_data("MSFT", [base])
+    MarketDataRollup.objects.update_from([first])
+
+    # one upsert per batch, however many buckets it touches
+    with django_assert_num_queries(1):
+        MarketDataRollup.objects.update_from([second, earlier, msft])
+
+    for resolution in MarketDataRollup.RESOLUTIONS:
+        [row] = rollup_rows("AAPL", resolution)
+        assert row["count"] == 3
+        assert row["implied_volatility"] == {
+            "open": pytest.approx(0.22), "high": pytest.approx(0.22), "low": pytest.approx(0.2),
+            "close": pytest.approx(0.21), "mean": pytest.approx(0.21),
+        }
+    [row] = rollup_rows("MSFT", MarketDataRollup.MINUTE)
+    assert row["count"] == 1
+    assert row["implied_volatility"]["open"] == row["implied_volatility"]["low"] == pytest.approx(0.2)
+
+
+@pytest.mark.django_db
+def test_marketdata_rollup_backfill_migration():
+    base = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0) - timedelta(days=2)
+    backdated_market_data("AAPL", [base + timedelta(minutes=m) for m in (0, 0.5, 1, 90, 60 * 24)])
+    backdated_market_data("MSFT", [base, base + timedelta(hours=3)])
+    call_command("rebuild_marketdata_rollups", stdout=StringIO())
+    expected = {
+        (ticker, resolution): rollup_rows(ticker, resolution)
+        for ticker in ("AAPL", "MSFT")
+        for resolution in MarketDataRollup.RESOLUTIONS
+    }
+    MarketDataRollup.objects.all().delete()
+
+    migration = importlib.import_module("apps.signals.migrations.0012_backfill_marketdatarollups")
+    schema_editor = mock.Mock(connection=connection)
+    migration.backfill(apps, schema_editor)
+    migration.backfill(apps, schema_editor)
+
+    for (ticker, resolution), rows in expected.items():
+        assert rollup_rows(ticker, resolution) == rows
+
+
+@pytest.mark.django_db
+def test_marketdata_history_keeps_newest_buckets(authenticated_api_client):
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    backdated_market_data("AAPL", [today - timedelta(days=days, hours=-1) for days in (3, 2, 1)])
+    call_command("rebuild_marketdata_rollups", stdout=StringIO())
+
+    response = authenticated_api_client.get(
+        reverse("api:marketdata-history"),
+        {"ticker": "AAPL", "start": (today - timedelta(days=10)).isoformat(), "end": today.isoformat(), "points": 2},
+    )
+
+    assert response.data["resolution"] == MarketDataRollup.DAY
+    assert [row["bucket_start"] for row in response.data["results"]] == [
+        today - timedelta(days=2),
+        today - timedelta(days=1),
+    ]
+
+
+@pytest.mark.django_db
+def test_marketdata_history_picks_resolution_for_budget(authenticated_api_client):
+    authenticated_api_client.post(
+        reverse("api:marketdata-bulk"),
+        [{"ticker": "AAPL", "implied_volatility": 0.2, "historical_volatility": 0.18, "skew": 0.05}] * 3,
+        format="json",
+    )
+    url = reverse("api:marketdata-history")
+    end = timezone.now() + timedelta(minutes=1)
+
+    hourly = authenticated_api_client.get(
+        url, {"ticker": "AAPL", "start": (end - timedelta(days=2)).isoformat(), "end": end.isoformat(), "points": 100}
+    ).data
+    assert hourly["resolution"] == MarketDataRollup.HOUR
+    assert [row["count"] for row in hourly["results"]] == [3]
+
+    minute = authenticated_api_client.get(
+        url, {"ticker": "AAPL", "start": (end - timedelta(hours=1)).isoformat(), "end": end.isoformat(), "points": 100}
+    ).data
+    assert minute["resolution"] == MarketDataRollup.MINUTE
+
+    daily = authenticated_api_client.get(url, {"ticker": "AAPL", "points": 5}).data
+    assert daily["resolution"] == MarketDataRollup.DAY
+    assert daily["results"][0]["implied_volatility"]["mean"] == pytest.approx(0.2)
+
+    assert authenticated_api_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_async_signal_list_and_detail(token_api_client, signal, django_assert_num_queries):
+    response = token_api_client.get(reverse("api:async-signals-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 1
+    assert response.json()["results"] == [as_json(SignalSerializer(signal).data)]
+    # the user and the page both come from cache now
+    with django_assert_num_queries(0):
+        assert token_api_client.get(reverse("api:async-signals-list")).json() == response.json()
+
+    url = reverse("api:async-signals-detail", args=[signal.id])
+    assert token_api_client.get(url).json() == as_json(SignalSerializer(signal).data)
+    with django_assert_num_queries(0):
+        response = token_api_client.get(url)
+    assert response.json()["id"] == str(signal.id)
+
+
+@pytest.mark.django_db
+def test_async_signal_detail_sees_sync_writes(
+    authenticated_api_client, token_api_client, signal, django_capture_on_commit_callbacks
+):
+    url = reverse("api:async-signals-detail", args=[signal.id])
+    assert token_api_client.get(url).json()["confidence"] == 90
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(reverse("api:signals-detail", args=[signal.id]), {"confidence": 50}, format="json")
+    assert token_api_client.get(url).json()["confidence"] == 50
+
+
+@pytest.mark.django_db
+def test_async_marketdata_pages(token_api_client):
+    MarketData.objects.bulk_create(
+        MarketData(ticker="AAPL", implied_volatility=0.2 + i / 100, historical_volatility=0.18, skew=0.1)
+        for i in range(5)
+    )
+    expected = list(MarketData.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    response = token_api_client.get(reverse("api:async-marketdata-list"), {"page_size": 3, "count": "false"})
+    assert "count" not in response.json()
+    first = response.json()
+    second = token_api_client.get(first["next"]).json()
+    assert [row["id"] for row in first["results"] + second["results"]] == [str(pk) for pk in expected]
+    assert second["next"] is None
+
+    detail = token_api_client.get(reverse("api:async-marketdata-detail", args=[expected[0]]))
+    assert detail.json()["id"] == str(expected[0])
+
+
+@pytest.mark.django_db
+def test_async_views_errors(api_client, token_api_client, user):
+    url = reverse("api:async-signals-list")
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"].startswith("Bearer")
+
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+    assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    assert token_api_client.get(url, {"cursor": "garbage"}).status_code == status.HTTP_404_NOT_FOUND
+    assert token_api_client.post(url).status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    missing = reverse("api:async-signals-detail", args=["00000000-0000-0000-0000-000000000000"])
+    assert token_api_client.get(missing).status_code == status.HTTP_404_NOT_FOUND
+
+
+def signal_payload(ticker, strategy="VRP"):
+    return {
+        "ticker": ticker,
+        "strategy": strategy,
+        "vrp_zscore": 2.5,
+        "vrp_ratio": 1.1,
+        "expected_return": 0.03,
+        "confidence": 70,
+        "in_lab": False,
+        "expires_at": "2030-01-01T00:00:00Z",
+    }
+
+
+def sse_events(chunk):
+    """Parse the ``event: signal`` messages in a chunk of an event stream."""
+    events = []
+    for message in chunk.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if not line.startswith(":"))
+        if fields.get("event") == "signal":
+            events.append((fields["id"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.django_db
+def test_signal_stream_pushes_created_signals(
+    authenticated_api_client, user, django_capture_on_commit_callbacks
+):
+    headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+    def create_signals():
+        with django_capture_on_commit_callbacks(execute=True):
+            for ticker in ("MSFT", "AAPL"):
+                response = authenticated_api_client.post(
+                    reverse("api:signals-list"), signal_payload(ticker), format="json"
+                )
+                assert response.status_code == status.HTTP_201_CREATED
+        return response.data
+
+    async def main():
+        response = await AsyncClient().get(
+            reverse("api:async-signals-stream"), {"ticker": "AAPL"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        stream = aiter(response.streaming_content)
+        assert await anext(stream) == b"retry: 3000\n\n"
+
+        created = await sync_to_async(create_signals)()
+        [(event_id, data)] = sse_events(await anext(stream))
+        assert data == as_json(created)
+        await stream.aclose()
+        return event_id
+
+    event_id = async_to_sync(main)()
+    assert signal_events.publish({"ticker": "AAPL", "strategy": "SKEW", "id": "later"}) is not None
+
+    async def resume():
+        response = await AsyncClient().get(
+            reverse("api:async-signals-stream"),
+            {"strategy": "SKEW"},
+            headers={**headers, "Last-Event-ID": event_id},
+        )
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        [(_, data)] = sse_events(await anext(stream))
+        await stream.aclose()
+        return data
+
+    assert async_to_sync(resume)()["id"] == "later"
+
+
+@pytest.fixture
+def redis_backed_events(redis_default_cache, monkeypatch):
+    """Back the default cache, and the async clients built from it, with one fake Redis server."""
+    server = redis_default_cache.client.get_client().connection_pool.connection_kwargs["server"]
+    monkeypatch.setattr(redis.asyncio, "from_url", lambda url: fakeredis.FakeAsyncRedis(server=server))
+    return redis_default_cache
+
+
+def test_signal_events_go_through_redis(redis_backed_events):
+    first = signal_events.publish({"ticker": "AAPL", "n": 1})
+
+    async def main():
+        async with signal_events.subscribe(last_event_id=first) as events:
+            second = await asyncio.to_thread(signal_events.publish, {"ticker": "AAPL", "n": 2})
+            assert await asyncio.wait_for(anext(events), 5) == (second, {"ticker": "AAPL", "n": 2})
+        await signal_events.aremote.close()
+
+    asyncio.run(main())
+    assert "-" in first
+    assert redis_backed_events.client.get_client().xlen("broadcast:signals:stream") == 2
+
+
+def test_market_ticks_go_through_redis(redis_backed_events):
+    server = redis_backed_events.client.get_client().connection_pool.connection_kwargs["server"]
+
+    async def main():
+        async with market_ticks.subscribe(["AAPL"]) as mailbox:
+            # a publisher in another process reaches this one only through Redis
+            other = fakeredis.FakeAsyncRedis(server=server)
+            await other.publish("fanout:marketdata", 'AAPL\t{"iv": 0.2}')
+            assert await asyncio.wait_for(mailbox.get(), 5) == {"AAPL": '{"iv": 0.2}'}
+            assert await asyncio.to_thread(market_ticks.publish, {"AAPL": 1, "MSFT": 2})
+            assert await asyncio.wait_for(mailbox.get(), 5) == {"AAPL": "1"}
+            await other.aclose()
+        await market_ticks.aremote.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.django_db
+def test_signal_stream_rejects_invalid_last_event_id(token_api_client):
+    response = token_api_client.get(reverse("api:async-signals-stream"), HTTP_LAST_EVENT_ID="nope")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class SocketClient:
+    """Drive the ASGI WebSocket routes in process."""
+
+    def __init__(self, path, query=""):
+        from config.asgi import application
+
+        self.inbox, self.outbox = asyncio.Queue(), asyncio.Queue()
+        scope = {"type": "websocket", "path": path, "query_string": query.encode(), "headers": []}
+        self.task = asyncio.ensure_future(application(scope, self.inbox.get, self.outbox.put))
+
+    async def connect(self):
+        await self.inbox.put({"type": "websocket.connect"})
+        return await self.receive()
+
+    async def receive(self):
+        return await asyncio.wait_for(self.outbox.get(), 5)
+
+    async def receive_json(self):
+        return json.loads((await self.receive())["text"])
+
+    async def send_json(self, data):
+        await self.inbox.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def disconnect(self):
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.mark.django_db
+def test_marketdata_socket_pushes_followed_tickers(
+    authenticated_api_client, user, django_capture_on_commit_callbacks
+):
+    token = RefreshToken.for_user(user).access_token
+
+    def ingest(*rows):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_api_client.post(
+                reverse("api:marketdata-bulk"),
+                [{"ticker": ticker, "implied_volatility": iv, "historical_volatility": 0.2, "skew": 0.1} for ticker, iv in rows],
+                format="json",
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+    async def main():
+        socket = SocketClient("/ws/marketdata/", f"token={token}&tickers=AAPL")
+        assert (await socket.connect())["type"] == "websocket.accept"
+        assert await socket.receive_json() == {"type": "subscribed", "tickers": ["AAPL"]}
+
+        await sync_to_async(ingest)(("MSFT", 0.3), ("AAPL", 0.25))
+        frame = await socket.receive_json()
+        assert [(tick["ticker"], tick["implied_volatility"]) for tick in frame["ticks"]] == [("AAPL", 0.25)]
+
+        await socket.send_json({"action": "subscribe", "tickers": ["MSFT"]})
+        assert await socket.receive_json() == {"type": "subscribed", "tickers": ["AAPL", "MSFT"]}
+        await sync_to_async(ingest)(("MSFT", 0.31), ("MSFT", 0.32), ("TSLA", 0.5))
+        frame = await socket.receive_json()
+        assert [(tick["ticker"], tick["implied_volatility"]) for tick in frame["ticks"]] == [("MSFT", 0.32)]
+
+        await socket.send_json({"action": "subscribe", "tickers": "MSFT"})
+        assert (await socket.receive_json())["type"] == "error"
+        await socket.disconnect()
+
+    async_to_sync(main)()
+
+
+@pytest.mark.django_db
+def test_marketdata_socket_requires_token():
+    async def main():
+        socket = SocketClient("/ws/marketdata/", "token=not-a-token")
+        assert await socket.connect() == {"type": "websocket.close", "code": 4401}
+        await asyncio.wait_for(socket.task, 5)
+
+    async_to_sync(main)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_skip_atomic_requests_and_writes_keep_it(authenticated_api_client, signal):
+    in_atomic_block = []
+
+    def record(method):
+        def wrapper(view, request, *args, **kwargs):
+            in_atomic_block.append((request.method, connection.in_atomic_block))
+            return method(view, request, *args, **kwargs)
+
+        return wrapper
+
+    url = reverse("api:signals-detail", args=[signal.id])
+    with mock.patch.object(SignalViewSet, "retrieve", record(SignalViewSet.retrieve)), mock.patch.object(
+        SignalViewSet, "partial_update", record(SignalViewSet.partial_update)
+    ):
+        assert authenticated_api_client.get(url).status_code == status.HTTP_200_OK
+        assert authenticated_api_client.patch(url, {"confidence": 10}, format="json").status_code == status.HTTP_200_OK
+    assert in_atomic_block == [("GET", False), ("PATCH", True)]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_safe_requests_read_from_replica(settings, authenticated_api_client):
+    settings.REPLICA_DATABASES = ["replica"]
+    MarketData.objects.using("replica").create(
+        ticker="REPL", implied_volatility=0.2, historical_volatility=0.18, skew=0.1
+    )
+    signal = Signal.objects.create(
+        ticker="PRIM",
+        strategy="VRP",
+        vrp_zscore=1.2,
+        vrp_ratio=0.8,
+        expected_return=0.05,
+        confidence=90,
+        expires_at="2030-01-01T00:00:00Z",
+    )
+
+    url = reverse("api:marketdata-list")
+    assert [row["ticker"] for row in authenticated_api_client.get(url).data["results"]] == ["REPL"]
+    response = authenticated_api_client.post(
+        url, {"ticker": "NEW", "implied_volatility": 0.3, "historical_volatility": 0.2, "skew": 0.1}, format="json"
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert MarketData.objects.get().ticker == "NEW"
+
+    # cached signal payloads are filled from the primary
+    response = authenticated_api_client.get(reverse("api:signals-detail", args=[signal.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["ticker"] == "PRIM"
+
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_market_data_export_streams_from_replica(settings, authenticated_api_client):
+    settings.REPLICA_DATABASES = ["replica"]
+    MarketData.objects.using("replica").create(
+        ticker="REPL", implied_volatility=0.2, historical_volatility=0.18, skew=0.1
+    )
+    MarketData.objects.create(ticker="REPL", implied_volatility=0.3, historical_volatility=0.2, skew=0.1)
+
+    response = authenticated_api_client.get(reverse("api:marketdata-export"), {"ticker": "REPL"})
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["implied_volatility"] for line in lines] == [0.2]
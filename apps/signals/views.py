@@ -1,83 +1,388 @@
+import uuid
+from datetime import timedelta
+
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import JSONParser
+from django.conf import settings
 from django.db import transaction
-from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from .models import (
     MarketData, 
+    MarketDataRollup,
     Signal, 
-    UserInteraction
+    SignalPerformance,
+    TickerRollingStats,
+    UserInteraction,
+    bucket_start,
 )
 from .serializers import (
     MarketDataSerializer, 
     SignalSerializer, 
     UserInteractionSerializer
 )
-from ..common.paginations import DefaultPagination
+from .analytics import load_trades, portfolio_metrics
+from .caching import (
+    cache_signal,
+    invalidate_portfolios,
+    invalidate_signals,
+    portfolio_cache_key,
+    signal_cache,
+    signal_cache_key,
+    signal_list_cache_key,
+    start_signal_version,
+)
+from .events import publish_created_signal
+from .exports import EXPORT_FIELDS, EXPORT_FORMATS
+from .leaderboard import DIMENSIONS, ORDERINGS, leaderboard
+from .ingest import ingest_market_data, market_data_created, validate_snapshots
+from ..common.cache import get_or_compute
+from ..common.paginations import DefaultPagination, KeysetPagination
+from ..common.parsers import NDJSONParser
+from ..common.db_routers import primary_reads
+from ..common.views import NonAtomicReadsMixin, ReplicaReadsMixin
 from ..common.utils import CustomOrderingFilter
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
 
-CACHE_TIMEOUT = 60 * 15  # Cache for 15 minutes
+def datetime_param(request, param):
+    """Parse an optional ISO 8601 query parameter into an aware datetime."""
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValidationError({param: "Enter a valid ISO 8601 datetime."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
 
-class MarketDataViewSet(viewsets.ModelViewSet):
+class MarketDataViewSet(ReplicaReadsMixin, NonAtomicReadsMixin, viewsets.ModelViewSet):
     queryset = MarketData.objects.all()
     serializer_class = MarketDataSerializer
     pagination_class = DefaultPagination
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save()
+        market_data = serializer.save()
+        market_data_created([market_data])
+
+    @action(detail=False, methods=["get"])
+    def vrp_zscore(self, request):
+        """Return the ticker's rolling-window VRP ratio statistics and the z-score of its latest value."""
+        ticker = request.query_params.get("ticker")
+        if not ticker:
+            raise ValidationError({"ticker": "This query parameter is required."})
+
+        stats = TickerRollingStats.objects.filter(ticker=ticker).first()
+        if stats is None:
+            return Response({"detail": "No statistics for this ticker."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            {
+                "ticker": stats.ticker,
+                "count": stats.count,
+                "mean": stats.mean,
+                "stddev": stats.stddev,
+                "last_value": stats.last_value,
+                "last_timestamp": stats.last_timestamp,
+                "vrp_zscore": stats.vrp_zscore,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Ingest a JSON array or NDJSON stream of snapshots. Valid rows are
+        inserted in ``batch_size`` chunks; invalid rows are reported by index.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError({"detail": "Expected a list of market data snapshots."})
+
+        try:
+            batch_size = int(request.query_params.get("batch_size", settings.MARKETDATA_BULK_BATCH_SIZE))
+        except ValueError:
+            raise ValidationError({"batch_size": "A valid integer is required."})
+        batch_size = max(1, min(batch_size, settings.MARKETDATA_BULK_MAX_BATCH_SIZE))
+
+        instances, errors = validate_snapshots(rows)
+        created = ingest_market_data(instances, batch_size)
+
+        response_status = status.HTTP_201_CREATED if created or not errors else status.HTTP_400_BAD_REQUEST
+        return Response({"created": len(created), "errors": errors}, status=response_status)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Stream a ticker's history as NDJSON (default) or CSV, oldest first.
+        Query params: ``ticker`` (required), ``start``/``end`` (ISO 8601) and
+        ``output`` (``ndjson`` or ``csv``).
+        """
+        ticker = request.query_params.get("ticker")
+        if not ticker:
+            raise ValidationError({"ticker": "This query parameter is required."})
+
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+
+        queryset = MarketData.objects.filter(ticker=ticker)
+        for param, lookup in (("start", "created_at__gte"), ("end", "created_at__lt")):
+            if moment := datetime_param(request, param):
+                queryset = queryset.filter(**{lookup: moment})
 
+        # the rows are read after dispatch has left replica_reads(), so pin the alias now
+        rows = (
+            queryset.using(queryset.db)
+            .order_by("created_at")
+            .values_list(*EXPORT_FIELDS)
+            .iterator(chunk_size=settings.MARKETDATA_EXPORT_CHUNK_SIZE)
+        )
+        stream, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(stream(rows), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{ticker}.{output}"'
+        return response
 
-class SignalViewSet(viewsets.ModelViewSet):
-    queryset = Signal.objects.all().prefetch_related("userinteractions")
+
+    @action(detail=False, methods=["get"])
+    def history(self, request):
+        """
+        OHLC/mean rollups of a ticker's history for charting. Query params:
+        ``ticker`` (required), ``start``/``end`` (ISO 8601, default the last 30
+        days) and ``points``, the most buckets the client wants. The finest
+        resolution whose bucket count over the range fits ``points`` is used,
+        falling back to daily buckets.
+        """
+        ticker = request.query_params.get("ticker")
+        if not ticker:
+            raise ValidationError({"ticker": "This query parameter is required."})
+
+        end = datetime_param(request, "end") or timezone.now()
+        start = datetime_param(request, "start") or end - timedelta(days=30)
+        if start >= end:
+            raise ValidationError({"start": "Must be before end."})
+
+        try:
+            points = int(request.query_params.get("points", settings.MARKETDATA_HISTORY_DEFAULT_POINTS))
+        except ValueError:
+            raise ValidationError({"points": "Must be an integer."})
+        points = max(1, min(points, settings.MARKETDATA_HISTORY_MAX_POINTS))
+
+        resolution = next(
+            (
+                resolution
+                for resolution in MarketDataRollup.RESOLUTIONS
+                if (end - start) / MarketDataRollup.BUCKET_WIDTHS[resolution] <= points
+            ),
+            MarketDataRollup.DAY,
+        )
+        # the newest ``points`` buckets, returned oldest first
+        rollups = list(MarketDataRollup.objects.filter(
+            ticker=ticker,
+            resolution=resolution,
+            bucket_start__gte=bucket_start(start, resolution),
+            bucket_start__lt=end,
+        ).order_by("-bucket_start")[:points])
+        rollups.reverse()
+        return Response(
+            {
+                "ticker": ticker,
+                "resolution": resolution,
+                "results": [rollup.as_dict() for rollup in rollups],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class SignalViewSet(ReplicaReadsMixin, NonAtomicReadsMixin, viewsets.ModelViewSet):
+    queryset = Signal.objects.with_performance()
     serializer_class = SignalSerializer
     pagination_class = DefaultPagination
     filter_backends = [CustomOrderingFilter]
 
+    def list(self, request, *args, **kwargs):
+        """
+        Serve list pages from cache, keyed on the normalized query string.
+        Cold keys are computed by a single request under a lock, from the
+        primary so a lagging replica can't cache a stale page under a new version.
+        """
+
+        def compute():
+            with primary_reads():
+                return super(SignalViewSet, self).list(request, *args, **kwargs).data
+
+        data = get_or_compute(
+            signal_list_cache_key(request, self.paginator), compute, settings.SIGNAL_LIST_CACHE_TIMEOUT
+        )
+        return Response(data, status=status.HTTP_200_OK)
 
     def retrieve(self, request, *args, **kwargs):
         """
         Override retrieve to add caching for individual Signal instances.
         """
-        instance = self.get_object()
-        cache_key = f"signal_{instance.id}"
-        cached_data = cache.get(cache_key)
+        signal_id = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        cache_key = signal_cache_key(signal_id)
+        cached_data = signal_cache.get(cache_key) if cache_key else None
 
         if cached_data:
             return Response(cached_data, status=status.HTTP_200_OK)
         
-        serializer = self.get_serializer(instance)
-        cache.set(cache_key, serializer.data, CACHE_TIMEOUT)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # filled from the primary, like list pages
+        with primary_reads():
+            serializer = self.get_serializer(self.get_object())
+            data = serializer.data
+        if cache_key is None:
+            cache_key = start_signal_version(signal_id)
+        if cache_key is not None:
+            signal_cache.set(cache_key, data, settings.SIGNAL_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
 
     @transaction.atomic
     def perform_create(self, serializer):
         signal = serializer.save()
-        cache_key = f"signal_{signal.id}"
-        cache.set(cache_key, serializer.data, CACHE_TIMEOUT)
+        SignalPerformance.objects.start([signal])
+        cache_signal(signal.id, serializer.data)
+        publish_created_signal(serializer.data)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        strategy, ticker = serializer.instance.strategy, serializer.instance.ticker
+        signal = serializer.save()
+        invalidate_signals(signal.id)
+        if (signal.strategy, signal.ticker) != (strategy, ticker):
+            # The taken interactions move to the new strategy and ticker.
+            members, totals = leaderboard.signal_contribution(signal)
+            leaderboard.record(({"strategy": strategy, "ticker": ticker}, totals), (members, totals))
+        if signal.strategy != strategy:
+            signal.userinteractions.update(strategy=signal.strategy)
+            invalidate_portfolios(*signal.userinteractions.values_list("user_id", flat=True).distinct())
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        signal_id = instance.id
+        traders = list(instance.userinteractions.values_list("user_id", flat=True).distinct())
+        ranked_before = leaderboard.signal_contribution(instance)
+        instance.delete()
+        leaderboard.record(before=ranked_before)
+        invalidate_signals(signal_id)
+        invalidate_portfolios(*traders)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """Hit/miss counters of the in-process and shared signal cache tiers for this worker."""
+        return Response(signal_cache.stats(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def leaderboard(self, request):
+        """
+        Top strategies or tickers (``?by=``) ranked by ``?order=avg_pnl|trades``
+        over taken interactions, served from the Redis leaderboard.
+        """
+        by = request.query_params.get("by", "strategy")
+        order = request.query_params.get("order", "avg_pnl")
+        if by not in DIMENSIONS:
+            raise ValidationError({"by": f"Must be one of: {', '.join(DIMENSIONS)}."})
+        if order not in ORDERINGS:
+            raise ValidationError({"order": f"Must be one of: {', '.join(ORDERINGS)}."})
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), settings.LEADERBOARD_MAX_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+
+        results = leaderboard.top(by, order=order, limit=limit)
+        if results is None:
+            return Response({"detail": "Leaderboard unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"by": by, "order": order, "results": results}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["get"])
     def performance(self, request, pk=None):
         signal = self.get_object()
-        performance_data = signal.calculate_performance()
+        performance_data = signal.calculate_performance
         return Response(performance_data, status=status.HTTP_200_OK)
 
 
-class UserInteractionViewSet(viewsets.ModelViewSet):
+class UserInteractionViewSet(ReplicaReadsMixin, NonAtomicReadsMixin, viewsets.ModelViewSet):
     queryset = UserInteraction.objects.all().select_related("user", "signal")
     serializer_class = UserInteractionSerializer
     pagination_class = DefaultPagination
     filter_backends = [CustomOrderingFilter]
     permission_classes = [AllowAny]
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save()
+        interaction = serializer.save()
+        SignalPerformance.objects.record(after=interaction.performance_contribution())
+        leaderboard.record(after=leaderboard.contribution(interaction))
+        invalidate_signals(interaction.signal_id)
+        invalidate_portfolios(interaction.user_id)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        before = serializer.instance.performance_contribution()
+        ranked_before = leaderboard.contribution(serializer.instance)
+        user_before = serializer.instance.user_id
+        interaction = serializer.save()
+        SignalPerformance.objects.record(before, interaction.performance_contribution())
+        leaderboard.record(ranked_before, leaderboard.contribution(interaction))
+        invalidate_signals(before[0], interaction.signal_id)
+        invalidate_portfolios(user_before, interaction.user_id)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        before = instance.performance_contribution()
+        ranked_before = leaderboard.contribution(instance)
+        instance.delete()
+        SignalPerformance.objects.record(before=before)
+        leaderboard.record(before=ranked_before)
+        invalidate_signals(instance.signal_id)
+        invalidate_portfolios(instance.user_id)
 
     @action(detail=True, methods=["get"])
     def user_signals(self, request, pk=None):
-        interactions = self.queryset.filter(user_id=pk)
-        serializer = self.get_serializer(interactions, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        The user's interactions, newest first, keyset paginated. ``?fields=``
+        limits both the emitted fields and the columns loaded.
+        """
+        try:
+            user_id = uuid.UUID(pk)
+        except ValueError:
+            raise NotFound()
+        fields = UserInteractionSerializer.parse_fields(request)
+        # the keyset paginator orders and seeks on (created_at, id)
+        columns = {"id", "created_at", *UserInteractionSerializer.model_fields(fields)}
+        interactions = UserInteraction.objects.filter(user_id=user_id).only(*columns)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(interactions, request, view=self)
+        serializer = self.get_serializer(page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
+    def portfolio(self, request, pk=None):
+        """
+        Portfolio analytics over the user's taken interactions, overall and per
+        strategy. Only the user and staff may see them. Cached until one of the
+        user's interactions changes.
+        """
+        try:
+            user_id = uuid.UUID(pk)
+        except ValueError:
+            raise NotFound()
+        if user_id != request.user.id and not request.user.is_staff:
+            raise PermissionDenied("You can only view your own portfolio.")
+
+        cache_key = portfolio_cache_key(user_id)
+        data = signal_cache.get(cache_key)
+        if data is None:
+            with primary_reads():
+                data = portfolio_metrics(*load_trades(user_id))
+            signal_cache.set(cache_key, data, settings.PORTFOLIO_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..common.cache import AsyncCache
+
+
+# The user state every authenticated request needs; anything else is loaded lazily.
+AUTH_USER_FIELDS = ("id", "is_active", "is_verified", "is_staff", "deleted")
+
+auth_user_cache = AsyncCache()
+
+
+def auth_user_cache_key(user_id):
+    return f"auth_user_{user_id}"
+
+
+def get_auth_user_values(user_id):
+    return cache.get(auth_user_cache_key(user_id))
+
+
+def set_auth_user_values(user_id, values):
+    cache.set(auth_user_cache_key(user_id), values, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+async def aget_auth_user_values(user_id):
+    return await auth_user_cache.get(auth_user_cache_key(user_id))
+
+
+async def aset_auth_user_values(user_id, values):
+    await auth_user_cache.set(auth_user_cache_key(user_id), values, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def invalidate_auth_user(user_id):
+    """
+    Drop the cached auth state now and again once the write commits, so a
+    request that re-reads the row before the commit can't keep it stale.
+    """
+    key = auth_user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
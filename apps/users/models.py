@@ -9,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 
 from ..common import models as base_models
 from ..common.validators import email_validator, username_validator
+from .caching import invalidate_auth_user
 
 
 class UserManager(BaseUserManager):
@@ -79,6 +80,16 @@ class User(AbstractBaseUser, PermissionsMixin, base_models.BaseModel):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_auth_user(self.pk)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_auth_user(user_id)
+        return result
+
     def get_full_name(self):
         return self.username
 
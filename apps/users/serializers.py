@@ -1,10 +1,9 @@
-import asyncio
 from django.contrib.auth import get_user_model
 from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from ..common.email import send_email
+from ..common.email_queue import enqueue_email
 from ..common.utils import OTPUtils
 from .models import Profile
 
@@ -86,14 +85,14 @@ class ForgotPasswordSerializer(serializers.Serializer):
         return attrs
 
     def create(self, validated_data: dict):
-        """Send an email with a code to reset the password"""
+        """Queue an email with a code to reset the password"""
         email = validated_data.get("email")
 
         try:
             if user := User.objects.filter(email=email).first():
                 code, token = OTPUtils.generate_otp(user)
                 subject = "Your Password Reset"
-                asyncio.run(send_email(subject, code, email, user.username))
+                enqueue_email(subject, code, email, user.username, expires_in=OTPUtils.remaining_life())
             else:
                 raise serializers.ValidationError("User with this email does not exist")
         except Exception as e:
@@ -1,9 +1,18 @@
+from datetime import timedelta
+from unittest import mock
+
 import pytest
+from django.contrib.auth.hashers import check_password
 from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls.base import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.common.authentication import CachedJWTAuthentication
+from apps.common.models import EmailJob
+from apps.common.utils import OTP_LIFE
 from apps.users.models import User
 
 
@@ -75,6 +84,42 @@ class TestAuthView:
         )
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {"non_field_errors": ["Incorrect password. Please try again."]}
+
+    def test_login_unknown_email(self, api_client: APIClient, test_password):
+        url = reverse("api:token-obtain")
+        response = api_client.post(
+            url, data={"email": "nobody@email.com", "password": test_password}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {"non_field_errors": ["No account found with this email address."]}
+
+    def test_login_unverified(self, api_client: APIClient, user: User, test_password):
+        User.objects.filter(pk=user.pk).update(is_verified=False)
+        url = reverse("api:token-obtain")
+        response = api_client.post(
+            url, data={"email": user.email, "password": test_password}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {"non_field_errors": ["User is not verified"]}
+
+    def test_login_single_lookup_and_hash(
+        self, api_client: APIClient, user: User, test_password, django_assert_num_queries
+    ):
+        url = reverse("api:token-obtain")
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as hasher, django_assert_num_queries(4):
+            # SAVEPOINT, user SELECT, last_login UPDATE, RELEASE
+            response = api_client.post(
+                url, data={"email": user.email, "password": test_password}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {"access", "refresh"} <= response.json().keys()
+        assert hasher.call_count == 1
 
     def test_signup(self, api_client: APIClient, test_password, test_email):
         url = reverse("api:signup")
@@ -123,6 +168,10 @@ class TestAuthView:
 
         assert resp.status_code == status.HTTP_200_OK
         assert "token" in resp_data
+        job = EmailJob.objects.get()
+        assert job.recipient_email == user.email
+        assert job.status == EmailJob.PENDING
+        assert job.expires_at <= job.created_at + timedelta(seconds=OTP_LIFE)
 
     def test_forget_password_wrong_email(self, api_client, user):
         url = reverse("api:forget-password")
@@ -164,4 +213,45 @@ class TestAuthView:
         resp_data = resp.json()
 
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Invalid token" in resp_data
\ No newline at end of file
+        assert "Invalid token" in resp_data
+
+class TestCachedJWTAuthentication:
+    def users_queries(self, captured):
+        return [q for q in captured if 'FROM "users_user"' in q["sql"]]
+
+    def get_profiles(self, api_client, token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        return api_client.get(reverse("api:profile-list"))
+
+    def test_repeat_requests_skip_users_table(self, api_client, user, token):
+        with CaptureQueriesContext(connection) as first:
+            assert self.get_profiles(api_client, token).status_code == status.HTTP_200_OK
+        with CaptureQueriesContext(connection) as second:
+            assert self.get_profiles(api_client, token).status_code == status.HTTP_200_OK
+
+        assert len(self.users_queries(first.captured_queries)) == 1
+        assert self.users_queries(second.captured_queries) == []
+
+    def test_deactivate_invalidates_cache(
+        self, api_client, user, token, django_capture_on_commit_callbacks
+    ):
+        assert self.get_profiles(api_client, token).status_code == status.HTTP_200_OK
+        with django_capture_on_commit_callbacks(execute=True):
+            user.deactivate()
+
+        resp = self.get_profiles(api_client, token)
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+        assert resp.json()["code"] == "user_inactive"
+
+    def test_cached_user_saves_only_loaded_fields(self, user, token):
+        authenticator = CachedJWTAuthentication()
+        authenticator.get_user(authenticator.get_validated_token(token["access"]))
+        cached = authenticator.get_user(authenticator.get_validated_token(token["access"]))
+        assert cached.get_deferred_fields() >= {"email", "password"}
+
+        cached.is_staff = True
+        cached.save()
+
+        user.refresh_from_db()
+        assert user.is_staff
+        assert user.check_password("something-a-bit-serious")
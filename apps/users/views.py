@@ -21,6 +21,7 @@ from .serializers import (
     ProfileSerializer
 )
 from .models import Profile
+from ..common.views import NonAtomicReadsMixin
 
 User = get_user_model()
 
@@ -37,7 +38,7 @@ forget_password_schema = openapi.Schema(
 )
 
 
-class UserView(RetrieveModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
+class UserView(NonAtomicReadsMixin, RetrieveModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
     """
     User viewset
     """
@@ -59,7 +60,8 @@ class UserView(RetrieveModelMixin, UpdateModelMixin, ListModelMixin, GenericView
     @swagger_auto_schema(method="GET", responses={200: UserSerializer})
     @action(detail=False, methods=["GET"])
     def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
+        # request.user only carries the cached auth fields; load the full row once
+        serializer = UserSerializer(self.get_queryset().get(), context={"request": request})
         return Response(status=status.HTTP_200_OK, data=serializer.data)
 
 
@@ -131,7 +133,7 @@ class ChangePasswordView(CreateAPIView):
         )
 
 
-class ProfileView(ModelViewSet):
+class ProfileView(NonAtomicReadsMixin, ModelViewSet):
     queryset = Profile.objects.all().prefetch_related("user")
     serializer_class = ProfileSerializer
     parser_classes = (FormParser, MultiPartParser)
@@ -0,0 +1,98 @@
+"""
+Queries and latency per GET with and without the ``ATOMIC_REQUESTS``
+transaction, on the same viewsets. "atomic" re-enables the wrapping
+transaction that ``NonAtomicReadsMixin`` turns off for safe methods.
+
+Runs against real transactions (not the test case's savepoints), so the
+query counts include BEGIN and COMMIT. On a local SQLite file those are
+nearly free; against a networked database each is a round trip.
+
+    pytest benchmarks/bench_atomic_reads.py -s
+"""
+import time
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from rest_framework.test import APIClient
+
+from apps.signals.models import MarketData, Signal
+from apps.signals.views import MarketDataViewSet, SignalViewSet
+from apps.users.views import UserView
+
+REQUESTS = 300
+
+ENDPOINTS = {
+    "marketdata list": (MarketDataViewSet, {"get": "list"}, ""),
+    "signal list (cached)": (SignalViewSet, {"get": "list"}, ""),
+    "signal detail": (SignalViewSet, {"get": "retrieve"}, "<uuid:pk>/"),
+    "users me": (UserView, {"get": "me"}, ""),
+}
+
+
+def atomic(view):
+    """Undo the mixin's exemption so the handler wraps the view again."""
+    for alias in connections:
+        view._non_atomic_requests.discard(alias)
+    return view
+
+
+urlpatterns = [
+    path(f"{mode}/{index}/{suffix}", wrap(viewset.as_view(actions)))
+    for mode, wrap in (("atomic", atomic), ("plain", lambda view: view))
+    for index, (viewset, actions, suffix) in enumerate(ENDPOINTS.values())
+]
+
+
+@pytest.fixture
+def client(settings, django_user_model):
+    settings.ROOT_URLCONF = __name__
+    user = django_user_model.objects.create_user(email="bench@email.com", username="bench", password="x")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def measure(client, url):
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    # read them now: the next request resets the connection's query log
+    queries = [query["sql"].split()[0] for query in context.captured_queries]
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = client.get(url)
+    elapsed = (time.perf_counter() - start) / REQUESTS
+    assert response.status_code == 200, response.content
+    return queries, elapsed * 1e6
+
+
+@pytest.mark.django_db(transaction=True)
+def test_atomic_requests_overhead(client):
+    MarketData.objects.bulk_create(
+        MarketData(ticker="AAPL", implied_volatility=0.2, historical_volatility=0.18, skew=0.1) for _ in range(50)
+    )
+    signal = Signal.objects.create(
+        ticker="AAPL",
+        strategy="VRP",
+        vrp_zscore=1.2,
+        vrp_ratio=0.8,
+        expected_return=0.05,
+        confidence=90,
+        in_lab=True,
+        expires_at="2030-01-01T00:00:00Z",
+    )
+
+    print()
+    for index, (name, (_, _, suffix)) in enumerate(ENDPOINTS.items()):
+        suffix = suffix.replace("<uuid:pk>", str(signal.id))
+        before = measure(client, f"/atomic/{index}/{suffix}")
+        after = measure(client, f"/plain/{index}/{suffix}")
+        (queries_before, us_before), (queries_after, us_after) = before, after
+        print(
+            f"{name:<22} queries {len(queries_before)} -> {len(queries_after)}   "
+            f"{us_before:6.0f} us -> {us_after:6.0f} us per GET   "
+            f"({' '.join(queries_before)} -> {' '.join(queries_after)})"
+        )
+        assert len(queries_after) < len(queries_before)
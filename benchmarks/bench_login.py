@@ -0,0 +1,54 @@
+"""
+Logins per second on one core for the old authenticate()-based login path and
+the single-lookup path, using the production PBKDF2 hasher.
+
+    pytest benchmarks/bench_login.py -s
+"""
+import time
+
+import pytest
+from django.contrib.auth import authenticate, get_user_model
+from django.test import RequestFactory
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from apps.common.custom_auth import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+PASSWORD = "something-a-bit-serious"
+LOGINS = 10
+
+pytestmark = pytest.mark.django_db
+
+
+class AuthenticateTwiceSerializer(TokenObtainPairSerializer):
+    """The previous login path: get(), authenticate(), then the parent's authenticate()."""
+
+    def validate(self, attrs):
+        User.objects.get(email=attrs["email"])
+        self.user = authenticate(request=self.context["request"], email=attrs["email"], password=attrs["password"])
+        assert self.user is not None and self.user.is_verified
+        return super().validate(attrs)
+
+
+@pytest.fixture
+def user(settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.PBKDF2PasswordHasher"]
+    return User.objects.create_user(email="bench@email.com", username="bench", password=PASSWORD, is_verified=True)
+
+
+def logins_per_second(serializer_class, user):
+    request = RequestFactory().post("/")
+    start = time.perf_counter()
+    for _ in range(LOGINS):
+        serializer = serializer_class(data={"email": user.email, "password": PASSWORD}, context={"request": request})
+        assert serializer.is_valid(), serializer.errors
+    return LOGINS / (time.perf_counter() - start)
+
+
+def test_login_throughput(user):
+    before = logins_per_second(AuthenticateTwiceSerializer, user)
+    after = logins_per_second(CustomTokenObtainPairSerializer, user)
+    print(f"\nauthenticate twice: {before:.1f} logins/sec")
+    print(f"single lookup:      {after:.1f} logins/sec ({after / before:.1f}x)")
+    assert after > before
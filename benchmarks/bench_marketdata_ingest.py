@@ -0,0 +1,87 @@
+"""
+Rows/sec of the per-request MarketData create path against the bulk endpoint.
+
+    pytest benchmarks/bench_marketdata_ingest.py -s
+"""
+import json
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.signals.models import MarketData
+
+User = get_user_model()
+
+ROWS = 2000
+
+# Regression floors, well under what a laptop measures (~250 rows/sec per
+# request, ~3500 rows/sec bulk) so only a per-row query sneaking back in trips them.
+PER_REQUEST_FLOOR = 100
+BULK_FLOOR = 1500
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="bench@email.com", username="bench"))
+    return client
+
+
+def snapshots(count):
+    return [
+        {
+            "ticker": f"T{i % 500}",
+            "implied_volatility": 0.2 + i * 1e-6,
+            "historical_volatility": 0.18,
+            "skew": 0.05,
+        }
+        for i in range(count)
+    ]
+
+
+def report(label, rows, elapsed):
+    print(f"\n{label:<28} {rows:>6} rows in {elapsed:7.3f}s -> {rows / elapsed:10.0f} rows/sec")
+    return rows / elapsed
+
+
+def test_per_request_create(client):
+    url = reverse("api:marketdata-list")
+    rows = snapshots(ROWS)
+
+    start = time.perf_counter()
+    for row in rows:
+        client.post(url, row, format="json")
+    rate = report("per-request POST", ROWS, time.perf_counter() - start)
+
+    assert MarketData.objects.count() == ROWS
+    assert rate >= PER_REQUEST_FLOOR
+
+
+@pytest.mark.parametrize("batch_size", [500, 2000])
+def test_bulk_json(client, batch_size):
+    url = reverse("api:marketdata-bulk")
+    rows = snapshots(ROWS)
+
+    start = time.perf_counter()
+    response = client.post(f"{url}?batch_size={batch_size}", rows, format="json")
+    rate = report(f"bulk JSON (batch={batch_size})", ROWS, time.perf_counter() - start)
+
+    assert response.data["created"] == ROWS
+    assert rate >= BULK_FLOOR
+
+
+def test_bulk_ndjson(client):
+    url = reverse("api:marketdata-bulk")
+    body = "\n".join(json.dumps(row) for row in snapshots(ROWS))
+
+    start = time.perf_counter()
+    response = client.post(url, body, content_type="application/x-ndjson")
+    rate = report("bulk NDJSON", ROWS, time.perf_counter() - start)
+
+    assert response.data["created"] == ROWS
+    assert rate >= BULK_FLOOR
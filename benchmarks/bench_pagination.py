@@ -0,0 +1,73 @@
+"""
+Per-page latency at page 1 and page 10,000 for page-number and keyset pagination.
+
+    pytest benchmarks/bench_pagination.py -s
+"""
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.common.paginations import KeysetPagination
+from apps.signals.models import MarketData
+
+User = get_user_model()
+
+PAGE_SIZE = 20
+DEEP_PAGE = 10_000
+ROWS = PAGE_SIZE * DEEP_PAGE
+REPEAT = 20
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    MarketData.objects.bulk_create(
+        (
+            MarketData(ticker=f"T{i % 500}", implied_volatility=0.2, historical_volatility=0.18, skew=0.05)
+            for i in range(ROWS)
+        ),
+        batch_size=5000,
+    )
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="bench@email.com", username="bench"))
+    return client
+
+
+def timed(client, url, params):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        response = client.get(url, params)
+        samples.append(time.perf_counter() - start)
+        assert len(response.data["results"]) == PAGE_SIZE
+    return statistics.median(samples) * 1000
+
+
+def deep_cursor(page):
+    """Build the cursor a client would hold after walking to ``page``."""
+    last = MarketData.objects.order_by("-created_at", "-id")[(page - 1) * PAGE_SIZE - 1]
+    paginator = KeysetPagination()
+    paginator.base_url = "/"
+    return parse_qs(urlparse(paginator.encode_cursor(last)).query)["cursor"][0]
+
+
+def test_page_latency(client):
+    url = reverse("api:marketdata-list")
+    cursor = deep_cursor(DEEP_PAGE)
+
+    results = {
+        "page-number p1": timed(client, url, {"page": 1, "page_size": PAGE_SIZE}),
+        f"page-number p{DEEP_PAGE}": timed(client, url, {"page": DEEP_PAGE, "page_size": PAGE_SIZE}),
+        "keyset p1": timed(client, url, {"cursor": "", "page_size": PAGE_SIZE, "count": "false"}),
+        f"keyset p{DEEP_PAGE}": timed(client, url, {"cursor": cursor, "page_size": PAGE_SIZE, "count": "false"}),
+    }
+
+    print(f"\n{ROWS} rows, median of {REPEAT} requests")
+    for label, millis in results.items():
+        print(f"{label:<22} {millis:8.2f} ms")
@@ -0,0 +1,88 @@
+"""
+Portfolio analytics latency for a user with 50,000 taken trades.
+
+A cold request loads and computes the metrics; a warm one is served from the
+cache until the user's interactions change.
+
+    pytest benchmarks/bench_portfolio.py -s
+"""
+import statistics
+import time
+
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.signals.analytics import load_trades, portfolio_metrics
+from apps.signals.caching import signal_cache
+from apps.signals.models import Signal, UserInteraction
+
+User = get_user_model()
+
+TRADES = 50_000
+REPEAT = 10
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    rng = np.random.default_rng(7)
+    user = User.objects.create_user(email="bench@email.com", username="bench")
+    strategies = rng.choice(["VRP", "SKEW", "TERM"], TRADES)
+    signals = Signal.objects.bulk_create(
+        (
+            Signal(
+                ticker=f"T{i % 5000}", strategy=strategy, vrp_zscore=2.0, vrp_ratio=1.1,
+                expected_return=0.01, confidence=50, expires_at=timezone.now(),
+            )
+            for i, strategy in enumerate(strategies.tolist())
+        ),
+        batch_size=5000,
+    )
+    UserInteraction.objects.bulk_create(
+        (
+            UserInteraction(user=user, signal=signal, strategy=signal.strategy, status="taken", pnl=pnl)
+            for signal, pnl in zip(signals, rng.normal(5.0, 100.0, TRADES).tolist())
+        ),
+        batch_size=5000,
+    )
+    return user
+
+
+def median_ms(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def test_portfolio_latency(user):
+    columns = load_trades(user.id)
+    load_ms = median_ms(lambda: load_trades(user.id))
+    compute_ms = median_ms(lambda: portfolio_metrics(*columns))
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("api:userinteractions-portfolio", args=[user.id])
+
+    def cold():
+        signal_cache.delete_many([f"portfolio_{user.id}_version"])
+        assert client.get(url).status_code == 200
+
+    cold_ms = median_ms(cold)
+    client.get(url)
+    warm_ms = median_ms(lambda: client.get(url))
+
+    print(f"\nload {TRADES} trades: {load_ms:.1f} ms")
+    print(f"compute metrics:   {compute_ms:.1f} ms")
+    print(f"endpoint (cold):   {cold_ms:.1f} ms")
+    print(f"endpoint (warm):   {warm_ms:.1f} ms")
+    assert compute_ms < 20
+    assert cold_ms < 100
+    assert warm_ms < 100
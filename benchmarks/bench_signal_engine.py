@@ -0,0 +1,50 @@
+"""
+Signal generation time for a universe of thousands of tickers.
+
+    pytest benchmarks/bench_signal_engine.py -s
+"""
+import time
+
+import numpy as np
+import pytest
+
+from apps.signals.engine import build_signals, compute_metrics, generate_signals
+from apps.signals.models import MarketData
+
+TICKERS = 5000
+ROWS_PER_TICKER = 40
+
+
+def universe():
+    rng = np.random.default_rng(7)
+    size = TICKERS * ROWS_PER_TICKER
+    tickers = np.repeat(np.array([f"T{i:05d}" for i in range(TICKERS)]), ROWS_PER_TICKER)
+    historical = rng.uniform(0.1, 0.5, size)
+    implied = historical * rng.normal(1.1, 0.1, size)
+    skew = rng.normal(0.0, 0.05, size)
+    return tickers, implied, historical, skew
+
+
+def test_compute_only():
+    columns = universe()
+    start = time.perf_counter()
+    metrics = compute_metrics(*columns, window=20)
+    signals = build_signals(metrics)
+    elapsed = time.perf_counter() - start
+    print(f"\ncompute: {TICKERS} tickers x {ROWS_PER_TICKER} rows -> {len(signals)} signals in {elapsed:.3f}s")
+
+
+@pytest.mark.django_db
+def test_end_to_end():
+    tickers, implied, historical, skew = universe()
+    MarketData.objects.bulk_create(
+        (
+            MarketData(ticker=t, implied_volatility=iv, historical_volatility=hv, skew=sk)
+            for t, iv, hv, sk in zip(tickers.tolist(), implied.tolist(), historical.tolist(), skew.tolist())
+        ),
+        batch_size=5000,
+    )
+    start = time.perf_counter()
+    signals = generate_signals(window=20)
+    elapsed = time.perf_counter() - start
+    print(f"\nload + compute + insert: {TICKERS} tickers -> {len(signals)} signals in {elapsed:.3f}s")
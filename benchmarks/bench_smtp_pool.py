@@ -0,0 +1,75 @@
+"""
+Messages per second delivered to a local SMTP sink on a fresh connection per
+message versus over a pool of ``POOL_SIZE`` reused sessions. Against a real
+provider each fresh connection also pays TLS and AUTH round trips.
+
+    pytest benchmarks/bench_smtp_pool.py -s
+"""
+import asyncio
+import socket
+import time
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from apps.common.email import SMTPConnectionPool, build_message, get_smtp_connection
+
+MESSAGES = 200
+POOL_SIZE = 4
+
+
+class Sink:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    sink = Sink()
+    controller = Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, sink
+    controller.stop()
+
+
+def messages():
+    return [build_message("Digest", f"body {i}", f"user{i}@example.com", f"user{i}") for i in range(MESSAGES)]
+
+
+def test_throughput_pooled_vs_per_message(smtp_server):
+    controller, sink = smtp_server
+    options = {"hostname": controller.hostname, "port": controller.port, "use_tls": False, "username": ""}
+
+    async def per_message():
+        for message in messages():
+            smtp = await get_smtp_connection(**options)
+            await smtp.send_message(message)
+            await smtp.quit()
+
+    async def pooled():
+        pool = SMTPConnectionPool(size=POOL_SIZE, **options)
+        await asyncio.gather(*(pool.send_message(message) for message in messages()))
+        await pool.close()
+        return pool.connections_opened
+
+    start = time.perf_counter()
+    asyncio.run(per_message())
+    per_message_rate = MESSAGES / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    opened = asyncio.run(pooled())
+    pooled_rate = MESSAGES / (time.perf_counter() - start)
+
+    print(
+        f"\nper-message: {per_message_rate:.0f} messages/s over {MESSAGES} connections"
+        f"\npooled:      {pooled_rate:.0f} messages/s over {opened} connections"
+    )
+    assert sink.received == 2 * MESSAGES
+    assert opened == POOL_SIZE
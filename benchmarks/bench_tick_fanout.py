@@ -0,0 +1,105 @@
+"""
+Tick fan-out from the MarketData fanout to 10k WebSocket subscribers, through
+the real ``/ws/marketdata/`` ASGI app with an in-memory transport.
+
+Every round publishes one tick for each of TICKERS tickers; each subscriber
+follows one ticker. With fast consumers every tick reaches every follower;
+with consumers that take SLOW_SEND seconds per frame ticks are coalesced to
+the latest per ticker instead of queueing.
+
+    pytest benchmarks/bench_tick_fanout.py -s
+"""
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.signals.events import market_ticks
+from config.asgi import application
+
+User = get_user_model()
+
+SUBSCRIBERS = 10_000
+TICKERS = 100
+ROUNDS = 50
+SLOW_SEND = 0.005
+
+pytestmark = pytest.mark.django_db
+
+
+class Counter:
+    def __init__(self):
+        self.frames = 0
+        self.ticks = 0
+
+
+def connect(token, ticker, counter, accepted, send_delay):
+    inbox = asyncio.Queue()
+
+    async def send(message):
+        if message["type"] == "websocket.accept":
+            accepted.release()
+        elif message["type"] == "websocket.send" and message["text"].startswith('{"type": "ticks"'):
+            counter.frames += 1
+            counter.ticks += message["text"].count('"ticker"')
+            if send_delay:
+                await asyncio.sleep(send_delay)
+
+    scope = {
+        "type": "websocket",
+        "path": "/ws/marketdata/",
+        "query_string": f"token={token}&tickers={ticker}".encode(),
+        "headers": [],
+    }
+    inbox.put_nowait({"type": "websocket.connect"})
+    return inbox, asyncio.ensure_future(application(scope, inbox.get, send))
+
+
+async def run(token, send_delay):
+    counter = Counter()
+    accepted = asyncio.Semaphore(0)
+    sockets = [
+        connect(token, f"T{i % TICKERS}", counter, accepted, send_delay) for i in range(SUBSCRIBERS)
+    ]
+    for _ in sockets:
+        await accepted.acquire()
+    await asyncio.sleep(0.1)  # let every connection follow its ticker
+
+    start = time.perf_counter()
+    for round_ in range(ROUNDS):
+        market_ticks.publish({f"T{i}": {"ticker": f"T{i}", "implied_volatility": round_} for i in range(TICKERS)})
+        await asyncio.sleep(0)
+
+    expected = ROUNDS * SUBSCRIBERS
+    deadline = time.monotonic() + 120
+    previous = -1
+    while counter.ticks < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        if counter.ticks == previous:
+            break  # nothing left in flight: the rest was coalesced
+        previous = counter.ticks
+    elapsed = time.perf_counter() - start
+
+    for inbox, _ in sockets:
+        inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.gather(*(task for _, task in sockets))
+    return counter, elapsed
+
+
+@pytest.mark.parametrize("send_delay", [0, SLOW_SEND], ids=["fast", "slow"])
+def test_tick_fanout_throughput(send_delay):
+    user = User.objects.create_user(email="bench@email.com", username="bench", password="x", is_verified=True)
+    token = RefreshToken.for_user(user).access_token
+
+    counter, elapsed = async_to_sync(run)(token, send_delay)
+    offered = ROUNDS * SUBSCRIBERS
+    print(
+        f"\n{SUBSCRIBERS} subscribers, {TICKERS} tickers, {ROUNDS} rounds, send delay {send_delay * 1000:.0f} ms: "
+        f"delivered {counter.ticks:,} of {offered:,} ticks in {counter.frames:,} frames in {elapsed:.1f}s "
+        f"({counter.frames / elapsed:,.0f} messages/s)"
+    )
+    # every subscriber ends up with at least the latest tick of its ticker
+    assert SUBSCRIBERS <= counter.ticks <= offered
@@ -0,0 +1,178 @@
+"""
+Concurrent-request throughput of the read endpoints under WSGI and ASGI.
+
+Starts ``gunicorn main:app`` (the sync viewsets) and ``uvicorn config.asgi:application``
+(the async views under ``/api/async/``) against the configured database,
+drives each with ``--concurrency`` keep-alive connections for ``--duration``
+seconds and prints requests/sec and latency percentiles per endpoint.
+
+    DJANGO_SETTINGS_MODULE=config.settings.local python benchmarks/loadtest.py --email you@example.com
+
+The user must exist; its access token is minted locally. Both servers get
+the same worker count, and gunicorn ``--threads`` bounds how many requests a
+sync worker has in flight, which is where slow database or cache calls
+start to queue. Pass ``--wsgi-url``/``--asgi-url`` to test servers that are
+already running instead.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = {
+    "wsgi": {"signals": "/api/signals/", "marketdata": "/api/signals/marketdata/"},
+    "asgi": {"signals": "/api/async/signals/", "marketdata": "/api/async/signals/marketdata/"},
+}
+
+
+def access_token(email):
+    import django
+
+    sys.path.insert(0, str(ROOT))
+    django.setup()
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return str(RefreshToken.for_user(get_user_model().objects.get(email=email)).access_token)
+
+
+def start_server(kind, port, workers, threads):
+    if kind == "wsgi":
+        command = ["gunicorn", "main:app", "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+        command += ["--threads", str(threads)]
+    else:
+        command = ["uvicorn", "config.asgi:application", "--port", str(port), "--workers", str(workers)]
+        command += ["--no-access-log"]
+    return subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.2)
+            continue
+        writer.close()
+        return
+    raise RuntimeError(f"Nothing listening on {host}:{port} after {timeout}s")
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response and return its status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed")
+    length, chunked = 0, False
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+    if chunked:
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(host, port, request, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            try:
+                status = await read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors.append("connection")
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(url, path, token, concurrency, duration):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    request = (
+        f"GET {path}?count=false HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Authorization: Bearer {token}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    latencies, errors = [], []
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(
+        *(client(host, port, request, stop_at, latencies, errors) for _ in range(concurrency))
+    )
+    return latencies, errors
+
+
+def summarize(label, latencies, errors, duration):
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = (cuts[i - 1] * 1000 for i in (50, 95, 99))
+    else:
+        p50 = p95 = p99 = float("nan")
+    print(
+        f"{label:<18} {len(latencies) / duration:>9.1f} req/s   "
+        f"p50 {p50:>7.1f} ms   p95 {p95:>7.1f} ms   p99 {p99:>7.1f} ms   errors {len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", help="user to mint an access token for")
+    parser.add_argument("--token", help="access token to use instead of --email")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--wsgi-url", help="already running WSGI server, e.g. http://127.0.0.1:8001")
+    parser.add_argument("--asgi-url", help="already running ASGI server, e.g. http://127.0.0.1:8002")
+    args = parser.parse_args()
+    if not (args.token or args.email):
+        parser.error("pass --email or --token")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    token = args.token or access_token(args.email)
+
+    servers = []
+    urls = {"wsgi": args.wsgi_url, "asgi": args.asgi_url}
+    try:
+        for port, kind in enumerate(("wsgi", "asgi"), start=8101):
+            if urls[kind] is None:
+                servers.append(start_server(kind, port, args.workers, args.threads))
+                urls[kind] = f"http://127.0.0.1:{port}"
+        for kind, url in urls.items():
+            parts = urlsplit(url)
+            asyncio.run(wait_until_up(parts.hostname, parts.port or 80))
+
+        print(f"{args.concurrency} connections, {args.duration:.0f}s per endpoint, {args.workers} worker(s)")
+        for kind, url in urls.items():
+            for name, path in ENDPOINTS[kind].items():
+                latencies, errors = asyncio.run(run(url, path, token, args.concurrency, args.duration))
+                summarize(f"{kind} {name}", latencies, errors, args.duration)
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
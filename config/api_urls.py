@@ -4,6 +4,7 @@ app_name = "api"
 
 
 urlpatterns = [
+    path(r"async/signals/", include("apps.signals.async_urls")),
     path(r"signals/", include("apps.signals.urls")),
     path(r"", include("apps.users.urls")),
 ]
@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSocket connections are routed by path to the raw
+ASGI apps in ``websocket_routes``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,22 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# imported once the app registry is ready
+from apps.signals.sockets import marketdata_socket  # noqa: E402
+
+websocket_routes = {
+    "/ws/marketdata/": marketdata_socket,
+}
+
+
+async def application(scope, receive, send):
+    if scope["type"] != "websocket":
+        return await django_application(scope, receive, send)
+    handler = websocket_routes.get(scope["path"])
+    if handler is None:
+        await receive()
+        await send({"type": "websocket.close"})
+        return
+    return await handler(scope, receive, send)
@@ -62,6 +62,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "apps.common.apps.CommonConfig",
     "apps.users.apps.UsersConfig",
     "apps.signals.apps.SignalsConfig",
 ]
@@ -108,6 +109,15 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {"default": env.db("DATABASE_URL", default="sqlite:///db.sqlite3")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
+# Read replicas as a comma-separated DATABASE_REPLICA_URLS; safe-method requests
+# on the signal viewsets read from them (see apps.common.db_routers).
+REPLICA_DATABASES = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    REPLICA_DATABASES.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+
+DATABASE_ROUTERS = ["apps.common.db_routers.ReplicaRouter"]
+
 
 
 # Password validation
@@ -166,7 +176,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 25,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.common.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": [
@@ -204,6 +214,41 @@ ADMIN_URL = "admin/"
 # this is the default life span of short code (15mins)
 CODE_LIFE_SPAN = 60 * 15
 
+# how long authenticated requests may trust cached user state
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)
+
+# signal detail responses are evicted on every write, so they can live long
+SIGNAL_CACHE_TIMEOUT = env.int("SIGNAL_CACHE_TIMEOUT", default=60 * 60 * 6)
+SIGNAL_LIST_CACHE_TIMEOUT = env.int("SIGNAL_LIST_CACHE_TIMEOUT", default=60 * 5)
+# version keys outlive the payloads they name, but do expire
+SIGNAL_VERSION_TIMEOUT = env.int("SIGNAL_VERSION_TIMEOUT", default=SIGNAL_CACHE_TIMEOUT * 2)
+# portfolio analytics are evicted whenever the user's interactions change
+PORTFOLIO_CACHE_TIMEOUT = env.int("PORTFOLIO_CACHE_TIMEOUT", default=60 * 60)
+# in-process tier in front of the shared cache for signal payloads and versions
+SIGNAL_LOCAL_CACHE_SIZE = env.int("SIGNAL_LOCAL_CACHE_SIZE", default=10000)
+SIGNAL_LOCAL_CACHE_TTL = env.int("SIGNAL_LOCAL_CACHE_TTL", default=30)
+# largest top-N the strategy/ticker leaderboard serves
+LEADERBOARD_MAX_LIMIT = env.int("LEADERBOARD_MAX_LIMIT", default=100)
+
+# new signal events kept for clients resuming a stream, and the idle keep-alive interval
+SIGNAL_STREAM_HISTORY = env.int("SIGNAL_STREAM_HISTORY", default=10000)
+SIGNAL_STREAM_HEARTBEAT = env.int("SIGNAL_STREAM_HEARTBEAT", default=15)
+
+# observations per ticker in the rolling VRP ratio window behind vrp_zscore,
+# matching the signal engine's default trailing window
+VRP_ZSCORE_WINDOW = env.int("VRP_ZSCORE_WINDOW", default=20)
+
+# default and maximum rows per INSERT for bulk market data ingestion
+MARKETDATA_BULK_BATCH_SIZE = env.int("MARKETDATA_BULK_BATCH_SIZE", default=1000)
+MARKETDATA_BULK_MAX_BATCH_SIZE = env.int("MARKETDATA_BULK_MAX_BATCH_SIZE", default=5000)
+# rows fetched per round trip when streaming market data exports
+MARKETDATA_EXPORT_CHUNK_SIZE = env.int("MARKETDATA_EXPORT_CHUNK_SIZE", default=2000)
+# point budget for charting history served from the OHLC rollups
+MARKETDATA_HISTORY_DEFAULT_POINTS = env.int("MARKETDATA_HISTORY_DEFAULT_POINTS", default=500)
+MARKETDATA_HISTORY_MAX_POINTS = env.int("MARKETDATA_HISTORY_MAX_POINTS", default=5000)
+# tickers one live market data socket may follow
+MARKETDATA_SOCKET_MAX_TICKERS = env.int("MARKETDATA_SOCKET_MAX_TICKERS", default=200)
+
 
 LOGGING = {
     "version": 1,
@@ -28,6 +28,9 @@ DATABASES["default"] = env.db("DATABASE_URL", default="")  # noqa F405
 DATABASES["default"]["ATOMIC_REQUESTS"] = True  # noqa F405
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa F405
 DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}
+for alias in REPLICA_DATABASES:  # noqa F405
+    DATABASES[alias]["CONN_MAX_AGE"] = DATABASES["default"]["CONN_MAX_AGE"]  # noqa F405
+    DATABASES[alias]["OPTIONS"] = {"sslmode": "require"}  # noqa F405
 
 # CACHES
 # ------------------------------------------------------------------------------------